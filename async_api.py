@@ -0,0 +1,101 @@
+# async_api.py
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import bookings
+import config
+import db
+import hotel_search
+import inventory
+
+# ------------------- Async Data Access -------------------
+# asyncio front end to the same queries and booking logic the pages use, for
+# batch jobs and services. mysql-connector-python 8.0 has no asyncio driver,
+# so blocking calls run on a fixed set of threads, one per pooled connection.
+# Any number of coroutines can be in flight; they wait on a semaphore for a
+# free connection instead of each holding a thread.
+#
+#     async with AsyncPool() as pool:
+#         results = await asyncio.gather(*(book_room(pool, ...) for _ in range(1000)))
+
+class AsyncPool:
+    """Runs blocking database work for coroutines, at most `size` calls at a time"""
+
+    def __init__(self, size=None):
+        self.size = size or config.POOL_SIZE
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="db-async")
+        self._slots = None
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) run on one of the pool's threads"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def with_cursor(self, fn, *args, dictionary=True):
+        """Await fn(cursor, *args) on a pooled connection, committing if it succeeds"""
+        return await self.run(_with_cursor, fn, args, dictionary)
+
+    async def fetch_all(self, sql, params=(), dictionary=True):
+        return await self.with_cursor(_fetch_all, sql, params, dictionary=dictionary)
+
+    async def execute(self, sql, params=()):
+        """Run one statement and commit; returns the affected row count"""
+        return await self.with_cursor(_execute, sql, params, dictionary=False)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+def _with_cursor(fn, args, dictionary):
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=dictionary)
+    try:
+        result = fn(cursor, *args)
+        connection.commit()
+        return result
+    finally:
+        cursor.close()
+        connection.close()
+
+def _fetch_all(cursor, sql, params):
+    cursor.execute(sql, params)
+    return cursor.fetchall()
+
+def _execute(cursor, sql, params):
+    cursor.execute(sql, params)
+    return cursor.rowcount
+
+# ------------------- Operations -------------------
+def _search(cursor, term, only_available, limit):
+    return hotel_search.with_amenities(cursor, hotel_search.search_hotels(cursor, term, only_available, limit))
+
+async def search_hotels(pool, term, only_available=False, limit=hotel_search.SEARCH_RESULT_LIMIT):
+    """Hotels matching a name/location term as (hotel row, amenities) pairs, best match first"""
+    return await pool.with_cursor(_search, term, only_available, limit)
+
+async def available_rooms(pool, check_in, check_out, room_type=None):
+    """Room_IDs free for every night of the stay"""
+    return await pool.with_cursor(
+        inventory.find_available_rooms, check_in, check_out, room_type, dictionary=False
+    )
+
+async def book_room(pool, user_id, room_type, check_in, check_out, total_cost=None, status="Confirmed"):
+    """Book any free room of a type; (booking_id, room_id, total_cost), or None if none is free"""
+    return await pool.run(bookings.book_room, user_id, room_type, check_in, check_out, total_cost, status)
+
+async def cancel_booking(pool, booking_id):
+    """Cancel a booking and release its nights; False if it was not active"""
+    return await pool.run(bookings.cancel_booking, booking_id)
+
+async def monthly_report(pool, first_month, after_last_month):
+    """{(year, month): (bookings, revenue)} for check-ins in [first_month, after_last_month)"""
+    return await pool.with_cursor(bookings.monthly_totals, first_month, after_last_month, dictionary=False)
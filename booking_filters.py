@@ -0,0 +1,135 @@
+# booking_filters.py
+from datetime import datetime
+
+import config
+import db
+
+# ------------------- Filtered, Paginated Booking Listing -------------------
+# The admin bookings views filter in SQL and fetch one page at a time using
+# keyset pagination on (Check_IN_Date, Booking_ID), newest first. Each page
+# starts strictly after the last row of the previous one, so the cost of a
+# page does not grow with how deep the admin has scrolled, unlike OFFSET.
+# The tables request the next page as the admin scrolls towards the end.
+
+BOOKING_COLUMNS = """
+    SELECT b.Booking_ID, CONCAT(u.first_name, ' ', u.last_name) AS Customer,
+           r.Room_Type, b.Check_IN_Date, b.Check_Out_Date,
+           b.Total_Cost, b.Booking_Status
+"""
+
+BOOKING_TABLES = """
+    FROM Booking b
+    JOIN Users u ON b.User_ID = u.user_id
+    JOIN Room r ON b.Room_ID = r.Room_ID
+"""
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+def build_filters(search_term="", start_date=None, end_date=None, status="All", active_users_only=False):
+    """Turn the filter form into a WHERE clause and its parameters"""
+    conditions = []
+    params = []
+
+    search_term = (search_term or "").strip()
+    if search_term:
+        conditions.append("(CONCAT(u.first_name, ' ', u.last_name) LIKE %s OR r.Room_Type LIKE %s)")
+        params += [f"%{search_term}%", f"%{search_term}%"]
+
+    if start_date:
+        conditions.append("b.Check_IN_Date >= %s")
+        params.append(_as_date(start_date))
+
+    if end_date:
+        conditions.append("b.Check_IN_Date <= %s")
+        params.append(_as_date(end_date))
+
+    if status and status != "All":
+        conditions.append("b.Booking_Status = %s")
+        params.append(status)
+
+    if active_users_only:
+        conditions.append("u.is_active = 1")
+
+    where = " WHERE " + " AND ".join(conditions) if conditions else ""
+    return where, params
+
+def fetch_page(cursor, filters, after=None, page_size=None):
+    """Fetch one page of bookings (dictionary cursor) after a keyset position.
+
+    `after` is the (Check_IN_Date, Booking_ID) of the last row already shown.
+    Returns (rows, next_key); next_key is None on the last page.
+    """
+    page_size = page_size or config.BOOKINGS_PAGE_SIZE
+    where, params = filters
+    params = list(params)
+
+    if after is not None:
+        check_in, booking_id = after
+        where += " AND " if where else " WHERE "
+        where += "(b.Check_IN_Date < %s OR (b.Check_IN_Date = %s AND b.Booking_ID < %s))"
+        params += [check_in, check_in, booking_id]
+
+    # One extra row tells us whether another page exists
+    cursor.execute(
+        BOOKING_COLUMNS + BOOKING_TABLES + where +
+        " ORDER BY b.Check_IN_Date DESC, b.Booking_ID DESC LIMIT %s",
+        params + [page_size + 1]
+    )
+    rows = cursor.fetchall()
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        return rows, (last['Check_IN_Date'], last['Booking_ID'])
+    return rows, None
+
+def count_by_status(cursor, filters):
+    """Count every booking matching the filters, per status, without fetching them"""
+    where, params = filters
+    cursor.execute(
+        "SELECT b.Booking_Status, COUNT(*) AS Total" + BOOKING_TABLES + where +
+        " GROUP BY b.Booking_Status",
+        params
+    )
+    return {row['Booking_Status']: row['Total'] for row in cursor.fetchall()}
+
+def load_page(filters, after=None, page_size=None, with_counts=False):
+    """Fetch a page (and the per-status totals if asked) on a pooled connection.
+
+    Safe to run on a worker thread; returns (rows, next_key, counts).
+    """
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        rows, next_key = fetch_page(cursor, filters, after, page_size)
+        counts = count_by_status(cursor, filters) if with_counts else None
+        return rows, next_key, counts
+    finally:
+        cursor.close()
+        connection.close()
+
+class BookingPager:
+    """Walks the filtered bookings one keyset page at a time"""
+
+    def __init__(self, page_size=None):
+        self.page_size = page_size or config.BOOKINGS_PAGE_SIZE
+        self.filters = build_filters()
+        self.position = None    # keyset of the last row fetched so far
+        self.has_next = True
+
+    def reset(self, filters=None):
+        """Start again from the first page, with new filters if given"""
+        if filters is not None:
+            self.filters = filters
+        self.position = None
+        self.has_next = True
+
+    def request(self):
+        """Arguments for fetch_page, taken on the Tk thread before a worker runs the query"""
+        return self.filters, self.position, self.page_size
+
+    def advance(self, next_key):
+        """Move past a page once it has been fetched"""
+        self.position = next_key
+        self.has_next = next_key is not None
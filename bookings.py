@@ -0,0 +1,157 @@
+# bookings.py
+import random
+import threading
+
+import mysql.connector
+from mysql.connector import errorcode
+
+import dashboard_stats
+import db
+import inventory
+
+# ------------------- Atomic Booking Confirmation -------------------
+# A booking is one transaction: pick a free room, insert the Booking row and
+# claim its nights in Room_Night. The Room_Night primary key rejects a night
+# that another desk claimed first (duplicate key), in which case the whole
+# transaction is rolled back and retried against a fresh snapshot.
+
+MAX_ATTEMPTS = 5
+CANDIDATE_ROOMS = 8  # free rooms to choose from, so concurrent desks spread out
+
+# Errors that mean "someone else got there first", not "the request is bad"
+RETRYABLE_ERRORS = {
+    errorcode.ER_DUP_ENTRY,
+    errorcode.ER_LOCK_DEADLOCK,
+    errorcode.ER_LOCK_WAIT_TIMEOUT,
+}
+
+_stats_lock = threading.Lock()
+_stats = {
+    "attempts": 0,
+    "booked": 0,
+    "conflicts": 0,
+    "retries": 0,
+    "unavailable": 0,
+    "gave_up": 0,
+}
+
+def _count(**increments):
+    with _stats_lock:
+        for key, amount in increments.items():
+            _stats[key] += amount
+
+def booking_stats():
+    """Snapshot of attempt, conflict and retry counters"""
+    with _stats_lock:
+        return dict(_stats)
+
+def _stay_price(cursor, room_id, check_in, check_out):
+    """Price of a stay in one room at its nightly rate, or None if the room is gone"""
+    cursor.execute("SELECT Price_per_Night FROM Room WHERE Room_ID = %s", (room_id,))
+    row = cursor.fetchone()
+    if row is None or row[0] is None:
+        return None
+    return row[0] * len(inventory.stay_nights(check_in, check_out))
+
+def book_room(user_id, room_type, check_in, check_out, total_cost=None, status="Confirmed"):
+    """Book any free room of a type for the stay.
+
+    Without total_cost the stay is priced at the allocated room's nightly
+    rate. Returns (booking_id, room_id, total_cost), or None if no room of
+    that type is free for every night (including when every attempt lost a
+    race). Raises ValueError if the allocated room has no positive rate.
+    """
+    connection = db.get_connection()
+    cursor = connection.cursor()
+    try:
+        for attempt in range(MAX_ATTEMPTS):
+            _count(attempts=1, retries=1 if attempt else 0)
+            free_rooms = inventory.find_available_rooms(
+                cursor, check_in, check_out, room_type, limit=CANDIDATE_ROOMS
+            )
+            if not free_rooms:
+                connection.rollback()
+                _count(unavailable=1)
+                return None
+
+            room_id = random.choice(free_rooms)
+            cost = total_cost
+            if cost is None:
+                cost = _stay_price(cursor, room_id, check_in, check_out)
+                if cost is None or not cost > 0:
+                    connection.rollback()
+                    raise ValueError(f"Room {room_id} has no valid nightly rate")
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO Booking (User_ID, Room_ID, Check_IN_Date, Check_Out_Date,
+                                       Total_Cost, Booking_Status)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    """,
+                    (user_id, room_id, check_in.strftime('%Y-%m-%d'),
+                     check_out.strftime('%Y-%m-%d'), cost, status)
+                )
+                booking_id = cursor.lastrowid
+                inventory.reserve_nights(cursor, room_id, booking_id, check_in, check_out)
+                connection.commit()
+                _count(booked=1)
+                dashboard_stats.booking_created(cost)
+                return booking_id, room_id, cost
+            except mysql.connector.Error as err:
+                connection.rollback()
+                if err.errno not in RETRYABLE_ERRORS:
+                    raise
+                _count(conflicts=1)
+
+        _count(gave_up=1)
+        return None
+    finally:
+        cursor.close()
+        connection.close()
+
+def booking_owner(cursor, booking_id):
+    """User_ID of a booking, or None if it does not exist"""
+    cursor.execute("SELECT User_ID FROM Booking WHERE Booking_ID = %s", (booking_id,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def cancel_booking(booking_id, user_id=None):
+    """Cancel a booking and give its nights back; with user_id, only that user's booking.
+
+    Returns False if the booking does not exist, belongs to someone else or
+    was already cancelled.
+    """
+    query = ("UPDATE Booking SET Booking_Status = 'Cancelled' "
+             "WHERE Booking_ID = %s AND Booking_Status <> 'Cancelled'")
+    params = [booking_id]
+    if user_id is not None:
+        query += " AND User_ID = %s"
+        params.append(user_id)
+
+    connection = db.get_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, params)
+        if cursor.rowcount == 0:
+            connection.rollback()
+            return False
+        inventory.release_nights(cursor, booking_id)
+        connection.commit()
+        return True
+    finally:
+        cursor.close()
+        connection.close()
+
+# ------------------- Booking Totals -------------------
+def monthly_totals(cursor, first_month, after_last_month):
+    """Bookings count and revenue per (year, month) for check-ins in [first_month, after_last_month)"""
+    cursor.execute(
+        """
+        SELECT YEAR(Check_IN_Date), MONTH(Check_IN_Date), COUNT(*), SUM(Total_Cost)
+        FROM Booking 
+        WHERE Check_IN_Date >= %s AND Check_IN_Date < %s
+        GROUP BY YEAR(Check_IN_Date), MONTH(Check_IN_Date)
+        """,
+        (first_month, after_last_month)
+    )
+    return {(year, month): (count, total) for year, month, count, total in cursor.fetchall()}
@@ -0,0 +1,105 @@
+# catalog.py
+import copy
+import threading
+import time
+
+import config
+import db
+import hotel_search
+
+# ------------------- Catalog Cache -------------------
+# Hotels, their room categories and the amenity list only change when an
+# admin edits them, yet pages read them on every card click and frame build.
+# Those reads go through a read-through cache: entries expire after
+# config.CATALOG_TTL seconds, and the admin hotel actions invalidate what they
+# changed straight away. The cache is per process, so another process (the
+# user app while an admin edits, another service instance) sees an edit
+# within one TTL. Booking figures are never cached here.
+
+class CatalogCache:
+    """Thread-safe read-through cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}      # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._generation = 0    # bumped by every invalidation
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key, load):
+        """Cached value for key, calling load() on a miss; None results are not cached.
+
+        Returns a copy, so callers may add to the rows they get back.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry[0])
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        value = load()
+
+        with self._lock:
+            # An invalidation while we were loading may mean value is already stale
+            if value is not None and generation == self._generation:
+                self._entries[key] = (value, time.monotonic() + self.ttl)
+        return copy.deepcopy(value)
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+_cache = CatalogCache(config.CATALOG_TTL)
+
+def _query(fn, *args):
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        return fn(cursor, *args)
+    finally:
+        cursor.close()
+        connection.close()
+
+def _load_hotel(cursor, hotel_id):
+    hotel = hotel_search.hotel_details(cursor, hotel_id)
+    if hotel is not None:
+        hotel['amenities'] = hotel_search.amenity_list(cursor, hotel_id)
+    return hotel
+
+def _load_amenities(cursor):
+    cursor.execute("SELECT * FROM Amenities ORDER BY amenity_name")
+    return cursor.fetchall()
+
+# ------------------- Catalog Reads -------------------
+def hotel_details(hotel_id):
+    """Hotel row with 'room_types' and 'amenities', or None if it does not exist"""
+    return _cache.get(("hotel", hotel_id), lambda: _query(_load_hotel, hotel_id))
+
+def amenities():
+    """Every amenity a hotel can offer, by name"""
+    return _cache.get("amenities", lambda: _query(_load_amenities))
+
+def invalidate_hotel(hotel_id=None):
+    """Forget a hotel after it is created, edited or deleted (the whole catalog if None)"""
+    if hotel_id is None:
+        _cache.invalidate()
+    else:
+        _cache.invalidate(("hotel", hotel_id))
+
+def cache_stats():
+    """Hit, miss and invalidation counters for the catalog cache"""
+    return _cache.stats()
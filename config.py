@@ -1,19 +1,75 @@
-# config.py
+import os
+
 import mysql.connector
 
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "new_password",
+    "database": "hotel_book"
+}
+
+# Connection pool settings
+POOL_SIZE = 5             # maximum open connections per process
+POOL_TIMEOUT = 10         # seconds to wait for a free connection
+POOL_HEALTH_CHECK = True  # ping idle connections before handing them out
+
+# Background work (tasks.py); keep below POOL_SIZE so the Tk thread can still get a connection
+WORKER_THREADS = 4
+
+# Query instrumentation (query_stats.py)
+QUERY_STATS = True            # time every statement run on a pooled connection
+SLOW_QUERY_SECONDS = 0.2      # statements at least this slow go to the log
+SLOW_QUERY_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_queries.log")
+
+# Admin bookings and users tables
+BOOKINGS_PAGE_SIZE = 50   # rows fetched per page as the table scrolls
+USERS_PAGE_SIZE = 100
+
+# Catalog cache (catalog.py): hotels, room categories and amenities
+CATALOG_TTL = 300         # seconds before a cached entry is read again
+
+# Password hashing (passwords.py); raising a cost upgrades stored hashes at each user's next login
+PASSWORD_HASHER = "pbkdf2_sha256"   # or "scrypt"
+PASSWORD_SALT_BYTES = 16
+PBKDF2_ITERATIONS = 600_000
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Login throttling (login_limiter.py): failed attempts allowed before logins wait
+LOGIN_MAX_FAILURES = 5            # per email
+LOGIN_SOURCE_MAX_FAILURES = 50    # per source machine, across emails
+LOGIN_REFILL_SECONDS = 60         # one more attempt allowed every this many seconds
+
+# Login sessions (sessions.py)
+SESSION_TTL = 8 * 60 * 60     # seconds a session lasts after it was last used
+
+# Admin dashboard totals (dashboard_stats.py)
+STATS_REFRESH_INTERVAL = 60   # seconds between background reloads
+
+# Hotel image thumbnails (thumbnails.py)
+THUMBNAIL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thumbnail_cache")
+PHOTO_CACHE_SIZE = 200    # PhotoImage objects kept in memory
+
+# UI profiling (ui_profiler.py), opt in: HOTEL_UI_PROFILE=report, or =cprofile to also save cProfile stats
+UI_PROFILE = os.environ.get("HOTEL_UI_PROFILE", "")
+UI_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+UI_STALL_MS = 100         # main loop this late counts as blocked
+
+# Headless HTTP service (service.py)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+
 def connect_db():
-    """Connect to the hotel_booking database"""
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password",
-        database="hotel_book"
-    )
+    """Borrow a connection to the hotel_booking database from the shared pool"""
+    import db
+    return db.get_connection()
 
 def connect_mysql():
     """Connect to MySQL without specifying a database"""
     return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="new_password"
+        host=DB_CONFIG["host"],
+        user=DB_CONFIG["user"],
+        password=DB_CONFIG["password"]
     )
\ No newline at end of file
@@ -6,10 +6,12 @@ import matplotlib
 matplotlib.use("TkAgg")
 from datetime import datetime, timedelta
 import calendar
-import sys
 from tkinter import messagebox
 
 import config
+import dashboard_stats
+import router
+from bookings import monthly_totals
 from custom.navigation_frame_admin import AdminNavigationFrame
 
 # ------------------- Global Variables -------------------
@@ -17,34 +19,10 @@ current_admin = None
 
 # ------------------- Admin Session Management -------------------
 def load_admin_session():
-    """Load admin information from database"""
+    """Load the logged-in admin from the session"""
     global current_admin
-    
-    # Check if any admin_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            admin_id = int(sys.argv[1])
-            
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Admin WHERE Admin_ID = %s",
-                (admin_id,)
-            )
-            admin_data = cursor.fetchone()
-            
-            if admin_data:
-                current_admin = admin_data
-                return True
-                
-        except Exception as err:
-            print(f"Error loading admin session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_admin = router.session_account("admin")
+    return current_admin is not None
 
 # ------------------- Data Fetching Functions -------------------
 def get_dashboard_stats():
@@ -56,80 +34,44 @@ def get_dashboard_stats():
         "hotels_listed": 0
     }
     
+    # Served from memory; the totals are kept current as pages change them
     try:
-        connection = config.connect_db()
-        cursor = connection.cursor()
-        
-        # Get total bookings
-        cursor.execute("SELECT COUNT(*) FROM Booking")
-        stats["total_bookings"] = cursor.fetchone()[0]
-        
-        # Get total revenue
-        cursor.execute("SELECT SUM(Total_Cost) FROM Booking")
-        total_revenue = cursor.fetchone()[0]
-        stats["total_revenue"] = total_revenue if total_revenue else 0
-        
-        # Get active users
-        cursor.execute("SELECT COUNT(*) FROM Users")
-        stats["active_users"] = cursor.fetchone()[0]
-        
-        # Get hotels (rooms) listed - assuming Room table contains hotel rooms
-        cursor.execute("SELECT COUNT(*) FROM Room")
-        stats["hotels_listed"] = cursor.fetchone()[0]
-        
+        stats.update(dashboard_stats.stats.get())
+        dashboard_stats.start_background_refresh()
     except Exception as err:
         print(f"Database Error: {err}")
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
     
     return stats
 
-def get_monthly_data():
-    """Fetch monthly revenue and booking data for the last 6 months"""
+def get_monthly_data(start_date=None, end_date=None):
+    """Fetch monthly revenue and booking data, by default for the last 6 months"""
     months = []
     revenue = []
     bookings = []
     
+    # Default range: from the month 6 months ago up to the current month
+    if end_date is None:
+        end_date = datetime.today()
+    if start_date is None:
+        start_date = end_date - timedelta(days=180)
+    
+    first_month = datetime(start_date.year, start_date.month, 1)
+    if end_date.month == 12:
+        after_last_month = datetime(end_date.year + 1, 1, 1)
+    else:
+        after_last_month = datetime(end_date.year, end_date.month + 1, 1)
+    
     try:
         connection = config.connect_db()
         cursor = connection.cursor()
         
-        # Get current date and date 6 months ago
-        today = datetime.today()
-        six_months_ago = today - timedelta(days=180)
+        # Get bookings count and revenue for every month in a single grouped query
+        totals = monthly_totals(cursor, first_month, after_last_month)
         
-        # Get data for each month
-        current = six_months_ago
-        while current <= today:
-            month_start = datetime(current.year, current.month, 1)
-            if current.month == 12:
-                next_month = datetime(current.year + 1, 1, 1)
-            else:
-                next_month = datetime(current.year, current.month + 1, 1)
-            
-            # Get bookings count for this month
-            cursor.execute(
-                """
-                SELECT COUNT(*) 
-                FROM Booking 
-                WHERE Check_IN_Date >= %s AND Check_IN_Date < %s
-                """,
-                (month_start, next_month)
-            )
-            month_bookings = cursor.fetchone()[0]
-            
-            # Get revenue for this month
-            cursor.execute(
-                """
-                SELECT SUM(Total_Cost) 
-                FROM Booking 
-                WHERE Check_IN_Date >= %s AND Check_IN_Date < %s
-                """,
-                (month_start, next_month)
-            )
-            month_revenue = cursor.fetchone()[0]
+        # Months without bookings still get a point on the chart
+        current = first_month
+        while current < after_last_month:
+            month_bookings, month_revenue = totals.get((current.year, current.month), (0, 0))
             
             # Add to lists
             months.append(calendar.month_abbr[current.month])
@@ -158,18 +100,11 @@ def main():
     # Check if admin is logged in
     if not load_admin_session():
         messagebox.showwarning("Login Required", "Admin login required to access this page")
-        import subprocess
-        subprocess.Popen([sys.executable, "custom/auth.py", "--mode=admin"])
+        router.navigate("auth", mode="admin")
         return
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - Admin Dashboard")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - Admin Dashboard", "1200x700")
     
     # Main frame
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -275,7 +210,7 @@ def main():
     chart_canvas.get_tk_widget().pack(fill="both", expand=True, padx=20, pady=(0, 20))
     
     # Run the application
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
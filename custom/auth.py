@@ -1,16 +1,25 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import subprocess
 import sys
 import hashlib
 from PIL import Image, ImageTk
 import config
+import dashboard_stats
+import login_limiter
+import passwords
+import router
 from utils import hash_password
 
 # Global variables
 mode = "login"  # Default mode
 
 # ------------------- User Authentication Functions -------------------
+def show_login_error(err):
+    if isinstance(err, login_limiter.LoginThrottled):
+        messagebox.showwarning("Too Many Attempts", str(err))
+    else:
+        messagebox.showerror("Database Error", str(err))
+
 def login_user():
     email = email_entry.get()
     password = password_entry.get()
@@ -19,17 +28,7 @@ def login_user():
         messagebox.showwarning("Input Error", "Please enter both email and password.")
         return
 
-    hashed_password = hash_password(password)
-
-    try:
-        connection = config.connect_db()
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT user_id, first_name, last_name FROM Users WHERE email = %s AND password = %s",
-            (email, hashed_password)
-        )
-        user = cursor.fetchone()
-
+    def logged_in(user):
         if user:
             messagebox.showinfo("Success", f"Welcome {user['first_name']} {user['last_name']}!")
             
@@ -39,18 +38,19 @@ def login_user():
                 # For this example, we'll just simulate remembering the login
                 print(f"Remembering login for: {email}")
             
-            # Open home page with user ID
-            subprocess.Popen([sys.executable, "custom/home.py", str(user['user_id'])])
-            app.destroy()  # Close the login window
+            # Keep the full record in the session so the next pages need no lookup
+            router.session.user = user
+            router.navigate("home")
         else:
             messagebox.showerror("Login Failed", "Invalid Email or Password.")
-    
-    except Exception as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+
+    # Password checks are slow on purpose, so they run off the Tk thread
+    router.runner.submit(
+        passwords.authenticate, "user", email, password,
+        on_done=logged_in,
+        on_error=show_login_error,
+        key="login"
+    )
 
 def signup_user():
     full_name = fullname_entry.get()
@@ -79,31 +79,38 @@ def signup_user():
     first_name = name_parts[0]
     last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-    # Hash the password
-    hashed_password = hash_password(password)
-
-    try:
-        connection = config.connect_db()
-        cursor = connection.cursor()
-
-        # Insert the user data into the database
-        cursor.execute(
-            "INSERT INTO Users (first_name, last_name, email, phone, password) VALUES (%s, %s, %s, %s, %s)",
-            (first_name, last_name, email, phone, hashed_password)
-        )
-
-        connection.commit()
-        messagebox.showinfo("Success", "Account created successfully!")
-        
-        # After successful registration, redirect to login page
-        show_login_screen()
-
-    except Exception as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+    def create_account(hashed_password):
+        try:
+            connection = config.connect_db()
+            cursor = connection.cursor()
+
+            # Insert the user data into the database
+            cursor.execute(
+                "INSERT INTO Users (first_name, last_name, email, phone, password) VALUES (%s, %s, %s, %s, %s)",
+                (first_name, last_name, email, phone, hashed_password)
+            )
+
+            connection.commit()
+            dashboard_stats.user_created()
+            messagebox.showinfo("Success", "Account created successfully!")
+            
+            # After successful registration, redirect to login page
+            show_login_screen()
+
+        except Exception as err:
+            messagebox.showerror("Database Error", str(err))
+        finally:
+            if 'connection' in locals() and connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    # Hash the password on a worker, then insert the account
+    router.runner.submit(
+        hash_password, password,
+        on_done=create_account,
+        on_error=lambda err: messagebox.showerror("Error", str(err)),
+        key="signup"
+    )
 
 def login_admin():
     email = email_entry.get()
@@ -113,17 +120,7 @@ def login_admin():
         messagebox.showwarning("Input Error", "Please enter both email and password.")
         return
 
-    hashed_password = hash_password(password)
-
-    try:
-        connection = config.connect_db()
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT Admin_ID, AdminName FROM Admin WHERE AdminEmail = %s AND AdminPassword = %s",
-            (email, hashed_password)
-        )
-        admin = cursor.fetchone()
-
+    def logged_in(admin):
         if admin:
             messagebox.showinfo("Success", f"Welcome {admin['AdminName']}!")
             
@@ -133,18 +130,18 @@ def login_admin():
                 # For this example, we'll just simulate remembering the login
                 print(f"Remembering admin login for: {email}")
             
-            # Open admin dashboard with admin ID
-            subprocess.Popen([sys.executable, "custom/admin_dashboard.py", str(admin['Admin_ID'])])
-            app.destroy()  # Close the login window
+            # Keep the full record in the session so the next pages need no lookup
+            router.session.admin = admin
+            router.navigate("admin_dashboard")
         else:
             messagebox.showerror("Login Failed", "Invalid Admin Credentials.")
-    
-    except Exception as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+
+    router.runner.submit(
+        passwords.authenticate, "admin", email, password,
+        on_done=logged_in,
+        on_error=show_login_error,
+        key="login"
+    )
 
 def forgot_password(event=None):
     if mode == "admin":
@@ -210,8 +207,7 @@ def forgot_admin_password():
 
 # ------------------- Navigation Functions -------------------
 def back_to_main():
-    subprocess.Popen([sys.executable, "main.py"])
-    app.destroy()  # Close the current window
+    router.navigate("launcher")
 
 def show_login_screen(event=None):
     global mode
@@ -321,8 +317,10 @@ def build_login_screen():
 def main():
     global app, content_frame, mode
     
-    # Process command line arguments
-    if len(sys.argv) > 1:
+    # Mode requested by the router, or by command line arguments when run directly
+    if "mode" in router.params:
+        mode = router.params["mode"]
+    elif len(sys.argv) > 1:
         if sys.argv[1] == "--mode=signup":
             mode = "signup"
         elif sys.argv[1] == "--mode=admin":
@@ -330,21 +328,15 @@ def main():
         else:
             mode = "login"
     
-    # Create the main application window
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    
+    # Reuse the shared application window
     if mode == "signup":
-        app.title("Hotel Booking - Sign Up")
+        title = "Hotel Booking - Sign Up"
     elif mode == "admin":
-        app.title("Hotel Booking - Admin Login")
+        title = "Hotel Booking - Admin Login"
     else:
-        app.title("Hotel Booking - Login")
+        title = "Hotel Booking - Login"
         
-    app.geometry("1000x800")
-    app.resizable(False, False)
+    app = router.open_window(title, "1000x800")
     
     # Create main layout
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -400,10 +392,7 @@ def main():
     else:
         build_login_screen()
     
-    app.mainloop()
-
-if __name__ == "__main__":
-    main()
+    router.mainloop()
 
 def build_signup_screen():
     global fullname_entry, email_entry, phone_entry, password_entry, confirm_password_entry, agree_var
@@ -538,4 +527,7 @@ def build_admin_login_screen():
 
     # Version info
     version_label = ctk.CTkLabel(content_frame, text="v1.0.0", text_color="#6c757d", font=("Arial", 10))
-    version_label.pack(pady=(20, 0))
\ No newline at end of file
+    version_label.pack(pady=(20, 0))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -4,7 +4,9 @@ import sys
 from datetime import datetime, timedelta
 from tkcalendar import DateEntry  # You may need to install this: pip install tkcalendar
 
+import bookings
 import config
+import router
 from custom.navigation_frame_user import UserNavigationFrame
 
 # ------------------- Global Variables -------------------
@@ -15,34 +17,10 @@ room_prices = {}  # To store room prices for calculation
 
 # ------------------- User Session Management -------------------
 def load_user_session():
-    """Load user information from database"""
+    """Load the logged-in user from the session"""
     global current_user
-    
-    # Check if any user_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-            
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                return True
-                
-        except Exception as err:
-            print(f"Error loading user session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_user = router.session_account("user")
+    return current_user is not None
 
 # ------------------- Hotel & Room Functions -------------------
 def load_hotel_details(hotel_id_param=None):
@@ -193,8 +171,7 @@ def confirm_booking():
     # Check if user is logged in
     if not current_user:
         messagebox.showwarning("Login Required", "Please log in to book a room")
-        import subprocess
-        subprocess.Popen([sys.executable, "custom/auth.py"])
+        router.navigate("auth", mode="login")
         return
     
     # Validate inputs
@@ -259,42 +236,14 @@ def confirm_booking():
     if not confirm:
         return
     
-    # Save booking to database
+    # Save booking to database: room allocation, booking row and nights commit together
     try:
-        connection = config.connect_db()
-        cursor = connection.cursor()
-        
-        # Get room ID for the selected room type
-        cursor.execute(
-            "SELECT Room_ID FROM Room WHERE Room_Type = %s AND Availability_status = 'Available' LIMIT 1",
-            (room_type,)
-        )
-        room_result = cursor.fetchone()
+        result = bookings.book_room(current_user['user_id'], room_type, check_in, check_out, total_price)
         
-        if not room_result:
-            messagebox.showerror("Booking Error", "Selected room is no longer available")
+        if not result:
+            messagebox.showerror("Booking Error", "Selected room is not available for these dates")
             return
-            
-        room_id = room_result[0]
         
-        # Insert booking record
-        cursor.execute(
-            """
-            INSERT INTO Booking (User_ID, Room_ID, Check_IN_Date, Check_Out_Date, 
-                               Total_Cost, Booking_Status)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """,
-            (current_user['user_id'], room_id, check_in.strftime('%Y-%m-%d'), 
-             check_out.strftime('%Y-%m-%d'), total_price, 'Confirmed')
-        )
-        
-        # Update room availability
-        cursor.execute(
-            "UPDATE Room SET Availability_status = 'Booked' WHERE Room_ID = %s",
-            (room_id,)
-        )
-        
-        connection.commit()
         messagebox.showinfo("Success", "Booking confirmed successfully!")
         
         # Go to user profile to see booking
@@ -302,10 +251,6 @@ def confirm_booking():
         
     except Exception as err:
         messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
 
 # ----------------- Main Function -----------------
 def main():
@@ -316,18 +261,11 @@ def main():
     # Try to load user session
     if not load_user_session():
         messagebox.showwarning("Login Required", "Please log in to book a room")
-        import subprocess
-        subprocess.Popen([sys.executable, "custom/auth.py"])
+        router.navigate("auth", mode="login")
         return
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - Room Reservation")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - Room Reservation", "1200x700")
     
     # ----------------- Main Frame -----------------
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -494,7 +432,7 @@ def main():
     # Initialize hotel details and update summary
     load_hotel_details()
     
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,9 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import sys
 from datetime import datetime
 
 import config
+import router
 from custom.navigation_frame_user import UserNavigationFrame
 
 # ------------------- Global Variables -------------------
@@ -12,38 +12,10 @@ selected_rating = 0
 
 # ------------------- User Session Management -------------------
 def load_user_session():
-    """Load user information from database"""
+    """Load the logged-in user from the session"""
     global current_user
-    
-    # Check if any user_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-            
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                # Pre-fill name field with user's name if available
-                if 'name_entry' in globals():
-                    name_entry.delete(0, 'end')
-                    name_entry.insert(0, f"{user_data['first_name']} {user_data['last_name']}")
-                return True
-                
-        except Exception as err:
-            print(f"Error loading user session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_user = router.session_account("user")
+    return current_user is not None
 
 # ------------------- Rating Functions -------------------
 def set_rating(rating):
@@ -131,14 +103,8 @@ def submit_feedback():
 def main():
     global name_entry, feedback_text, star_buttons
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - Feedback")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - Feedback", "1200x700")
     
     # ----------------- Main Frame -----------------
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -219,7 +185,7 @@ def main():
         name_entry.delete(0, 'end')
         name_entry.insert(0, f"{current_user['first_name']} {current_user['last_name']}")
     
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,11 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import sys
 from datetime import datetime, timedelta
 import re
 from tkcalendar import DateEntry
 
 import config
+import router
 from custom.navigation_frame_user import UserNavigationFrame
 
 # Global variable to store the current user's information
@@ -13,38 +13,10 @@ current_user = None
 
 # ------------------- User Session Management -------------------
 def load_user_session(user_id=None):
-    """Load user information from database"""
+    """Load the logged-in user from the session (or a given user from the database)"""
     global current_user
-    
-    # If no user_id is provided, check if any was passed as a command line argument
-    if user_id is None and len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-        except (ValueError, IndexError):
-            user_id = None
-    
-    if user_id:
-        try:
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                return True
-            
-        except Exception as err:
-            print(f"Database Error: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_user = router.session_account("user", user_id)
+    return current_user is not None
 
 # ------------------- Hotel Search Function -------------------
 def search_hotels():
@@ -85,9 +57,7 @@ def search_hotels():
         
         # Open booking page with current user
         if current_user:
-            import subprocess
-            subprocess.Popen([sys.executable, "custom/booking.py", str(current_user['user_id'])])
-            app.destroy()
+            router.navigate("booking")
         
     except Exception as e:
         messagebox.showerror("Search Error", str(e))
@@ -101,9 +71,7 @@ def view_hotel_details(hotel_name):
         
         # Open booking page with current user
         if current_user:
-            import subprocess
-            subprocess.Popen([sys.executable, "custom/booking.py", str(current_user['user_id'])])
-            app.destroy()
+            router.navigate("booking")
             
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to view hotel details: {e}")
@@ -188,14 +156,8 @@ def main():
     # Try to load user session
     load_user_session()
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - Home")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - Home", "1200x700")
     
     # ----------------- Main Frame -----------------
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -296,7 +258,7 @@ def main():
         )
         no_hotels_label.pack(pady=50)
     
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,80 +1,57 @@
 import customtkinter as ctk
 from tkinter import messagebox, ttk
-import sys
 from datetime import datetime
 from tkcalendar import DateEntry
+import mysql.connector
+from mysql.connector import errorcode
 
+import booking_filters
 import config
+import dashboard_stats
+import inventory
+import router
+from virtual_table import VirtualTreeview
 from custom.navigation_frame_admin import AdminNavigationFrame
 
 # ------------------- Global Variables -------------------
 current_admin = None
 selected_booking = None
+pager = booking_filters.BookingPager(config.BOOKINGS_PAGE_SIZE)
+status_counts = {}       # per-status totals behind the count labels
+applied_status = "All"   # status filter the table was loaded with
 
 # ------------------- Admin Session Management -------------------
 def load_admin_session():
-    """Load admin information from database"""
+    """Load the logged-in admin from the session"""
     global current_admin
-    
-    # Check if any admin_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            admin_id = int(sys.argv[1])
-            
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Admin WHERE Admin_ID = %s",
-                (admin_id,)
-            )
-            admin_data = cursor.fetchone()
-            
-            if admin_data:
-                current_admin = admin_data
-                return True
-                
-        except Exception as err:
-            print(f"Error loading admin session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_admin = router.session_account("admin")
+    return current_admin is not None
 
 # ------------------- Booking Management Functions -------------------
-def load_bookings():
-    """Load all bookings from database"""
-    bookings = []
-    
-    try:
-        connection = config.connect_db()
-        cursor = connection.cursor(dictionary=True)
-        
-        # Query to get bookings with user and room info
-        cursor.execute(
-            """
-            SELECT b.Booking_ID, CONCAT(u.first_name, ' ', u.last_name) AS Customer,
-                   r.Room_Type, b.Check_IN_Date, b.Check_Out_Date, 
-                   b.Total_Cost, b.Booking_Status
-            FROM Booking b
-            JOIN Users u ON b.User_ID = u.user_id
-            JOIN Room r ON b.Room_ID = r.Room_ID
-            ORDER BY b.Check_IN_Date DESC
-            """
-        )
-        
-        bookings = cursor.fetchall()
-        return bookings
-        
-    except Exception as err:
+def load_bookings(with_counts=False, on_done=None):
+    """Load the next page of filtered bookings in the background.
+    
+    on_done(bookings, counts) runs on the Tk thread; counts is None unless asked for.
+    Loading a first page supersedes any page still loading for older filters.
+    """
+    def deliver(result):
+        bookings, next_key, counts = result
+        pager.advance(next_key)
+        on_done(bookings, counts)
+    
+    def show_error(err):
         print(f"Error loading bookings: {err}")
         messagebox.showerror("Database Error", f"Error loading bookings: {err}")
-        return []
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+        on_done([], None)
+    
+    # Filtering, ordering and paging all happen in SQL; only one page is transferred
+    if with_counts:
+        router.runner.cancel("more-bookings")
+    router.runner.submit(
+        booking_filters.load_page, *pager.request(), with_counts=with_counts,
+        on_done=deliver, on_error=show_error,
+        key="bookings" if with_counts else "more-bookings"
+    )
 
 def load_booking_details(booking_id):
     """Load details for a specific booking"""
@@ -123,17 +100,23 @@ def update_booking_status(booking_id, status):
             (status, booking_id)
         )
         
-        # If cancelling, make the room available again
+        # Cancelling gives the nights back; any other status holds them again
         if status == "Cancelled":
-            cursor.execute(
-                """
-                UPDATE Room r
-                JOIN Booking b ON r.Room_ID = b.Room_ID
-                SET r.Availability_status = 'Available'
-                WHERE b.Booking_ID = %s
-                """,
-                (booking_id,)
-            )
+            inventory.release_nights(cursor, booking_id)
+        else:
+            try:
+                inventory.claim_booking_nights(cursor, booking_id)
+            except mysql.connector.Error as err:
+                if err.errno != errorcode.ER_DUP_ENTRY:
+                    raise
+                # Another booking took some of its nights while it was cancelled
+                connection.rollback()
+                messagebox.showerror(
+                    "Room Unavailable",
+                    f"Booking #{booking_id} cannot be set to {status}: its room is no longer "
+                    f"free for those dates."
+                )
+                return False
         
         connection.commit()
         messagebox.showinfo("Success", f"Booking #{booking_id} status updated to {status}")
@@ -154,20 +137,15 @@ def delete_booking(booking_id):
         connection = config.connect_db()
         cursor = connection.cursor()
         
-        # Get the room ID before deleting the booking
-        cursor.execute("SELECT Room_ID FROM Booking WHERE Booking_ID = %s", (booking_id,))
-        room_id = cursor.fetchone()[0]
+        cursor.execute("SELECT Total_Cost FROM Booking WHERE Booking_ID = %s", (booking_id,))
+        booking = cursor.fetchone()
         
-        # Delete the booking
+        # Delete the booking (its Room_Night rows go with it)
         cursor.execute("DELETE FROM Booking WHERE Booking_ID = %s", (booking_id,))
         
-        # Make the room available again
-        cursor.execute(
-            "UPDATE Room SET Availability_status = 'Available' WHERE Room_ID = %s",
-            (room_id,)
-        )
-        
         connection.commit()
+        if booking:
+            dashboard_stats.booking_deleted(booking[0])
         messagebox.showinfo("Success", f"Booking #{booking_id} has been deleted")
         return True
         
@@ -181,59 +159,81 @@ def delete_booking(booking_id):
             connection.close()
 
 # ------------------- UI Functions -------------------
+def booking_row(booking):
+    """Turn a booking record into a (iid, values, tags) table row"""
+    # Format dates and values
+    check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
+    check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
+    
+    # Format amount
+    amount = f"${booking['Total_Cost']}"
+    
+    # Status tag for color coding
+    status = booking['Booking_Status']
+    status_tag = status.lower()
+    
+    return booking['Booking_ID'], (
+        booking['Booking_ID'],
+        booking['Customer'],
+        booking['Room_Type'],
+        check_in,
+        check_out,
+        amount,
+        status
+    ), (status_tag,)
+
 def populate_booking_table():
-    """Populate the booking table with data from database"""
-    # Clear existing rows
-    for row in booking_table.get_children():
-        booking_table.delete(row)
-    
-    # Load bookings and add to table
-    bookings = load_bookings()
-    
-    for booking in bookings:
-        # Format dates and values
-        check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
-        check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
-        
-        # Format amount
-        amount = f"${booking['Total_Cost']}"
+    """Populate the booking table from the first page of the current filters"""
+    def show_first_page(bookings, counts):
+        global status_counts
         
-        # Status tag for color coding
-        status = booking['Booking_Status']
-        status_tag = status.lower()
+        # Only the visible rows become Treeview items; scrolling fetches further pages
+        booking_table.set_rows([booking_row(booking) for booking in bookings], pager.has_next)
         
-        # Insert into table with status tag
-        booking_table.insert('', 'end', iid=booking['Booking_ID'], values=(
-            booking['Booking_ID'],
-            booking['Customer'],
-            booking['Room_Type'],
-            check_in,
-            check_out,
-            amount,
-            status
-        ), tags=(status_tag,))
-    
-    # Update status counts
-    update_status_counts()
+        # Update status counts
+        status_counts = counts or {}
+        update_status_counts(status_counts)
+    
+    pager.reset()
+    load_bookings(with_counts=True, on_done=show_first_page)
 
-def update_status_counts():
-    """Update the status count labels"""
-    # Count bookings by status
-    bookings = booking_table.get_children()
-    total = len(bookings)
-    
-    confirmed = 0
-    pending = 0
-    cancelled = 0
-    
-    for booking_id in bookings:
-        status = booking_table.item(booking_id, 'values')[6]
-        if status == "Confirmed":
-            confirmed += 1
-        elif status == "Pending":
-            pending += 1
-        elif status == "Cancelled":
-            cancelled += 1
+def load_more_bookings(deliver):
+    """Fetch the next page for the table when it is scrolled near the end"""
+    load_bookings(on_done=lambda bookings, counts: deliver(
+        [booking_row(booking) for booking in bookings], pager.has_next and bool(bookings)
+    ))
+
+def patch_booking_row(booking_id, new_status=None):
+    """Apply a status change (or a deletion when new_status is None) to the table in place.
+    
+    Only the affected row and the counters change; if the row was never loaded
+    the table falls back to a full refresh.
+    """
+    row = booking_table.get_row(booking_id)
+    if row is None:
+        populate_booking_table()
+        return
+    
+    iid, values, _ = row
+    old_status = values[6]
+    status_counts[old_status] = status_counts.get(old_status, 0) - 1
+    
+    # Deleted, or no longer matching the status filter: the row leaves the table
+    if new_status is None or applied_status not in ("All", new_status):
+        booking_table.remove_row(iid)
+    else:
+        values = values[:6] + (new_status,)
+        booking_table.update_row(iid, values, (new_status.lower(),))
+        status_counts[new_status] = status_counts.get(new_status, 0) + 1
+    
+    update_status_counts(status_counts)
+
+def update_status_counts(counts):
+    """Update the status count labels with totals for every matching booking"""
+    confirmed = counts.get("Confirmed", 0)
+    pending = counts.get("Pending", 0)
+    cancelled = counts.get("Cancelled", 0)
+    total = sum(counts.values())
     
     # Update labels
     total_count_label.configure(text=f"Total: {total}")
@@ -295,8 +295,8 @@ def confirm_booking():
     
     # Update booking status
     if update_booking_status(selected_booking['Booking_ID'], "Confirmed"):
-        # Refresh booking table
-        populate_booking_table()
+        # Patch the booking's row and the counters instead of reloading the table
+        patch_booking_row(selected_booking['Booking_ID'], "Confirmed")
         
         # Update details panel
         selected_booking['Booking_Status'] = "Confirmed"
@@ -320,8 +320,8 @@ def cancel_booking():
     
     # Update booking status
     if update_booking_status(selected_booking['Booking_ID'], "Cancelled"):
-        # Refresh booking table
-        populate_booking_table()
+        # Patch the booking's row and the counters instead of reloading the table
+        patch_booking_row(selected_booking['Booking_ID'], "Cancelled")
         
         # Update details panel
         selected_booking['Booking_Status'] = "Cancelled"
@@ -331,6 +331,8 @@ def cancel_booking():
 
 def delete_booking_ui():
     """Delete the selected booking (with confirmation)"""
+    global selected_booking
+    
     if not selected_booking:
         return
     
@@ -346,19 +348,20 @@ def delete_booking_ui():
     
     # Delete the booking
     if delete_booking(selected_booking['Booking_ID']):
-        # Refresh booking table
-        populate_booking_table()
+        # Drop the booking's row and adjust the counters instead of reloading the table
+        patch_booking_row(selected_booking['Booking_ID'])
         
         # Hide details panel
         details_frame.pack_forget()
         
         # Reset selected booking
-        global selected_booking
         selected_booking = None
 
 def filter_bookings():
-    """Filter bookings based on search term and date range"""
-    search_term = search_entry.get().lower()
+    """Filter bookings based on search term, date range and status"""
+    global applied_status
+    
+    search_term = search_entry.get()
     try:
         start_date = start_date_entry.get_date() if hasattr(start_date_entry, 'get_date') else None
         end_date = end_date_entry.get_date() if hasattr(end_date_entry, 'get_date') else None
@@ -367,70 +370,16 @@ def filter_bookings():
         end_date = None
     
     status_filter = status_var.get()
+    applied_status = status_filter
     
-    # Clear existing rows
-    for row in booking_table.get_children():
-        booking_table.delete(row)
-    
-    # Load all bookings
-    bookings = load_bookings()
-    
-    # Apply filters
-    filtered_bookings = []
-    for booking in bookings:
-        # Apply search term filter (customer name or room type)
-        if search_term and search_term not in booking['Customer'].lower() and search_term not in booking['Room_Type'].lower():
-            continue
-        
-        # Apply date range filter
-        booking_date = booking['Check_IN_Date']
-        if isinstance(booking_date, str):
-            try:
-                booking_date = datetime.strptime(booking_date, '%Y-%m-%d')
-            except:
-                booking_date = None
-        
-        if start_date and booking_date and booking_date < start_date:
-            continue
-        
-        if end_date and booking_date and booking_date > end_date:
-            continue
-        
-        # Apply status filter
-        if status_filter != "All" and booking['Booking_Status'] != status_filter:
-            continue
-        
-        filtered_bookings.append(booking)
-    
-    # Add filtered bookings to table
-    for booking in filtered_bookings:
-        # Format dates and values
-        check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
-        check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
-        
-        # Format amount
-        amount = f"${booking['Total_Cost']}"
-        
-        # Status tag for color coding
-        status = booking['Booking_Status']
-        status_tag = status.lower()
-        
-        # Insert into table with status tag
-        booking_table.insert('', 'end', iid=booking['Booking_ID'], values=(
-            booking['Booking_ID'],
-            booking['Customer'],
-            booking['Room_Type'],
-            check_in,
-            check_out,
-            amount,
-            status
-        ), tags=(status_tag,))
-    
-    # Update status counts
-    update_status_counts()
+    # Filters become SQL conditions; populating starts again from the first page
+    pager.filters = booking_filters.build_filters(search_term, start_date, end_date, status_filter)
+    populate_booking_table()
 
 def reset_filters():
     """Reset all filters and show all bookings"""
+    global applied_status
+    
     search_entry.delete(0, 'end')
     try:
         start_date_entry.set_date(None)
@@ -438,8 +387,10 @@ def reset_filters():
     except:
         pass
     status_var.set("All")
+    applied_status = "All"
     
-    # Refresh booking table
+    # Refresh booking table from the first unfiltered page
+    pager.filters = booking_filters.build_filters()
     populate_booking_table()
 
 # ----------------- Main Function -----------------
@@ -449,22 +400,16 @@ def main():
     global details_price, details_status, confirm_btn, cancel_btn
     global search_entry, start_date_entry, end_date_entry, status_var
     global total_count_label, confirmed_count_label, pending_count_label, cancelled_count_label
+    global applied_status
     
     # Try to load admin session
     if not load_admin_session():
         messagebox.showwarning("Login Required", "Admin login required to access this page")
-        import subprocess
-        subprocess.Popen([sys.executable, "custom/auth.py", "--mode=admin"])
+        router.navigate("auth", mode="admin")
         return
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - Manage Bookings")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - Manage Bookings", "1200x700")
     
     # ----------------- Main Frame -----------------
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -592,7 +537,8 @@ def main():
     
     # Create treeview for bookings
     columns = ('Booking ID', 'Customer', 'Room Type', 'Check-in', 'Check-out', 'Amount', 'Status')
-    booking_table = ttk.Treeview(table_frame, columns=columns, show='headings', height=10)
+    booking_table = VirtualTreeview(table_frame, fetch_more=load_more_bookings,
+                                    columns=columns, show='headings', height=10)
     
     # Configure column headings
     for col in columns:
@@ -697,10 +643,12 @@ def main():
                                 font=("Arial", 12, "bold"), text_color="#2C3E50")
     details_status.pack(anchor="w", pady=2)
     
-    # Populate the booking table
+    # Populate the booking table, starting from the first unfiltered page
+    applied_status = "All"
+    pager.filters = booking_filters.build_filters()
     populate_booking_table()
     
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,78 +1,52 @@
 import customtkinter as ctk
 from tkinter import messagebox, ttk
-import sys
 
 import config
+import dashboard_stats
+import router
+import sessions
+import user_filters
 from utils import hash_password
+from virtual_table import VirtualTreeview
 from custom.navigation_frame_admin import AdminNavigationFrame
 
 # ------------------- Global Variables -------------------
 current_admin = None
 selected_user = None
+pager = user_filters.UserPager(config.USERS_PAGE_SIZE)
 
 # ------------------- Admin Session Management -------------------
 def load_admin_session():
-    """Load admin information from database"""
+    """Load the logged-in admin from the session"""
     global current_admin
-    
-    # Check if any admin_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            admin_id = int(sys.argv[1])
-            
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Admin WHERE Admin_ID = %s",
-                (admin_id,)
-            )
-            admin_data = cursor.fetchone()
-            
-            if admin_data:
-                current_admin = admin_data
-                return True
-                
-        except Exception as err:
-            print(f"Error loading admin session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_admin = router.session_account("admin")
+    return current_admin is not None
 
 # ------------------- User Management Functions -------------------
-def load_users():
-    """Load all users from database"""
-    users = []
-    
-    try:
-        connection = config.connect_db()
-        cursor = connection.cursor(dictionary=True)
-        
-        # Query to get users with booking count
-        cursor.execute(
-            """
-            SELECT u.user_id, u.first_name, u.last_name, u.email, u.phone, 
-                   u.user_address, COUNT(b.Booking_ID) as bookings
-            FROM Users u
-            LEFT JOIN Booking b ON u.user_id = b.User_ID
-            GROUP BY u.user_id
-            ORDER BY u.user_id
-            """
-        )
-        
-        users = cursor.fetchall()
-        return users
-        
-    except Exception as err:
+def load_users(with_count=False, on_done=None):
+    """Load the next page of users matching the search in the background.
+    
+    on_done(users, total) runs on the Tk thread; total is None unless asked for.
+    Loading a first page supersedes any page still loading for an older search.
+    """
+    def deliver(result):
+        users, next_id, total = result
+        pager.advance(next_id)
+        on_done(users, total)
+    
+    def show_error(err):
         print(f"Error loading users: {err}")
         messagebox.showerror("Database Error", f"Error loading users: {err}")
-        return []
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+        on_done([], 0 if with_count else None)
+    
+    # Search and paging happen in SQL; only one page of users is transferred
+    if with_count:
+        router.runner.cancel("more-users")
+    router.runner.submit(
+        user_filters.load_page, *pager.request(), with_count=with_count,
+        on_done=deliver, on_error=show_error,
+        key="users" if with_count else "more-users"
+    )
 
 def load_user_details(user_id):
     """Load details for a specific user"""
@@ -160,6 +134,7 @@ def create_user():
         )
         
         connection.commit()
+        dashboard_stats.user_created()
         messagebox.showinfo("Success", "User created successfully")
         
         # Clear form fields
@@ -282,6 +257,8 @@ def delete_user():
         cursor.execute("DELETE FROM Users WHERE user_id = %s", (selected_user['user_id'],))
         
         connection.commit()
+        dashboard_stats.users_changed()
+        sessions.store.revoke_account("user", selected_user['user_id'])
         messagebox.showinfo("Success", "User deleted successfully")
         
         # Clear form and details
@@ -303,34 +280,43 @@ def delete_user():
             connection.close()
 
 # ------------------- UI Functions -------------------
-def populate_user_table():
-    """Populate the user table with data from database"""
-    # Clear existing rows
-    for row in user_table.get_children():
-        user_table.delete(row)
-    
-    # Load users and add to table
-    users = load_users()
-    
-    for user in users:
-        # Format values
-        full_name = f"{user['first_name']} {user['last_name']}"
-        phone = user['phone'] if user['phone'] else "N/A"
-        address = user['user_address'] if user['user_address'] else "N/A"
-        bookings = str(user['bookings'])
-        
-        # Insert into table
-        user_table.insert('', 'end', iid=user['user_id'], values=(
-            user['user_id'],
-            full_name,
-            user['email'],
-            phone,
-            address,
-            bookings
-        ))
-    
-    # Update user count
-    user_count_label.configure(text=f"Total Users: {len(users)}")
+def user_row(user):
+    """Turn a user record into a (iid, values, tags) table row"""
+    # Format values
+    full_name = f"{user['first_name']} {user['last_name']}"
+    phone = user['phone'] if user['phone'] else "N/A"
+    address = user['user_address'] if user['user_address'] else "N/A"
+    bookings = str(user['bookings'])
+    
+    return user['user_id'], (
+        user['user_id'],
+        full_name,
+        user['email'],
+        phone,
+        address,
+        bookings
+    ), ()
+
+def populate_user_table(search_term=""):
+    """Populate the user table with the first page of (matching) users"""
+    def show_first_page(users, total):
+        # Only the visible rows become Treeview items; scrolling fetches further pages
+        user_table.set_rows([user_row(user) for user in users], pager.has_next)
+        
+        # Update user count
+        if search_term:
+            user_count_label.configure(text=f"Filtered Users: {total}")
+        else:
+            user_count_label.configure(text=f"Total Users: {total}")
+    
+    pager.reset(user_filters.build_filters(search_term, include_address=True))
+    load_users(with_count=True, on_done=show_first_page)
+
+def load_more_users(deliver):
+    """Fetch the next page for the table when it is scrolled near the end"""
+    load_users(on_done=lambda users, total: deliver(
+        [user_row(user) for user in users], pager.has_next and bool(users)
+    ))
 
 def show_user_details(event=None):
     """Show details for the selected user"""
@@ -429,6 +415,7 @@ def clear_user_form():
     # Reset selected user
     global selected_user
     selected_user = None
+    user_table.clear_selection()
 
 def hide_user_details():
     """Hide the user details section"""
@@ -448,53 +435,9 @@ def new_user_mode():
     first_name_entry.focus_set()
 
 def search_users():
-    """Search users based on search term"""
-    search_term = search_entry.get().lower()
-    
-    if not search_term:
-        # If search term is empty, show all users
-        populate_user_table()
-        return
-    
-    # Clear existing rows
-    for row in user_table.get_children():
-        user_table.delete(row)
-    
-    # Load all users
-    users = load_users()
-    
-    # Filter users
-    filtered_users = []
-    for user in users:
-        # Check if search term is in name, email, or address
-        full_name = f"{user['first_name']} {user['last_name']}".lower()
-        email = user['email'].lower()
-        address = user['user_address'].lower() if user['user_address'] else ""
-        
-        if (search_term in full_name or search_term in email or 
-            search_term in address):
-            filtered_users.append(user)
-    
-    # Add filtered users to table
-    for user in filtered_users:
-        # Format values
-        full_name = f"{user['first_name']} {user['last_name']}"
-        phone = user['phone'] if user['phone'] else "N/A"
-        address = user['user_address'] if user['user_address'] else "N/A"
-        bookings = str(user['bookings'])
-        
-        # Insert into table
-        user_table.insert('', 'end', iid=user['user_id'], values=(
-            user['user_id'],
-            full_name,
-            user['email'],
-            phone,
-            address,
-            bookings
-        ))
-    
-    # Update user count
-    user_count_label.configure(text=f"Filtered Users: {len(filtered_users)}")
+    """Search users by name, email or address"""
+    # An empty search term shows all users
+    populate_user_table(search_entry.get().strip())
 
 # ----------------- Main Function -----------------
 def main():
@@ -507,18 +450,11 @@ def main():
     # Try to load admin session
     if not load_admin_session():
         messagebox.showwarning("Login Required", "Admin login required to access this page")
-        import subprocess
-        subprocess.Popen([sys.executable, "custom/auth.py", "--mode=admin"])
+        router.navigate("auth", mode="admin")
         return
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - Manage Users")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - Manage Users", "1200x700")
     
     # ----------------- Main Frame -----------------
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -648,7 +584,8 @@ def main():
     
     # Create treeview for users
     columns = ('ID', 'Name', 'Email', 'Phone', 'Address', 'Bookings')
-    user_table = ttk.Treeview(table_frame, columns=columns, show='headings', height=8)
+    user_table = VirtualTreeview(table_frame, fetch_more=load_more_users,
+                                 columns=columns, show='headings', height=8)
     
     # Configure column headings
     for col in columns:
@@ -754,7 +691,7 @@ def main():
     # Populate the user table
     populate_user_table()
     
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
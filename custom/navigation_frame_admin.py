@@ -1,6 +1,6 @@
 import customtkinter as ctk
-import subprocess
-import sys
+
+import router
 
 class AdminNavigationFrame:
     """Navigation sidebar for admin pages"""
@@ -23,23 +23,17 @@ class AdminNavigationFrame:
         
         # Navigation buttons with icons
         nav_buttons = [
-            ("📊 Dashboard", self.go_to_dashboard),
-            ("📅 Manage Bookings", self.go_to_bookings),
-            ("👤 Manage Users", self.go_to_users),
-            ("🚪 Logout", self.logout)
+            ("📊 Dashboard", "admin_dashboard", self.go_to_dashboard),
+            ("📅 Manage Bookings", "manage_bookings", self.go_to_bookings),
+            ("👤 Manage Users", "manage_users", self.go_to_users),
+            ("🚪 Logout", None, self.logout)
         ]
         
-        for btn_text, btn_command in nav_buttons:
-            # Check if this is the current page to highlight it
-            current_file = sys.argv[0].lower()
-            is_active = False
-            
-            if "admin_dashboard" in current_file and "Dashboard" in btn_text:
-                is_active = True
-            elif "manage_bookings" in current_file and "Bookings" in btn_text:
-                is_active = True
-            elif "manage_users" in current_file and "Users" in btn_text:
-                is_active = True
+        # Highlight the button for the page currently on screen
+        current_page = router.current_page_name()
+        
+        for btn_text, page_name, btn_command in nav_buttons:
+            is_active = page_name == current_page
             
             btn = ctk.CTkButton(self.frame, text=btn_text, font=("Arial", 14), 
                               fg_color="#34495E" if is_active else "transparent", 
@@ -68,25 +62,17 @@ class AdminNavigationFrame:
     
     def logout(self):
         """Log out and return to login page"""
+        router.session.clear()
         self.navigate_to("auth")
     
     def navigate_to(self, page_name):
         """Navigate to another page"""
         try:
-            # Pass the current admin ID to the next page if an admin is logged in
-            admin_param = []
-            if self.admin_data and 'Admin_ID' in self.admin_data:
-                admin_param = [str(self.admin_data['Admin_ID'])]
-            
-            # Construct the command to run the appropriate Python file
             if page_name == "auth":
                 # For logout, go to auth page for login
-                command = [sys.executable, "custom/auth.py"]
+                router.navigate("auth", mode="login")
             else:
-                # For other pages, go to the custom module
-                command = [sys.executable, f"custom/{page_name}.py"] + admin_param
-            
-            subprocess.Popen(command)
-            self.parent.winfo_toplevel().destroy()  # Close the current window
+                # The logged-in admin travels with the shared router session
+                router.navigate(page_name)
         except Exception as e:
             print(f"Navigation Error: {e}")
\ No newline at end of file
@@ -1,6 +1,6 @@
 import customtkinter as ctk
-import subprocess
-import sys
+
+import router
 
 class UserNavigationFrame:
     """Navigation sidebar for user pages"""
@@ -23,26 +23,18 @@ class UserNavigationFrame:
         
         # Navigation buttons with icons
         nav_buttons = [
-            ("🏠 Home", self.go_to_home),
-            ("📅 Bookings", self.go_to_bookings),
-            ("👤 Profile", self.go_to_profile),
-            ("💬 Feedback", self.go_to_feedback),
-            ("🚪 Logout", self.logout)
+            ("🏠 Home", "home", self.go_to_home),
+            ("📅 Bookings", "booking", self.go_to_bookings),
+            ("👤 Profile", "user_profile", self.go_to_profile),
+            ("💬 Feedback", "feedback", self.go_to_feedback),
+            ("🚪 Logout", None, self.logout)
         ]
         
-        for btn_text, btn_command in nav_buttons:
-            # Check if this is the current page to highlight it
-            current_file = sys.argv[0].lower()
-            is_active = False
-            
-            if "home.py" in current_file and "Home" in btn_text:
-                is_active = True
-            elif "book" in current_file and "Bookings" in btn_text:
-                is_active = True
-            elif "profile" in current_file and "Profile" in btn_text:
-                is_active = True
-            elif "feedback" in current_file and "Feedback" in btn_text:
-                is_active = True
+        # Highlight the button for the page currently on screen
+        current_page = router.current_page_name()
+        
+        for btn_text, page_name, btn_command in nav_buttons:
+            is_active = page_name == current_page
             
             btn = ctk.CTkButton(self.frame, text=btn_text, font=("Arial", 14), 
                               fg_color="#34495E" if is_active else "transparent", 
@@ -75,25 +67,17 @@ class UserNavigationFrame:
     
     def logout(self):
         """Log out and return to login page"""
+        router.session.clear()
         self.navigate_to("auth")
     
     def navigate_to(self, page_name):
         """Navigate to another page"""
         try:
-            # Pass the current user ID to the next page if a user is logged in
-            user_param = []
-            if self.user_data and 'user_id' in self.user_data:
-                user_param = [str(self.user_data['user_id'])]
-            
-            # Construct the command to run the appropriate Python file
             if page_name == "auth":
                 # For logout, go to the auth page
-                command = [sys.executable, "custom/auth.py"]
+                router.navigate("auth", mode="login")
             else:
-                # For other pages, go to the custom module
-                command = [sys.executable, f"custom/{page_name}.py"] + user_param
-            
-            subprocess.Popen(command)
-            self.parent.winfo_toplevel().destroy()  # Close the current window
+                # The logged-in user travels with the shared router session
+                router.navigate(page_name)
         except Exception as e:
             print(f"Navigation Error: {e}")
\ No newline at end of file
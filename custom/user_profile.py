@@ -1,9 +1,9 @@
 import customtkinter as ctk
 from tkinter import messagebox, ttk
-import sys
 from datetime import datetime
 
 import config
+import router
 from custom.navigation_frame_user import UserNavigationFrame
 
 # ------------------- Global Variables -------------------
@@ -11,34 +11,10 @@ current_user = None
 
 # ------------------- User Session Management -------------------
 def load_user_session():
-    """Load user information from database"""
+    """Load the logged-in user from the session"""
     global current_user
-    
-    # Check if any user_id was passed as a command line argument
-    if len(sys.argv) > 1:
-        try:
-            user_id = int(sys.argv[1])
-            
-            connection = config.connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM Users WHERE user_id = %s",
-                (user_id,)
-            )
-            user_data = cursor.fetchone()
-            
-            if user_data:
-                current_user = user_data
-                return True
-                
-        except Exception as err:
-            print(f"Error loading user session: {err}")
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    return False
+    current_user = router.session_account("user")
+    return current_user is not None
 
 # ------------------- Profile Functions -------------------
 def populate_profile_fields():
@@ -190,18 +166,11 @@ def main():
     # Check if user is logged in
     if not load_user_session():
         messagebox.showwarning("Login Required", "Please log in to view your profile")
-        import subprocess
-        subprocess.Popen([sys.executable, "custom/auth.py"])
+        router.navigate("auth", mode="login")
         return
     
-    # Initialize the app
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
-    
-    app = ctk.CTk()
-    app.title("Hotel Booking - User Profile")
-    app.geometry("1200x700")
-    app.resizable(False, False)
+    # Reuse the shared application window
+    app = router.open_window("Hotel Booking - User Profile", "1200x700")
     
     # ----------------- Main Frame -----------------
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -333,7 +302,7 @@ def main():
     populate_profile_fields()
     populate_booking_table()
     
-    app.mainloop()
+    router.mainloop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
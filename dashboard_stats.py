@@ -0,0 +1,155 @@
+# dashboard_stats.py
+import threading
+from decimal import Decimal
+
+import config
+import db
+
+# ------------------- Cached Dashboard Totals -------------------
+# The admin dashboards show four totals that used to be recounted with
+# COUNT/SUM scans every time they opened. They are now loaded once in a single
+# query and kept in memory. Pages that create or delete bookings, users and
+# hotels adjust them in place, and a background thread reloads them every
+# config.STATS_REFRESH_INTERVAL seconds to pick up changes made by other
+# processes (the user app books rooms in its own process). Changes whose
+# effect on a total is not known up front (deleting a user and their
+# bookings, deactivating a user) mark the totals stale, so the next read
+# reloads them.
+#
+# `stats` backs the dashboard in custom/ (every booking and user, rooms
+# listed); `active_stats` backs ui/admin (bookings of active users only,
+# hotels listed).
+
+ALL_TOTALS_SQL = """
+    SELECT (SELECT COUNT(*) FROM Booking),
+           (SELECT COALESCE(SUM(Total_Cost), 0) FROM Booking),
+           (SELECT COUNT(*) FROM Users),
+           (SELECT COUNT(*) FROM Room)
+"""
+
+ACTIVE_TOTALS_SQL = """
+    SELECT (SELECT COUNT(*) FROM Booking b JOIN Users u ON u.user_id = b.User_ID AND u.is_active = 1),
+           (SELECT COALESCE(SUM(b.Total_Cost), 0) FROM Booking b JOIN Users u ON u.user_id = b.User_ID AND u.is_active = 1),
+           (SELECT COUNT(*) FROM Users WHERE is_active = 1),
+           (SELECT COUNT(*) FROM Hotel)
+"""
+
+FIELDS = ("total_bookings", "total_revenue", "active_users", "hotels_listed")
+
+class DashboardStats:
+    """Dashboard totals served from memory and adjusted as bookings and users change"""
+
+    def __init__(self, sql):
+        self.sql = sql
+        self._totals = None     # None until first read, or after invalidate()
+        self._version = 0       # bumped by every adjustment
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The totals as a dict, loading them first if they are not in memory"""
+        with self._lock:
+            if self._totals is not None:
+                return dict(self._totals)
+        return self.refresh()
+
+    def refresh(self):
+        """Reload the totals from the database; returns them"""
+        with self._lock:
+            version = self._version
+
+        connection = db.get_connection()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(self.sql)
+            totals = dict(zip(FIELDS, cursor.fetchone()))
+        finally:
+            cursor.close()
+            connection.close()
+
+        with self._lock:
+            # An adjustment during the query may or may not be in this snapshot,
+            # so show the snapshot but reload on the next read
+            self._totals = totals if version == self._version else None
+        return dict(totals)
+
+    def adjust(self, **deltas):
+        """Add deltas to totals that are in memory (nothing to do if they are not)"""
+        with self._lock:
+            self._version += 1
+            if self._totals is not None:
+                for field, delta in deltas.items():
+                    self._totals[field] += delta
+
+    def invalidate(self):
+        """Reload the totals on the next read"""
+        with self._lock:
+            self._version += 1
+            self._totals = None
+
+    def is_loaded(self):
+        with self._lock:
+            return self._totals is not None
+
+stats = DashboardStats(ALL_TOTALS_SQL)
+active_stats = DashboardStats(ACTIVE_TOTALS_SQL)
+
+# ------------------- Write Hooks -------------------
+def booking_created(total_cost):
+    stats.adjust(total_bookings=1, total_revenue=Decimal(str(total_cost)))
+    active_stats.adjust(total_bookings=1, total_revenue=Decimal(str(total_cost)))
+
+def booking_deleted(total_cost, user_active=True):
+    stats.adjust(total_bookings=-1, total_revenue=-Decimal(str(total_cost)))
+    if user_active:
+        active_stats.adjust(total_bookings=-1, total_revenue=-Decimal(str(total_cost)))
+
+def user_created(active=True):
+    stats.adjust(active_users=1)
+    if active:
+        active_stats.adjust(active_users=1)
+
+def hotel_created():
+    active_stats.adjust(hotels_listed=1)
+
+def hotel_deleted():
+    """A hotel was deleted along with its bookings"""
+    active_stats.invalidate()
+
+def users_changed():
+    """A user was deleted or (de)activated: booking totals may change too"""
+    stats.invalidate()
+    active_stats.invalidate()
+
+# ------------------- Background Refresh -------------------
+_refresher = None
+_refresher_lock = threading.Lock()
+
+def _refresh_loop(interval, stop):
+    while not stop.wait(interval):
+        for totals in (stats, active_stats):
+            if not totals.is_loaded():
+                continue    # nobody has read these yet, or a reload is already due
+            try:
+                totals.refresh()
+            except Exception as err:
+                print(f"Dashboard stats refresh failed: {err}")
+
+def start_background_refresh(interval=None):
+    """Reload the totals in memory every `interval` seconds on a daemon thread (once per process)"""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = threading.Event()
+            threading.Thread(
+                target=_refresh_loop,
+                args=(interval or config.STATS_REFRESH_INTERVAL, _refresher),
+                name="dashboard-stats",
+                daemon=True
+            ).start()
+
+def stop_background_refresh():
+    global _refresher
+    with _refresher_lock:
+        if _refresher is not None:
+            _refresher.set()
+            _refresher = None
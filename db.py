@@ -0,0 +1,193 @@
+# db.py
+import queue
+import threading
+import time
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+import config
+import query_stats
+
+
+class PooledConnection:
+    """Connection handed out by the pool; close() returns it instead of disconnecting"""
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs):
+        """A cursor on the connection, timed by query_stats unless config.QUERY_STATS is off"""
+        if self._connection is None:
+            raise PoolError("Connection has already been returned to the pool")
+        cursor = self._connection.cursor(*args, **kwargs)
+        return query_stats.InstrumentedCursor(cursor) if config.QUERY_STATS else cursor
+
+    def is_connected(self):
+        # Pages call this in their finally blocks before close(); answering from
+        # local state avoids a server ping per query. Dead links are caught on release.
+        return self._connection is not None
+
+    def close(self):
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool.release(connection)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of MySQL connections"""
+
+    def __init__(self, size=5, timeout=10, health_check=True, **connect_args):
+        self.size = size
+        self.timeout = timeout
+        self.health_check = health_check
+        self._connect_args = connect_args
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "max_wait": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "discarded": 0,
+        }
+
+    def get_connection(self):
+        """Check out a connection, waiting up to `timeout` seconds for a free slot"""
+        start = time.perf_counter()
+        waited = not self._slots.acquire(blocking=False)
+        if waited and not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise PoolError(f"No database connection available after {self.timeout}s "
+                            f"(pool size {self.size})")
+        wait = time.perf_counter() - start
+
+        try:
+            connection = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            if waited:
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += wait
+                self._stats["max_wait"] = max(self._stats["max_wait"], wait)
+        return PooledConnection(self, connection)
+
+    def _checkout(self):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create()
+            if not self.health_check or self._is_healthy(connection):
+                return connection
+            self._discard(connection)
+
+    def _create(self):
+        connection = mysql.connector.connect(**self._connect_args)
+        with self._lock:
+            self._stats["created"] += 1
+        return connection
+
+    def _is_healthy(self, connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def _discard(self, connection):
+        with self._lock:
+            self._stats["discarded"] += 1
+        try:
+            connection.close()
+        except mysql.connector.Error:
+            pass
+
+    def release(self, connection):
+        """Return a connection to the pool, ending any open transaction first"""
+        try:
+            # Read-only callers never commit; rolling back drops their snapshot so
+            # the next borrower does not see stale REPEATABLE READ data.
+            if connection.in_transaction:
+                connection.rollback()
+        except mysql.connector.Error:
+            self._discard(connection)
+        else:
+            self._idle.put(connection)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def stats(self):
+        """Snapshot of pool counters for sizing the pool under load"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_use"] = self._in_use
+        stats["idle"] = self._idle.qsize()
+        stats["size"] = self.size
+        stats["avg_wait"] = stats["wait_time"] / stats["waits"] if stats["waits"] else 0.0
+        return stats
+
+    def close_all(self):
+        """Disconnect every idle connection"""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except mysql.connector.Error:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it from config on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    size=config.POOL_SIZE,
+                    timeout=config.POOL_TIMEOUT,
+                    health_check=config.POOL_HEALTH_CHECK,
+                    **config.DB_CONFIG
+                )
+    return _pool
+
+
+def get_connection():
+    """Borrow a connection from the shared pool"""
+    return get_pool().get_connection()
+
+
+def pool_stats():
+    """Return checkout, wait and wait-time counters for the shared pool"""
+    return get_pool().stats()
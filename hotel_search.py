@@ -0,0 +1,142 @@
+# hotel_search.py
+from datetime import date, timedelta
+
+# ------------------- Hotel Search Queries -------------------
+# Shared by the user home page (ui/home.py) and async_api. Functions take a
+# dictionary cursor and return plain rows, so they run on any thread.
+
+# Maximum number of hotels a search returns, best matches first
+SEARCH_RESULT_LIMIT = 50
+DEFAULT_AMENITIES = "📶 Free WiFi | 🏊 Pool | 🚗 Free Parking"
+
+def search_hotels(cursor, term, only_available=False, limit=SEARCH_RESULT_LIMIT,
+                  check_in=None, check_out=None):
+    """Hotels matching a name/location term, best match first, with their cheapest price.
+
+    only_available keeps hotels with a room category free from check_in to
+    check_out (tonight if no dates are given), priced from those categories.
+    """
+    # Rank hotels with the ngram FULLTEXT index on name + location (typo tolerant),
+    # keep the top N, and only then join room prices for those few hotels.
+    # Terms shorter than one ngram token fall back to the original substring
+    # match on location (a scan, but Hotel is small and one letter is rare).
+    term = term.strip()
+    if len(term) >= 2:
+        matches = """
+            SELECT Hotel_ID, MATCH(hotel_name, location) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+            FROM Hotel
+            WHERE MATCH(hotel_name, location) AGAINST (%s IN NATURAL LANGUAGE MODE)
+            ORDER BY score DESC
+            LIMIT %s
+        """
+        params = [term, term, limit]
+    else:
+        matches = """
+            SELECT Hotel_ID, 1 AS score
+            FROM Hotel
+            WHERE location LIKE %s
+            LIMIT %s
+        """
+        params = [f"%{term}%", limit]
+
+    query = f"""
+        SELECT h.Hotel_ID, h.hotel_name, h.location, h.description, h.star_rating, h.image_path,
+               MIN(rc.base_price) as min_price, m.score
+        FROM ({matches}) m
+        JOIN Hotel h ON h.Hotel_ID = m.Hotel_ID
+        LEFT JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
+        WHERE 1 = 1
+    """
+
+    if only_available:
+        # Counts every booking overlapping the stay, so a category whose bookings
+        # fall on different nights may be left out; the booking itself checks per night
+        check_in = check_in or date.today()
+        check_out = check_out or check_in + timedelta(days=1)
+        query += """
+            AND rc.room_count > (
+                SELECT COUNT(*) FROM Booking b
+                WHERE b.Room_ID = rc.Category_ID AND b.Booking_Status <> 'Cancelled'
+                  AND b.Check_IN_Date < %s AND b.Check_Out_Date > %s
+            )
+        """
+        params += [check_out, check_in]
+
+    query += " GROUP BY h.Hotel_ID, m.score ORDER BY m.score DESC, h.star_rating DESC, min_price"
+
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+def popular_hotels(cursor, limit=6):
+    """Top-rated hotels, cheapest first among equals"""
+    cursor.execute(
+        """
+        SELECT h.Hotel_ID, h.hotel_name, h.location, h.description, h.star_rating, h.image_path,
+               MIN(rc.base_price) as min_price
+        FROM Hotel h
+        LEFT JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
+        GROUP BY h.Hotel_ID
+        ORDER BY h.star_rating DESC, min_price
+        LIMIT %s
+        """,
+        (limit,)
+    )
+    return cursor.fetchall()
+
+def hotel_details(cursor, hotel_id):
+    """One hotel with its room categories under 'room_types', or None if it does not exist"""
+    cursor.execute(
+        """
+        SELECT h.Hotel_ID, h.hotel_name, h.location, h.description, h.star_rating, h.image_path
+        FROM Hotel h
+        WHERE h.Hotel_ID = %s
+        """, (hotel_id,)
+    )
+    hotel = cursor.fetchone()
+    if not hotel:
+        return None
+
+    cursor.execute(
+        """
+        SELECT Category_ID as Room_ID, category_name as Room_Type,
+               base_price as Price_per_Night, 'Available' as Availability_status
+        FROM RoomCategory rc
+        WHERE rc.Hotel_ID = %s
+        """, (hotel_id,)
+    )
+    hotel['room_types'] = cursor.fetchall()
+    return hotel
+
+def amenity_list(cursor, hotel_id):
+    """The amenities one hotel offers"""
+    cursor.execute(
+        """
+        SELECT a.Amenity_ID, a.amenity_name as Amenity_Name, a.amenity_icon as Amenity_Icon
+        FROM Hotel_Amenities ha
+        JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
+        WHERE ha.Hotel_ID = %s
+        """, (hotel_id,)
+    )
+    return cursor.fetchall()
+
+def hotel_amenities(cursor, hotel_ids):
+    """Fetch the amenity summary for many hotels in one query, keyed by Hotel_ID"""
+    if not hotel_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(hotel_ids))
+    cursor.execute(
+        f"""
+        SELECT ha.Hotel_ID,
+               GROUP_CONCAT(CONCAT(a.amenity_icon, ' ', a.amenity_name) SEPARATOR ' | ') as amenities
+        FROM Hotel_Amenities ha
+        JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
+        WHERE ha.Hotel_ID IN ({placeholders})
+        GROUP BY ha.Hotel_ID
+        """, tuple(hotel_ids)
+    )
+    return {row['Hotel_ID']: row['amenities'] for row in cursor.fetchall()}
+
+def with_amenities(cursor, hotels):
+    """Pair each hotel row with its amenity summary (or the default one)"""
+    amenities = hotel_amenities(cursor, [hotel['Hotel_ID'] for hotel in hotels])
+    return [(hotel, amenities.get(hotel['Hotel_ID']) or DEFAULT_AMENITIES) for hotel in hotels]
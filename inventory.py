@@ -0,0 +1,185 @@
+# inventory.py
+from datetime import date, datetime, timedelta
+
+# ------------------- Per-Night Room Inventory -------------------
+# Room_Night holds one row per room per booked night. The primary key
+# (Room_ID, Stay_Date) makes double-allocating a night impossible, and an
+# availability check for any date range is an index range probe per room,
+# so one query answers "which rooms are free from check-in to check-out".
+# Room.Availability_status now only says whether a room is in service.
+# Functions take a plain (tuple) cursor so they join the caller's transaction.
+
+ROOM_NIGHT_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS Room_Night (
+        Room_ID INT NOT NULL,
+        Stay_Date DATE NOT NULL,
+        Booking_ID INT NOT NULL,
+        PRIMARY KEY (Room_ID, Stay_Date),
+        INDEX idx_room_night_booking (Booking_ID),
+        FOREIGN KEY (Booking_ID) REFERENCES Booking(Booking_ID) ON DELETE CASCADE
+    )
+"""
+
+def _as_date(value):
+    return value.date() if isinstance(value, datetime) else value
+
+def stay_nights(check_in, check_out):
+    """Every night of a stay: check_in up to, not including, check_out"""
+    check_in, check_out = _as_date(check_in), _as_date(check_out)
+    return [check_in + timedelta(days=i) for i in range((check_out - check_in).days)]
+
+def find_available_rooms(cursor, check_in, check_out, room_type=None, limit=None):
+    """Return the Room_IDs that are in service and free for every night of the stay"""
+    query = """
+        SELECT r.Room_ID
+        FROM Room r
+        WHERE r.Availability_status = 'Available'
+          AND NOT EXISTS (
+              SELECT 1 FROM Room_Night n
+              WHERE n.Room_ID = r.Room_ID AND n.Stay_Date >= %s AND n.Stay_Date < %s
+          )
+    """
+    params = [_as_date(check_in), _as_date(check_out)]
+    if room_type is not None:
+        query += " AND r.Room_Type = %s"
+        params.append(room_type)
+    query += " ORDER BY r.Room_ID"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    cursor.execute(query, params)
+    return [row[0] for row in cursor.fetchall()]
+
+def availability_by_type(cursor, check_in, check_out):
+    """Count free rooms per Room_Type for a stay in a single query"""
+    cursor.execute(
+        """
+        SELECT r.Room_Type, COUNT(*)
+        FROM Room r
+        WHERE r.Availability_status = 'Available'
+          AND NOT EXISTS (
+              SELECT 1 FROM Room_Night n
+              WHERE n.Room_ID = r.Room_ID AND n.Stay_Date >= %s AND n.Stay_Date < %s
+          )
+        GROUP BY r.Room_Type
+        """,
+        (_as_date(check_in), _as_date(check_out))
+    )
+    return {row[0]: row[1] for row in cursor.fetchall()}
+
+def reserve_nights(cursor, room_id, booking_id, check_in, check_out):
+    """Allocate every night of a stay to a booking.
+
+    Raises mysql.connector.IntegrityError if any night is already taken, so the
+    caller's transaction can be rolled back.
+    """
+    nights = stay_nights(check_in, check_out)
+    cursor.executemany(
+        "INSERT INTO Room_Night (Room_ID, Stay_Date, Booking_ID) VALUES (%s, %s, %s)",
+        [(room_id, night, booking_id) for night in nights]
+    )
+    return len(nights)
+
+def release_nights(cursor, booking_id):
+    """Give back the nights held by a booking (cancellation)"""
+    cursor.execute("DELETE FROM Room_Night WHERE Booking_ID = %s", (booking_id,))
+    return cursor.rowcount
+
+def claim_booking_nights(cursor, booking_id):
+    """(Re)allocate the nights of an existing booking, e.g. when it is reinstated"""
+    release_nights(cursor, booking_id)
+    cursor.execute(
+        "SELECT Room_ID, Check_IN_Date, Check_Out_Date FROM Booking WHERE Booking_ID = %s",
+        (booking_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return 0
+    return reserve_nights(cursor, row[0], booking_id, row[1], row[2])
+
+# ------------------- Room Category Inventory -------------------
+# The ui/ app books a RoomCategory (its Booking.Room_ID holds a Category_ID)
+# rather than a physical room. Each category has room_count rooms; a stay
+# fits if, on every night, fewer than room_count other bookings of the
+# category cover that night. Bookings lock the category row first, so two
+# desks cannot both take its last room.
+
+DEFAULT_CATEGORY_ROOMS = 10
+
+def category_rooms_booked(cursor, category_id, check_in, check_out):
+    """Most rooms of a category booked on any one night of the stay (latest committed rows)"""
+    cursor.execute(
+        """
+        SELECT Check_IN_Date, Check_Out_Date
+        FROM Booking
+        WHERE Room_ID = %s AND Booking_Status <> 'Cancelled'
+          AND Check_IN_Date < %s AND Check_Out_Date > %s
+        LOCK IN SHARE MODE
+        """,
+        (category_id, _as_date(check_out), _as_date(check_in))
+    )
+    booked = dict.fromkeys(stay_nights(check_in, check_out), 0)
+    for booked_in, booked_out in cursor.fetchall():
+        for night in stay_nights(booked_in, booked_out):
+            if night in booked:
+                booked[night] += 1
+    return max(booked.values(), default=0)
+
+def lock_category_room(cursor, category_id, check_in, check_out):
+    """Lock a category for the caller's transaction; True if it has a room free every night"""
+    cursor.execute(
+        "SELECT room_count FROM RoomCategory WHERE Category_ID = %s FOR UPDATE",
+        (category_id,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    return category_rooms_booked(cursor, category_id, check_in, check_out) < row[0]
+
+def category_room_count(cursor):
+    """Give RoomCategory its room_count column (migration)"""
+    cursor.execute("SHOW COLUMNS FROM RoomCategory LIKE 'room_count'")
+    if cursor.fetchone() is None:
+        cursor.execute(
+            f"ALTER TABLE RoomCategory ADD COLUMN room_count INT NOT NULL DEFAULT {DEFAULT_CATEGORY_ROOMS}"
+        )
+
+def setup_inventory(cursor):
+    """Create Room_Night and fill it from existing bookings of physical rooms.
+
+    Returns the (Booking_ID, Room_ID, Stay_Date) nights left out because an
+    earlier booking already held them; they are printed for an admin to fix.
+    """
+    cursor.execute(ROOM_NIGHT_TABLE_SQL)
+    query = """
+        SELECT Booking_ID, Room_ID, Check_IN_Date, Check_Out_Date
+        FROM Booking
+        WHERE Booking_Status <> 'Cancelled' AND Check_Out_Date >= %s
+    """
+    # ui/ bookings hold a Category_ID in Room_ID (the foreign key to Room cannot
+    # tell them apart), so ids that name a room category are not physical rooms
+    cursor.execute("SHOW TABLES LIKE 'RoomCategory'")
+    if cursor.fetchone() is not None:
+        query += " AND Room_ID NOT IN (SELECT Category_ID FROM RoomCategory)"
+    cursor.execute(query + " ORDER BY Booking_ID", (date.today(),))
+
+    claimed = {}        # (Room_ID, Stay_Date) -> Booking_ID, earliest booking first
+    conflicts = []
+    for booking_id, room_id, check_in, check_out in cursor.fetchall():
+        for night in stay_nights(check_in, check_out):
+            if claimed.setdefault((room_id, night), booking_id) != booking_id:
+                conflicts.append((booking_id, room_id, night))
+    if claimed:
+        # IGNORE only skips nights an earlier run of this backfill already wrote
+        cursor.executemany(
+            "INSERT IGNORE INTO Room_Night (Room_ID, Stay_Date, Booking_ID) VALUES (%s, %s, %s)",
+            [(room_id, night, booking_id) for (room_id, night), booking_id in claimed.items()]
+        )
+    for booking_id, room_id, night in conflicts:
+        print(f"Room_Night backfill: booking #{booking_id} overlaps booking "
+              f"#{claimed[(room_id, night)]} in room {room_id} on {night}; night not allocated")
+
+    # The old flag marked rooms 'Booked' forever; nights now carry that information
+    cursor.execute("UPDATE Room SET Availability_status = 'Available' WHERE Availability_status = 'Booked'")
+    return conflicts
@@ -0,0 +1,118 @@
+# login_limiter.py
+import socket
+import threading
+import time
+
+import config
+
+# ------------------- Login Throttling -------------------
+# Every login attempt costs a query and a deliberately slow password hash, so
+# a burst of bad logins turned straight into database and CPU load. Failed
+# attempts now drain token buckets kept in memory: one per email and one per
+# source (the machine the attempt comes from), so both guessing one account
+# and spraying many are slowed down. A bucket holds config.LOGIN_MAX_FAILURES
+# (or LOGIN_SOURCE_MAX_FAILURES) tokens and gets one back every
+# config.LOGIN_REFILL_SECONDS. An attempt whose email or source bucket is
+# empty is rejected before the database is touched. A successful login
+# refills its email's bucket.
+#
+# Buckets are per process, like the rest of the in-memory state.
+
+LOCAL_SOURCE = socket.gethostname()
+
+class LoginThrottled(Exception):
+    """Too many failed logins for an email or source; retry_after is in seconds"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many failed login attempts. Try again in {int(retry_after) + 1} seconds.")
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """`capacity` tokens, refilled at one per `refill_seconds`"""
+
+    def __init__(self, capacity, refill_seconds):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.refill_seconds)
+        self.updated = now
+
+    def retry_after(self, now):
+        """Seconds until a token is available (0 if one is now)"""
+        self._refill(now)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) * self.refill_seconds
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens = max(0, self.tokens - 1)
+
+    def is_full(self, now):
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+class LoginLimiter:
+    """Thread-safe failed-login buckets keyed by (account, email) and by source"""
+
+    # Full buckets carry no information; drop them once this many are held
+    PRUNE_AT = 10_000
+
+    def __init__(self, max_failures, source_max_failures, refill_seconds):
+        self.max_failures = max_failures
+        self.source_max_failures = source_max_failures
+        self.refill_seconds = refill_seconds
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = {"allowed": 0, "failures": 0, "rejected_email": 0, "rejected_source": 0}
+
+    @staticmethod
+    def _keys(account, email, source):
+        return ("email", account, email.strip().lower()), ("source", source)
+
+    def check(self, account, email, source=LOCAL_SOURCE):
+        """Raise LoginThrottled if this attempt must wait; otherwise let it through"""
+        email_key, source_key = self._keys(account, email, source)
+        now = time.monotonic()
+        with self._lock:
+            for key, counter in ((email_key, "rejected_email"), (source_key, "rejected_source")):
+                bucket = self._buckets.get(key)
+                wait = bucket.retry_after(now) if bucket is not None else 0
+                if wait:
+                    self._stats[counter] += 1
+                    raise LoginThrottled(wait)
+            self._stats["allowed"] += 1
+
+    def failed(self, account, email, source=LOCAL_SOURCE):
+        email_key, source_key = self._keys(account, email, source)
+        now = time.monotonic()
+        with self._lock:
+            for key, capacity in ((email_key, self.max_failures), (source_key, self.source_max_failures)):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(capacity, self.refill_seconds)
+                bucket.take(now)
+            self._stats["failures"] += 1
+            if len(self._buckets) > self.PRUNE_AT:
+                for key in [key for key, bucket in self._buckets.items() if bucket.is_full(now)]:
+                    del self._buckets[key]
+
+    def succeeded(self, account, email, source=LOCAL_SOURCE):
+        email_key, _ = self._keys(account, email, source)
+        with self._lock:
+            self._buckets.pop(email_key, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["buckets"] = len(self._buckets)
+        return stats
+
+limiter = LoginLimiter(
+    config.LOGIN_MAX_FAILURES, config.LOGIN_SOURCE_MAX_FAILURES, config.LOGIN_REFILL_SECONDS
+)
+
+def login_stats():
+    """Allowed, failed and rejected login counters"""
+    return limiter.stats()
@@ -1,10 +1,10 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import subprocess
-import sys
 import os
 from PIL import Image, ImageTk
 import config
+import migrations
+import router
 from utils import hash_password
 
 # ------------------- Database Setup Functions -------------------
@@ -94,6 +94,9 @@ def setup_database():
         
         # Commit the changes
         connection.commit()
+        
+        # Apply pending schema migrations (indexes and later changes)
+        migrations.migrate(connection)
         return True
         
     except Exception as err:
@@ -177,24 +180,21 @@ def add_sample_data():
 def open_login():
     """Open the login page"""
     try:
-        subprocess.Popen([sys.executable, "custom/auth.py", "--mode=login"])
-        app.destroy()  # Close the current window
+        router.navigate("auth", mode="login")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open login page: {e}")
 
 def open_signup():
     """Open the signup page"""
     try:
-        subprocess.Popen([sys.executable, "custom/auth.py", "--mode=signup"])
-        app.destroy()  # Close the current window
+        router.navigate("auth", mode="signup")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open signup page: {e}")
 
 def open_admin_login():
     """Open the admin login page"""
     try:
-        subprocess.Popen([sys.executable, "custom/auth.py", "--mode=admin"])
-        app.destroy()  # Close the current window
+        router.navigate("auth", mode="admin")
     except Exception as e:
         messagebox.showerror("Error", f"Unable to open admin login page: {e}")
 
@@ -229,8 +229,6 @@ def check_required_files():
 # ------------------- Main Application -------------------
 def main():
     """Main application function"""
-    global app
-    
     # Setup the database and add sample data
     if not setup_database():
         messagebox.showerror("Setup Error", "Failed to set up the database. The application may not function correctly.")
@@ -241,14 +239,14 @@ def main():
     # Check if all required files exist
     check_required_files()
     
-    # Create the main application window
-    ctk.set_appearance_mode("light")
-    ctk.set_default_color_theme("blue")
+    # Show the launcher; every other page opens in this same window
+    router.show_page("launcher")
+
+def build_launcher():
+    """Build the launcher page into the shared application window"""
+    global app
     
-    app = ctk.CTk()
-    app.title("Hotel Booking System - Launcher")
-    app.geometry("1000x700")
-    app.resizable(False, False)
+    app = router.open_window("Hotel Booking System - Launcher", "1000x700")
     
     # Main Container
     main_frame = ctk.CTkFrame(app, fg_color="white", corner_radius=0)
@@ -331,7 +329,7 @@ def main():
     ctk.CTkLabel(content_frame, text="© 2023 All Rights Reserved", font=("Arial", 10), text_color="gray").pack(pady=(5, 0))
     
     # Run the application
-    app.mainloop()
+    router.mainloop()
 
 # Run the application
 if __name__ == "__main__":
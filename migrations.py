@@ -0,0 +1,186 @@
+# migrations.py
+from datetime import date, timedelta
+
+import inventory
+import report_rollup
+
+# ------------------- Migration Registry -------------------
+# Each migration runs once per database and is recorded in Schema_Migrations.
+# (version, description, tables it needs, function(cursor) applying it)
+# A migration whose tables do not exist yet (e.g. Hotel before the ui/ setup has
+# run against the shared database) stays pending until a later run can apply it.
+
+def add_index(cursor, table, index_name, columns):
+    """Create an index unless one already starts with the same columns"""
+    cursor.execute(
+        """
+        SELECT INDEX_NAME, COLUMN_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ORDER BY INDEX_NAME, SEQ_IN_INDEX
+        """,
+        (table,)
+    )
+    existing = {}
+    for name, column in cursor.fetchall():
+        existing.setdefault(name, []).append(column.lower())
+
+    wanted = [column.lower() for column in columns]
+    if any(index_columns[:len(wanted)] == wanted for index_columns in existing.values()):
+        return False
+
+    cursor.execute(f"CREATE INDEX {index_name} ON {table} ({', '.join(columns)})")
+    return True
+
+def add_fulltext_index(cursor, table, index_name, columns, parser=None):
+    """Create a FULLTEXT index unless one with this name already exists"""
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """,
+        (table, index_name)
+    )
+    if cursor.fetchone()[0]:
+        return False
+
+    with_parser = f" WITH PARSER {parser}" if parser else ""
+    cursor.execute(f"CREATE FULLTEXT INDEX {index_name} ON {table} ({', '.join(columns)}){with_parser}")
+    return True
+
+def booking_indexes(cursor):
+    add_index(cursor, "Booking", "idx_booking_checkin", ["Check_IN_Date"])
+    add_index(cursor, "Booking", "idx_booking_user_checkin", ["User_ID", "Check_IN_Date"])
+    add_index(cursor, "Booking", "idx_booking_status", ["Booking_Status", "Check_IN_Date"])
+
+def hotel_location_index(cursor):
+    add_index(cursor, "Hotel", "idx_hotel_location", ["location"])
+
+def room_category_hotel_index(cursor):
+    add_index(cursor, "RoomCategory", "idx_roomcategory_hotel", ["Hotel_ID"])
+
+def hotel_search_index(cursor):
+    # ngram tokens match substrings and tolerate typos ("Chicgo" still shares
+    # most bigrams with "Chicago"), and MATCH() gives a relevance score
+    add_fulltext_index(cursor, "Hotel", "ft_hotel_search", ["hotel_name", "location"], parser="ngram")
+
+MIGRATIONS = [
+    (1, "Booking check-in, user and status indexes", ["Booking"], booking_indexes),
+    (2, "Hotel location index", ["Hotel"], hotel_location_index),
+    (3, "RoomCategory hotel index", ["RoomCategory"], room_category_hotel_index),
+    (4, "Per-night room inventory", ["Booking", "Room"], inventory.setup_inventory),
+    (5, "Hotel name/location full-text search index", ["Hotel"], hotel_search_index),
+    (6, "Rooms per room category", ["RoomCategory"], inventory.category_room_count),
+    (7, "Daily booking rollup and its triggers", ["Booking", "RoomCategory"], report_rollup.setup_rollup),
+]
+
+# ------------------- Migration Runner -------------------
+def table_exists(cursor, table):
+    cursor.execute(
+        """
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+        (table,)
+    )
+    return cursor.fetchone()[0] > 0
+
+def migrate(connection):
+    """Apply pending migrations in version order; returns the versions applied"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Schema_Migrations (
+                Version INT PRIMARY KEY,
+                Description VARCHAR(255) NOT NULL,
+                Applied_At DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("SELECT Version FROM Schema_Migrations")
+        done = {row[0] for row in cursor.fetchall()}
+
+        applied = []
+        for version, description, tables, apply in MIGRATIONS:
+            if version in done:
+                continue
+            if not all(table_exists(cursor, table) for table in tables):
+                continue
+            apply(cursor)
+            cursor.execute(
+                "INSERT INTO Schema_Migrations (Version, Description) VALUES (%s, %s)",
+                (version, description)
+            )
+            connection.commit()
+            applied.append(version)
+        return applied
+    finally:
+        cursor.close()
+
+# ------------------- Index Usage Check -------------------
+# Hot queries from the pages, with representative parameters for EXPLAIN.
+HOT_QUERIES = [
+    ("admin_dashboard.get_monthly_data", ["Booking"],
+     """SELECT YEAR(Check_IN_Date), MONTH(Check_IN_Date), COUNT(*), SUM(Total_Cost)
+        FROM Booking WHERE Check_IN_Date >= %s AND Check_IN_Date < %s
+        GROUP BY YEAR(Check_IN_Date), MONTH(Check_IN_Date)""",
+     (date.today() - timedelta(days=180), date.today())),
+    ("user_profile.load_booking_history", ["Booking"],
+     """SELECT Booking_ID, Check_IN_Date, Check_Out_Date, Total_Cost, Booking_Status
+        FROM Booking WHERE User_ID = %s ORDER BY Check_IN_Date DESC""",
+     (1,)),
+    ("manage_bookings.filter_bookings (status)", ["Booking"],
+     """SELECT Booking_ID FROM Booking WHERE Booking_Status = %s
+        ORDER BY Check_IN_Date DESC, Booking_ID DESC LIMIT 51""",
+     ("Confirmed",)),
+    ("manage_bookings.filter_bookings (next page)", ["Booking"],
+     """SELECT Booking_ID FROM Booking
+        WHERE Check_IN_Date < %s OR (Check_IN_Date = %s AND Booking_ID < %s)
+        ORDER BY Check_IN_Date DESC, Booking_ID DESC LIMIT 51""",
+     (date.today(), date.today(), 1000)),
+    ("home.search_hotels", ["Hotel"],
+     """SELECT Hotel_ID FROM Hotel
+        WHERE MATCH(hotel_name, location) AGAINST (%s IN NATURAL LANGUAGE MODE)""",
+     ("New York",)),
+    ("home.load_hotel_details", ["RoomCategory"],
+     "SELECT category_name, base_price FROM RoomCategory WHERE Hotel_ID = %s",
+     (1,)),
+]
+
+def check_query_plans(connection):
+    """EXPLAIN each hot query and report the index (if any) MySQL picks per table"""
+    cursor = connection.cursor(dictionary=True)
+    report = []
+    try:
+        cursor.execute("SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()")
+        existing = {row["TABLE_NAME"].lower() for row in cursor.fetchall()}
+
+        for name, tables, sql, params in HOT_QUERIES:
+            if not all(table.lower() in existing for table in tables):
+                continue
+            cursor.execute("EXPLAIN " + sql, params)
+            for row in cursor.fetchall():
+                report.append({
+                    "query": name,
+                    "table": row.get("table"),
+                    "access": row.get("type"),
+                    "index": row.get("key"),
+                    "rows": row.get("rows"),
+                    "full_scan": row.get("type") == "ALL",
+                })
+    finally:
+        cursor.close()
+    return report
+
+if __name__ == "__main__":
+    import config
+
+    connection = config.connect_db()
+    try:
+        applied = migrate(connection)
+        print(f"Applied migrations: {applied or 'none pending'}")
+        for entry in check_query_plans(connection):
+            flag = "FULL SCAN" if entry["full_scan"] else "ok"
+            print(f"{entry['query']:45} {entry['table'] or '-':15} "
+                  f"{entry['index'] or '(no index)':28} rows={entry['rows']} {flag}")
+    finally:
+        connection.close()
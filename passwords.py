@@ -0,0 +1,176 @@
+# passwords.py
+import base64
+import hashlib
+import hmac
+import os
+
+import mysql.connector
+
+import config
+import db
+import login_limiter
+
+# ------------------- Password Hashing -------------------
+# Passwords are stored as "<algorithm>$<cost>$<salt>$<hash>" using a salted,
+# deliberately slow key derivation function (config.PASSWORD_HASHER: PBKDF2 or
+# scrypt, with the cost set in config). Hashes made with another algorithm or
+# an older cost still verify, and authenticate() replaces them on the next
+# successful login. Older accounts hold a bare unsalted SHA-256 hex digest;
+# those verify too and are always upgraded.
+#
+# A hash takes a few hundred milliseconds by design, so pages run logins and
+# sign-ups on a worker thread (tasks.TaskRunner). hashlib releases the GIL
+# while it hashes, so a burst of logins spreads over several cores.
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+def _unb64(text):
+    return base64.b64decode(text.encode("ascii"))
+
+class PBKDF2Hasher:
+    """PBKDF2-HMAC-SHA256: pbkdf2_sha256$<iterations>$<salt>$<hash>"""
+
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations=None):
+        self.iterations = iterations or config.PBKDF2_ITERATIONS
+
+    def encode(self, password, salt):
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64(salt)}${_b64(digest)}"
+
+    def verify(self, password, encoded):
+        _, iterations, salt, digest = encoded.split("$")
+        expected = hashlib.pbkdf2_hmac("sha256", password.encode(), _unb64(salt), int(iterations))
+        return hmac.compare_digest(expected, _unb64(digest))
+
+    def is_current(self, encoded):
+        return encoded.split("$")[1] == str(self.iterations)
+
+class ScryptHasher:
+    """scrypt: scrypt$<n>,<r>,<p>$<salt>$<hash>"""
+
+    algorithm = "scrypt"
+
+    def __init__(self, n=None, r=None, p=None):
+        self.n = n or config.SCRYPT_N
+        self.r = r or config.SCRYPT_R
+        self.p = p or config.SCRYPT_P
+
+    @staticmethod
+    def _derive(password, salt, n, r, p):
+        # Room for scrypt's working memory (128 * r * (n + p + 2) bytes) with some to spare
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * r * (n + p + 2), dklen=32)
+
+    def encode(self, password, salt):
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.algorithm}${self.n},{self.r},{self.p}${_b64(salt)}${_b64(digest)}"
+
+    def verify(self, password, encoded):
+        _, cost, salt, digest = encoded.split("$")
+        n, r, p = (int(value) for value in cost.split(","))
+        return hmac.compare_digest(self._derive(password, _unb64(salt), n, r, p), _unb64(digest))
+
+    def is_current(self, encoded):
+        return encoded.split("$")[1] == f"{self.n},{self.r},{self.p}"
+
+HASHERS = {hasher.algorithm: hasher for hasher in (PBKDF2Hasher, ScryptHasher)}
+
+def get_hasher():
+    """The hasher new passwords are stored with"""
+    return HASHERS[config.PASSWORD_HASHER]()
+
+def hash_password(password):
+    """Salted hash of a password for storing (slow: call it from a worker thread)"""
+    return get_hasher().encode(password, os.urandom(config.PASSWORD_SALT_BYTES))
+
+def verify_password(password, encoded):
+    """Check a password against a stored hash.
+
+    Returns (matches, needs_rehash); needs_rehash is True when the password
+    matched but the stored hash is not in the current algorithm and cost.
+    """
+    if not encoded:
+        return False, False
+
+    if "$" not in encoded:
+        # Unsalted SHA-256 from before salted hashing
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        matches = hmac.compare_digest(legacy, encoded.lower())
+        return matches, matches
+
+    hasher_class = HASHERS.get(encoded.split("$", 1)[0])
+    if hasher_class is None:
+        return False, False
+    try:
+        matches = hasher_class().verify(password, encoded)
+    except (ValueError, TypeError):
+        return False, False     # malformed hash
+
+    current = get_hasher()
+    needs_rehash = matches and (hasher_class is not type(current) or not current.is_current(encoded))
+    return matches, needs_rehash
+
+# ------------------- Login -------------------
+ACCOUNTS = {
+    # account: (table, email column, password column, id column)
+    "user": ("Users", "email", "password", "user_id"),
+    "admin": ("Admin", "AdminEmail", "AdminPassword", "Admin_ID"),
+}
+
+_dummy_hash = None
+
+def authenticate(account, email, password, source=login_limiter.LOCAL_SOURCE):
+    """The "user" or "admin" record for an email and password, or None.
+
+    The record comes back without its password column. An outdated hash is
+    upgraded on the way. Raises login_limiter.LoginThrottled, without touching
+    the database, after too many failures for the email or source. Blocking
+    (slow hash plus queries): run it on a worker thread.
+    """
+    login_limiter.limiter.check(account, email, source)
+    record = _check_password(account, email, password)
+    if record is None:
+        login_limiter.limiter.failed(account, email, source)
+    else:
+        login_limiter.limiter.succeeded(account, email, source)
+    return record
+
+def _check_password(account, email, password):
+    global _dummy_hash
+    table, email_column, password_column, id_column = ACCOUNTS[account]
+
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT * FROM {table} WHERE {email_column} = %s", (email,))
+        record = cursor.fetchone()
+        if record is None:
+            # Take as long as a real check, so timing does not tell which emails exist
+            if _dummy_hash is None:
+                _dummy_hash = hash_password("")
+            verify_password(password, _dummy_hash)
+            return None
+
+        stored = record.pop(password_column)
+        matches, needs_rehash = verify_password(password, stored)
+        if not matches:
+            return None
+
+        if needs_rehash:
+            try:
+                # Only replace the hash we checked, in case the password changed meanwhile
+                cursor.execute(
+                    f"UPDATE {table} SET {password_column} = %s "
+                    f"WHERE {id_column} = %s AND {password_column} = %s",
+                    (hash_password(password), record[id_column], stored)
+                )
+                connection.commit()
+            except mysql.connector.Error as err:
+                print(f"Could not upgrade password hash for {table} #{record[id_column]}: {err}")
+        return record
+    finally:
+        cursor.close()
+        connection.close()
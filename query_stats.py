@@ -0,0 +1,188 @@
+# query_stats.py
+import bisect
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+import config
+
+# ------------------- Query Instrumentation -------------------
+# Pages run dozens of inline cursor.execute() calls with no way to tell which
+# are slow. Cursors from the shared pool (db.py) are wrapped so that every
+# statement is timed and attributed to the function that ran it (module and
+# function name, e.g. manage_bookings.load_bookings). Statements are grouped
+# by caller and SQL text with call counts, rows fetched and a latency
+# histogram, and any execute slower than config.SLOW_QUERY_SECONDS is
+# appended to config.SLOW_QUERY_LOG.
+#
+# Latency is the time spent in execute(); for unbuffered cursors the rows are
+# read afterwards by the fetch calls, which only add to the row counts.
+# Set config.QUERY_STATS = False to hand out plain cursors.
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+BUCKET_LABELS = tuple(f"<{bound}ms" for bound in BUCKETS_MS) + (f">={BUCKETS_MS[-1]}ms",)
+
+_SKIP_FILES = {"query_stats", "db"}     # frames that are never the caller
+_IN_LIST = re.compile(r"%s(\s*,\s*%s)+")
+
+_lock = threading.Lock()
+_log_lock = threading.Lock()
+_statements = {}    # (caller, sql) -> counters
+
+def _caller():
+    """module.function of the first frame outside this module and db.py"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+        if module not in _SKIP_FILES:
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+def _normalize(operation):
+    """One line of SQL, with IN lists of any length folded together"""
+    if isinstance(operation, bytes):
+        operation = operation.decode("utf-8", "replace")
+    return _IN_LIST.sub("%s, ...", " ".join(str(operation).split()))
+
+def _record(caller, sql, elapsed, rowcount):
+    key = (caller, sql)
+    with _lock:
+        entry = _statements.get(key)
+        if entry is None:
+            entry = _statements[key] = {
+                "calls": 0, "total_time": 0.0, "max_time": 0.0, "rows": 0,
+                "histogram": [0] * len(BUCKET_LABELS),
+            }
+        entry["calls"] += 1
+        entry["total_time"] += elapsed
+        entry["max_time"] = max(entry["max_time"], elapsed)
+        if rowcount > 0:
+            entry["rows"] += rowcount
+        entry["histogram"][bisect.bisect_right(BUCKETS_MS, elapsed * 1000)] += 1
+    return entry
+
+def _add_rows(entry, count):
+    if entry is not None and count:
+        with _lock:
+            entry["rows"] += count
+
+def _log_slow(caller, sql, elapsed, rowcount):
+    line = (f"{datetime.now().isoformat(timespec='seconds')} {elapsed * 1000:.1f}ms "
+            f"rows={rowcount if rowcount >= 0 else '?'} {caller} {sql}\n")
+    try:
+        with _log_lock, open(config.SLOW_QUERY_LOG, "a", encoding="utf-8") as log:
+            log.write(line)
+    except OSError as err:
+        print(f"Could not write slow query log: {err}")
+
+class InstrumentedCursor:
+    """Cursor wrapper that times execute() calls and counts the rows fetched"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._entry = None      # counters of the statement last executed
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            _add_rows(self._entry, 1)
+            yield row
+
+    def _timed(self, method, operation, args, kwargs):
+        caller = _caller()
+        start = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            sql = _normalize(operation)
+            rowcount = self._cursor.rowcount
+            # DML reports affected rows here; SELECT rows are counted as they are fetched
+            self._entry = _record(caller, sql, elapsed, rowcount if not self._cursor.with_rows else 0)
+            if elapsed >= config.SLOW_QUERY_SECONDS:
+                _log_slow(caller, sql, elapsed, rowcount)
+
+    def execute(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.execute, operation, args, kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._timed(self._cursor.executemany, operation, args, kwargs)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            _add_rows(self._entry, 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        _add_rows(self._entry, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        _add_rows(self._entry, len(rows))
+        return rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._cursor.close()
+
+# ------------------- Reports -------------------
+def statement_stats():
+    """Counters per (caller, statement), slowest total time first"""
+    with _lock:
+        rows = [dict(entry, caller=caller, sql=sql, histogram=list(entry["histogram"]))
+                for (caller, sql), entry in _statements.items()]
+    for row in rows:
+        row["avg_time"] = row["total_time"] / row["calls"]
+    rows.sort(key=lambda row: row["total_time"], reverse=True)
+    return rows
+
+def caller_stats():
+    """Statement counters summed per calling function, slowest total time first"""
+    callers = {}
+    for row in statement_stats():
+        totals = callers.setdefault(row["caller"], {
+            "caller": row["caller"], "calls": 0, "total_time": 0.0, "max_time": 0.0, "rows": 0,
+            "histogram": [0] * len(BUCKET_LABELS),
+        })
+        totals["calls"] += row["calls"]
+        totals["total_time"] += row["total_time"]
+        totals["max_time"] = max(totals["max_time"], row["max_time"])
+        totals["rows"] += row["rows"]
+        totals["histogram"] = [a + b for a, b in zip(totals["histogram"], row["histogram"])]
+    return sorted(callers.values(), key=lambda totals: totals["total_time"], reverse=True)
+
+def histogram():
+    """Latency histogram of every statement: bucket label -> count"""
+    counts = [0] * len(BUCKET_LABELS)
+    with _lock:
+        for entry in _statements.values():
+            counts = [a + b for a, b in zip(counts, entry["histogram"])]
+    return dict(zip(BUCKET_LABELS, counts))
+
+def report(limit=20):
+    """Plain-text table of the callers that spent the most time in SQL"""
+    lines = [f"{'total ms':>10} {'calls':>7} {'avg ms':>8} {'max ms':>8} {'rows':>8}  caller"]
+    for totals in caller_stats()[:limit]:
+        lines.append(
+            f"{totals['total_time'] * 1000:>10.1f} {totals['calls']:>7} "
+            f"{totals['total_time'] * 1000 / totals['calls']:>8.2f} "
+            f"{totals['max_time'] * 1000:>8.1f} {totals['rows']:>8}  {totals['caller']}"
+        )
+    lines.append("latency: " + "  ".join(f"{label} {count}" for label, count in histogram().items()))
+    return "\n".join(lines)
+
+def reset():
+    with _lock:
+        _statements.clear()
@@ -0,0 +1,84 @@
+# report_rollup.py
+# Per-day, per-hotel booking totals used by the admin reports.
+# MySQL triggers keep the rollup current as bookings are inserted, updated
+# (cancelled, re-dated, re-priced) or deleted, so reports never scan Booking.
+# The table and triggers are created once, by a migration (migrations.py).
+
+# ------------------- Rollup Table -------------------
+ROLLUP_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS Booking_Daily_Stats (
+        Stat_Date DATE NOT NULL,
+        Hotel_ID INT NOT NULL DEFAULT 0,
+        User_ID INT NOT NULL,
+        Bookings INT NOT NULL DEFAULT 0,
+        Revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        Cancelled INT NOT NULL DEFAULT 0,
+        Cancelled_Revenue DECIMAL(12, 2) NOT NULL DEFAULT 0,
+        PRIMARY KEY (Stat_Date, Hotel_ID, User_ID)
+    )
+"""
+
+# Booking.Room_ID holds the RoomCategory the guest booked; bookings without a
+# category are rolled up under Hotel_ID 0.
+HOTEL_OF = "COALESCE((SELECT Hotel_ID FROM RoomCategory WHERE Category_ID = {row}.Room_ID), 0)"
+
+ADD_BOOKING_SQL = """
+    INSERT INTO Booking_Daily_Stats
+        (Stat_Date, Hotel_ID, User_ID, Bookings, Revenue, Cancelled, Cancelled_Revenue)
+    VALUES (NEW.Check_IN_Date, {hotel}, NEW.User_ID, 1, NEW.Total_Cost,
+            IF(NEW.Booking_Status = 'Cancelled', 1, 0),
+            IF(NEW.Booking_Status = 'Cancelled', NEW.Total_Cost, 0))
+    ON DUPLICATE KEY UPDATE
+        Bookings = Bookings + 1,
+        Revenue = Revenue + NEW.Total_Cost,
+        Cancelled = Cancelled + IF(NEW.Booking_Status = 'Cancelled', 1, 0),
+        Cancelled_Revenue = Cancelled_Revenue + IF(NEW.Booking_Status = 'Cancelled', NEW.Total_Cost, 0);
+""".format(hotel=HOTEL_OF.format(row="NEW"))
+
+REMOVE_BOOKING_SQL = """
+    UPDATE Booking_Daily_Stats
+    SET Bookings = Bookings - 1,
+        Revenue = Revenue - OLD.Total_Cost,
+        Cancelled = Cancelled - IF(OLD.Booking_Status = 'Cancelled', 1, 0),
+        Cancelled_Revenue = Cancelled_Revenue - IF(OLD.Booking_Status = 'Cancelled', OLD.Total_Cost, 0)
+    WHERE Stat_Date = OLD.Check_IN_Date AND Hotel_ID = {hotel} AND User_ID = OLD.User_ID;
+    DELETE FROM Booking_Daily_Stats
+    WHERE Stat_Date = OLD.Check_IN_Date AND Hotel_ID = {hotel} AND User_ID = OLD.User_ID
+      AND Bookings <= 0;
+""".format(hotel=HOTEL_OF.format(row="OLD"))
+
+TRIGGERS = {
+    "Booking_Rollup_Insert": f"AFTER INSERT ON Booking FOR EACH ROW BEGIN {ADD_BOOKING_SQL} END",
+    "Booking_Rollup_Update": f"AFTER UPDATE ON Booking FOR EACH ROW BEGIN {REMOVE_BOOKING_SQL} {ADD_BOOKING_SQL} END",
+    "Booking_Rollup_Delete": f"AFTER DELETE ON Booking FOR EACH ROW BEGIN {REMOVE_BOOKING_SQL} END",
+}
+
+BACKFILL_SQL = """
+    INSERT INTO Booking_Daily_Stats
+        (Stat_Date, Hotel_ID, User_ID, Bookings, Revenue, Cancelled, Cancelled_Revenue)
+    SELECT b.Check_IN_Date, COALESCE(rc.Hotel_ID, 0), b.User_ID, COUNT(*), SUM(b.Total_Cost),
+           SUM(b.Booking_Status = 'Cancelled'),
+           SUM(IF(b.Booking_Status = 'Cancelled', b.Total_Cost, 0))
+    FROM Booking b
+    LEFT JOIN RoomCategory rc ON rc.Category_ID = b.Room_ID
+    GROUP BY b.Check_IN_Date, COALESCE(rc.Hotel_ID, 0), b.User_ID
+"""
+
+def setup_rollup(cursor):
+    """Create the rollup table and its triggers, then fill it from Booking.
+
+    The triggers go in before the fill: a booking written meanwhile is either
+    already in Booking when the rebuild reads it or waits for the rebuild's
+    locks, so none is missed or counted twice. Databases set up before this
+    was a migration get their triggers replaced and the rollup recomputed.
+    """
+    cursor.execute(ROLLUP_TABLE_SQL)
+    for name, body in TRIGGERS.items():
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"CREATE TRIGGER {name} {body}")
+    rebuild_rollup(cursor)
+
+def rebuild_rollup(cursor):
+    """Recompute the whole rollup from Booking (e.g. after bulk edits with triggers off)"""
+    cursor.execute("DELETE FROM Booking_Daily_Stats")
+    cursor.execute(BACKFILL_SQL)
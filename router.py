@@ -0,0 +1,171 @@
+# router.py
+import importlib
+import os
+import sys
+import time
+
+import customtkinter as ctk
+
+import sessions
+import tasks
+import ui_profiler
+
+# Page name -> (module, function that builds the page into the shared window)
+PAGES = {
+    "launcher": ("main", "build_launcher"),
+    "auth": ("custom.auth", "main"),
+    "home": ("custom.home", "main"),
+    "booking": ("custom.booking", "main"),
+    "user_profile": ("custom.user_profile", "main"),
+    "feedback": ("custom.feedback", "main"),
+    "admin_dashboard": ("custom.admin_dashboard", "main"),
+    "manage_bookings": ("custom.manage_bookings", "main"),
+    "manage_users": ("custom.manage_users", "main"),
+}
+
+
+class Session:
+    """Tokens for the logged-in user/admin, shared by every page in the process.
+
+    The records themselves live in sessions.store; an expired or revoked
+    token reads back as None.
+    """
+
+    def __init__(self):
+        self.user_token = None
+        self.admin_token = None
+        self.started = set()    # kinds that have had a session in this process
+
+    @property
+    def user(self):
+        return sessions.store.get(self.user_token)
+
+    @user.setter
+    def user(self, record):
+        sessions.store.revoke(self.user_token)
+        self.user_token = sessions.store.create("user", record) if record else None
+        if record:
+            self.started.add("user")
+
+    @property
+    def admin(self):
+        return sessions.store.get(self.admin_token)
+
+    @admin.setter
+    def admin(self, record):
+        sessions.store.revoke(self.admin_token)
+        self.admin_token = sessions.store.create("admin", record) if record else None
+        if record:
+            self.started.add("admin")
+
+    def clear(self):
+        self.user = None
+        self.admin = None
+
+
+# Process-wide state: one window, one session, one page shown at a time
+root = None
+runner = None   # tasks.TaskRunner for background queries, created with the window
+session = Session()
+current_page = None
+params = {}
+_running = False
+_build_started = None   # when the page being built started (for ui_profiler)
+
+
+def open_window(title, geometry="1200x700", resizable=False):
+    """Return the shared window, emptied and retitled for the page being built"""
+    global root, runner
+    if root is None:
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("blue")
+        root = ctk.CTk()
+        runner = tasks.TaskRunner(root)
+        ui_profiler.install(root)
+    else:
+        # Results of the previous page's queries would land on destroyed widgets
+        runner.cancel_all()
+        for widget in root.winfo_children():
+            widget.destroy()
+
+    root.title(title)
+    root.geometry(geometry)
+    root.resizable(resizable, resizable)
+    return root
+
+
+def navigate(page_name, **page_params):
+    """Swap the current page for another one in the same window"""
+    if _running:
+        # Let the callback that asked for navigation finish before its widgets go away
+        root.after(0, lambda: show_page(page_name, **page_params))
+    else:
+        show_page(page_name, **page_params)
+
+
+def show_page(page_name, **page_params):
+    """Build a page immediately"""
+    global current_page, params, _build_started
+    module_name, function_name = PAGES[page_name]
+    module = importlib.import_module(module_name)
+    current_page = page_name
+    params = page_params
+    _build_started = time.perf_counter()
+    getattr(module, function_name)()
+    _finish_build()
+
+
+def _finish_build():
+    # The first page enters mainloop() from inside its build function, so the
+    # build is timed up to whichever comes first
+    global _build_started
+    if _build_started is not None:
+        ui_profiler.page_built(current_page, root, time.perf_counter() - _build_started)
+        _build_started = None
+
+
+def session_account(kind, account_id=None):
+    """The logged-in "user" or "admin" record, or None.
+
+    Comes from the session when there is one; otherwise the account is looked
+    up by account_id, or by the id the script was started with, and a session
+    is started for it. The script's id is only used before the first session:
+    once a session has expired, been revoked or logged out, this is None.
+    """
+    if account_id is None:
+        record = getattr(session, kind)
+        if record is not None or kind in session.started:
+            return record
+        try:
+            account_id = int(sys.argv[1])
+        except (IndexError, ValueError):
+            return None
+
+    try:
+        record = sessions.load_account(kind, account_id)
+    except Exception as err:
+        print(f"Error loading {kind} session: {err}")
+        return None
+    if record is not None:
+        setattr(session, kind, record)
+    return record
+
+
+def current_page_name():
+    """Name of the page on screen, falling back to the script that was started"""
+    if current_page:
+        return current_page
+    return os.path.splitext(os.path.basename(sys.argv[0]))[0].lower()
+
+
+def mainloop():
+    """Run the Tk event loop once; later pages just rebuild the window"""
+    global _running
+    if _running or root is None:
+        return
+    _running = True
+    _finish_build()
+    try:
+        root.mainloop()
+    finally:
+        _running = False
@@ -0,0 +1,344 @@
+# service.py
+import json
+import re
+import traceback
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import mysql.connector
+
+import booking_filters
+import bookings
+import catalog
+import config
+import db
+import hotel_search
+import login_limiter
+import passwords
+import query_stats
+import sessions
+
+# ------------------- Headless Booking Service -------------------
+# JSON over HTTP front end to the same search, booking and report logic the
+# desktop pages use, so desk clients can share one backend instead of each
+# opening its own connections. Handlers keep no state between requests (all
+# state lives in MySQL), so any number of instances can run behind a load
+# balancer. Each request thread borrows from the process-wide pool in db.py.
+#
+#   GET  /health                              ** pool, booking, catalog cache and query counters
+#   GET  /hotels?q=&available=1&limit=        search_hotels
+#   GET  /hotels/<id>                         hotel with its room types
+#   GET  /bookings                            ** ?search=&start=&end=&status=&after=<date>,<id>&limit=
+#   POST /sessions                            {account: user|admin, email, password} -> {token}
+#   POST /sessions/logout                     *
+#   POST /bookings                            * {room_type, check_in, check_out, [user_id]}
+#   POST /bookings/<id>/cancel                * own bookings only, unless an admin
+#   GET  /reports/monthly                     ** ?start=YYYY-MM&end=YYYY-MM
+#
+# * needs "Authorization: Bearer <token>" from POST /sessions, and ** needs
+#   one from an admin session; only the hotel search and details are
+#   anonymous. A booking is priced at the nightly rate of the room it is
+#   given, times the nights, and that total comes back with it; user_id is
+#   only taken from admins booking on a user's behalf.
+#
+#     python service.py
+
+MAX_PAGE_SIZE = 200
+
+class ServiceError(Exception):
+    """A request the service rejects, with the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+# ------------------- Argument Parsing -------------------
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"{name} must be an integer")
+
+def _date(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"{name} must be a date (YYYY-MM-DD)")
+
+def _month(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"{name} must be a month (YYYY-MM)")
+
+def _limit(query, default):
+    limit = _int(_param(query, "limit", default), "limit")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ServiceError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+def _with_cursor(fn, *args, dictionary=True):
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=dictionary)
+    try:
+        return fn(cursor, *args)
+    finally:
+        cursor.close()
+        connection.close()
+
+# ------------------- Endpoints -------------------
+def health(query):
+    return {
+        "pool": db.pool_stats(),
+        "bookings": bookings.booking_stats(),
+        "catalog": catalog.cache_stats(),
+        "queries": {
+            "latency": query_stats.histogram(),
+            "callers": query_stats.caller_stats()[:10],
+        },
+    }
+
+def search_hotels(query):
+    term = _param(query, "q", "")
+    only_available = _param(query, "available", "0") in ("1", "true", "yes")
+    limit = _limit(query, hotel_search.SEARCH_RESULT_LIMIT)
+
+    def run(cursor):
+        hotels = hotel_search.search_hotels(cursor, term, only_available, limit)
+        return hotel_search.with_amenities(cursor, hotels)
+
+    return {"hotels": [dict(hotel, amenities=amenities) for hotel, amenities in _with_cursor(run)]}
+
+def load_hotel_details(query, hotel_id):
+    hotel = catalog.hotel_details(_int(hotel_id, "hotel id"))
+    if hotel is None:
+        raise ServiceError(404, "Hotel not found")
+    return hotel
+
+def load_bookings(query):
+    start = _param(query, "start")
+    end = _param(query, "end")
+    filters = booking_filters.build_filters(
+        _param(query, "search", ""),
+        _date(start, "start") if start else None,
+        _date(end, "end") if end else None,
+        _param(query, "status", "All")
+    )
+
+    after = _param(query, "after")
+    if after:
+        check_in, _, booking_id = after.partition(",")
+        after = (_date(check_in, "after"), _int(booking_id, "after"))
+
+    rows, next_key, counts = booking_filters.load_page(
+        filters, after, _limit(query, config.BOOKINGS_PAGE_SIZE),
+        with_counts=_param(query, "counts", "0") in ("1", "true", "yes")
+    )
+    return {
+        "bookings": rows,
+        "next": f"{next_key[0].isoformat()},{next_key[1]}" if next_key else None,
+        "counts": counts,
+    }
+
+def log_in(body, source):
+    try:
+        account = body["account"]
+        email = body["email"]
+        password = body["password"]
+    except KeyError as missing:
+        raise ServiceError(400, f"Missing field {missing}")
+    if account not in passwords.ACCOUNTS:
+        raise ServiceError(400, "account must be 'user' or 'admin'")
+    if not isinstance(email, str) or not isinstance(password, str):
+        raise ServiceError(400, "email and password must be strings")
+
+    try:
+        record = passwords.authenticate(account, email, password, source)
+    except login_limiter.LoginThrottled as err:
+        raise ServiceError(429, str(err))
+    if record is None:
+        raise ServiceError(401, "Invalid email or password")
+    if account == "user" and not record.get("is_active", 1):
+        raise ServiceError(403, "Account is deactivated")
+    return {"token": sessions.store.create(account, record), "expires_in": sessions.store.ttl}
+
+def log_out(body, session):
+    sessions.store.revoke(session[2])
+    return {"status": "Logged out"}
+
+def confirm_booking(body, session):
+    kind, account, _ = session
+    try:
+        room_type = body["room_type"]
+        check_in = _date(body["check_in"], "check_in")
+        check_out = _date(body["check_out"], "check_out")
+        # Admins book on behalf of a user; users only for themselves
+        user_id = _int(body["user_id"], "user_id") if kind == "admin" else account["user_id"]
+    except KeyError as missing:
+        raise ServiceError(400, f"Missing field {missing}")
+    if kind == "user" and "user_id" in body and _int(body["user_id"], "user_id") != user_id:
+        raise ServiceError(403, "Users can only book for themselves")
+    if check_out <= check_in:
+        raise ServiceError(400, "check_out must be after check_in")
+
+    # Priced inside the booking transaction from the room actually allocated
+    try:
+        booked = bookings.book_room(user_id, room_type, check_in, check_out)
+    except ValueError as err:
+        raise ServiceError(409, str(err))
+    if booked is None:
+        raise ServiceError(409, "No room of that type is free for those dates")
+    booking_id, room_id, total_cost = booked
+    return {"booking_id": booking_id, "room_id": room_id, "total_cost": total_cost}
+
+def cancel_booking(body, session, booking_id):
+    kind, account, _ = session
+    booking_id = _int(booking_id, "booking id")
+    owner = _with_cursor(bookings.booking_owner, booking_id, dictionary=False)
+    if owner is None:
+        raise ServiceError(404, "Booking not found")
+    if kind == "user" and owner != account["user_id"]:
+        raise ServiceError(403, "Not your booking")
+
+    if not bookings.cancel_booking(booking_id, account["user_id"] if kind == "user" else None):
+        raise ServiceError(409, "Booking is already cancelled")
+    return {"booking_id": booking_id, "status": "Cancelled"}
+
+def monthly_report(query):
+    first = _month(_param(query, "start"), "start")
+    last = _month(_param(query, "end"), "end")
+    if last < first:
+        raise ServiceError(400, "end must not be before start")
+    after_last = date(last.year + last.month // 12, last.month % 12 + 1, 1)
+
+    totals = _with_cursor(bookings.monthly_totals, first, after_last, dictionary=False)
+    months = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        count, revenue = totals.get((year, month), (0, 0))
+        months.append({"month": f"{year}-{month:02d}", "bookings": count, "revenue": revenue or 0})
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return {"months": months}
+
+GET_ROUTES = [
+    (re.compile(r"^/health$"), health),
+    (re.compile(r"^/hotels$"), search_hotels),
+    (re.compile(r"^/hotels/(\d+)$"), load_hotel_details),
+    (re.compile(r"^/bookings$"), load_bookings),
+    (re.compile(r"^/reports/monthly$"), monthly_report),
+]
+
+# Endpoints taking the caller's session (kind, record, token) after the body
+AUTH_ROUTES = {confirm_booking, cancel_booking, log_out}
+
+# Endpoints only an admin session may call (every booking, revenue, counters)
+ADMIN_ROUTES = {health, load_bookings, monthly_report}
+
+POST_ROUTES = [
+    (re.compile(r"^/sessions$"), log_in),
+    (re.compile(r"^/sessions/logout$"), log_out),
+    (re.compile(r"^/bookings$"), confirm_booking),
+    (re.compile(r"^/bookings/(\d+)/cancel$"), cancel_booking),
+]
+
+# ------------------- HTTP Server -------------------
+class BookingRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the endpoint functions and answers in JSON"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self._dispatch(GET_ROUTES, url.path, parse_qs(url.query))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._respond(400, {"error": "Body must be JSON"})
+            return
+        if not isinstance(body, dict):
+            self._respond(400, {"error": "Body must be a JSON object"})
+            return
+        self._dispatch(POST_ROUTES, url.path, body)
+
+    def _dispatch(self, routes, path, argument):
+        for pattern, endpoint in routes:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            self._respond(404, {"error": "Not found"})
+            return
+
+        try:
+            if endpoint is log_in:
+                result = log_in(argument, self.client_address[0])
+            elif endpoint in AUTH_ROUTES:
+                result = endpoint(argument, self._session(), *match.groups())
+            elif endpoint in ADMIN_ROUTES:
+                if self._session()[0] != "admin":
+                    raise ServiceError(403, "Admins only")
+                result = endpoint(argument, *match.groups())
+            else:
+                result = endpoint(argument, *match.groups())
+            self._respond(200, result)
+        except ServiceError as err:
+            self._respond(err.status, {"error": str(err)})
+        except mysql.connector.Error as err:
+            self.log_error("Database error: %s", err)
+            self._respond(503, {"error": "Database error"})
+        except Exception as err:
+            self.log_error("Unhandled error for %s %s: %r", self.command, path, err)
+            traceback.print_exc()
+            self._respond(500, {"error": "Internal server error"})
+
+    def _session(self):
+        """(kind, record, token) for the request's bearer token; ServiceError 401 without a live one"""
+        scheme, _, token = (self.headers.get("Authorization") or "").partition(" ")
+        session = sessions.store.lookup(token.strip()) if scheme.lower() == "bearer" else None
+        if session is None:
+            raise ServiceError(401, "Log in first (POST /sessions) and send Authorization: Bearer <token>")
+        return (*session, token.strip())
+
+    def _respond(self, status, payload):
+        body = json.dumps(payload, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def create_server(host=None, port=None):
+    """An HTTP server on its own thread per request; call serve_forever() on it"""
+    return ThreadingHTTPServer(
+        (host or config.SERVICE_HOST, port or config.SERVICE_PORT), BookingRequestHandler
+    )
+
+if __name__ == "__main__":
+    server = create_server()
+    print(f"Booking service listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        db.get_pool().close_all()
@@ -0,0 +1,97 @@
+# sessions.py
+import secrets
+import threading
+import time
+
+import config
+import db
+import passwords
+
+# ------------------- Session Store -------------------
+# Every page used to read the logged-in user or admin back from MySQL when it
+# was built. Logins now put the record in this store under a random token,
+# and pages read it from there (router.session holds the tokens). A session
+# lasts config.SESSION_TTL seconds after it was last used. Revoking a token,
+# or every session of an account (e.g. when an admin deletes the user), takes
+# effect on the next page the holder opens.
+#
+# The store is per process: the ui/ pages run as separate processes and still
+# look their account up by the id they are started with.
+
+class SessionStore:
+    """Thread-safe token -> account record map with sliding expiry"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._sessions = {}     # token -> [kind, record, expires_at]
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "hits": 0, "expired": 0, "revoked": 0}
+
+    def create(self, kind, record):
+        """Start a session for a "user" or "admin" record; returns its token"""
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sessions[token] = [kind, record, time.monotonic() + self.ttl]
+            self._stats["created"] += 1
+        return token
+
+    def get(self, token):
+        """The record for a token, or None if it is unknown, expired or revoked"""
+        session = self.lookup(token)
+        return session[1] if session is not None else None
+
+    def lookup(self, token):
+        """(kind, record) for a token, or None if it is unknown, expired or revoked"""
+        if token is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(token)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                del self._sessions[token]
+                self._stats["expired"] += 1
+                return None
+            entry[2] = now + self.ttl
+            self._stats["hits"] += 1
+            return entry[0], entry[1]
+
+    def revoke(self, token):
+        with self._lock:
+            if self._sessions.pop(token, None) is not None:
+                self._stats["revoked"] += 1
+
+    def revoke_account(self, kind, account_id):
+        """End every session of one user or admin; returns how many there were"""
+        id_column = passwords.ACCOUNTS[kind][3]
+        with self._lock:
+            tokens = [token for token, (entry_kind, record, _) in self._sessions.items()
+                      if entry_kind == kind and record.get(id_column) == account_id]
+            for token in tokens:
+                del self._sessions[token]
+            self._stats["revoked"] += len(tokens)
+        return len(tokens)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active"] = len(self._sessions)
+        return stats
+
+store = SessionStore(config.SESSION_TTL)
+
+def load_account(kind, account_id):
+    """The "user" or "admin" record for an id, without its password column, or None"""
+    table, _, password_column, id_column = passwords.ACCOUNTS[kind]
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(f"SELECT * FROM {table} WHERE {id_column} = %s", (account_id,))
+        record = cursor.fetchone()
+    finally:
+        cursor.close()
+        connection.close()
+    if record is not None:
+        record.pop(password_column, None)
+    return record
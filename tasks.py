@@ -0,0 +1,129 @@
+# tasks.py
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+import ui_profiler
+
+# ------------------- Background Tasks -------------------
+# Tk is single-threaded: a slow query inside a button callback freezes the
+# whole window. Pages hand blocking work (queries, image decoding) to a small
+# thread pool instead. Results come back through a queue that the Tk thread
+# drains with after(), so on_done/on_error callbacks always run on the Tk
+# thread and may touch widgets. Work functions must not touch widgets.
+#
+# Submitting with a key supersedes the previous task with the same key (e.g. a
+# new search while the last one is still running): it is cancelled if it has
+# not started yet, and its result is dropped if it has.
+
+POLL_INTERVAL_MS = 30
+
+class Task:
+    """Handle for one submitted piece of work"""
+
+    def __init__(self, key, on_done, on_error):
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+class TaskRunner:
+    """Thread pool whose completions are delivered on the Tk thread"""
+
+    def __init__(self, widget, max_workers=None):
+        self.widget = widget
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or config.WORKER_THREADS,
+            thread_name_prefix="worker"
+        )
+        self._completed = queue.Queue()
+        self._latest = {}       # key -> most recent Task submitted with that key
+        self._pending = set()   # every Task whose completion has not been delivered
+        self._polling = False
+
+    def submit(self, fn, *args, on_done=None, on_error=None, key=None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker; returns the Task"""
+        task = Task(key, on_done, on_error)
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = task
+
+        self._pending.add(task)
+        task.future = self._executor.submit(self._run, task, fn, args, kwargs)
+        task.future.add_done_callback(lambda future: self._forget_if_cancelled(task, future))
+        self._schedule_poll()
+        return task
+
+    def cancel(self, key):
+        """Cancel the task submitted with this key, if any"""
+        task = self._latest.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self):
+        """Cancel everything in flight, e.g. when the page that asked for it goes away"""
+        for task in list(self._pending):
+            task.cancel()
+        self._latest.clear()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ----- Worker side -----
+    def _run(self, task, fn, args, kwargs):
+        if task.cancelled:
+            self._completed.put((task, None, None))
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as err:
+            self._completed.put((task, None, err))
+        else:
+            self._completed.put((task, result, None))
+
+    def _forget_if_cancelled(self, task, future):
+        # A task cancelled before it started never reaches _run
+        if future.cancelled():
+            self._completed.put((task, None, None))
+
+    # ----- Tk side -----
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        while True:
+            try:
+                task, result, error = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(task)
+            self._deliver(task, result, error)
+
+        if self._pending:
+            self._schedule_poll()
+
+    def _deliver(self, task, result, error):
+        if task.cancelled:
+            return
+        if task.key is not None and self._latest.get(task.key) is task:
+            del self._latest[task.key]
+
+        if error is not None:
+            if task.on_error:
+                ui_profiler.call(task.on_error, error)
+            else:
+                print(f"Background task failed: {error}")
+        elif task.on_done:
+            ui_profiler.call(task.on_done, result)
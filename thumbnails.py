@@ -0,0 +1,104 @@
+# thumbnails.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+import config
+
+# ------------------- Hotel Image Thumbnails -------------------
+# Cards and detail panels show hotel photos at a few small fixed sizes, but
+# used to decode and LANCZOS-resize the full-size file on every render.
+# Resized copies are now kept on disk under config.THUMBNAIL_DIR, named by a
+# hash of (absolute path, mtime, size), so an edited or replaced image gets a
+# new entry and stale ones are simply never read again. On top of that the
+# Tk thread keeps the most recently used PhotoImage objects in memory.
+#
+# load_thumbnail() only touches files and PIL images, so it may run on a
+# worker thread; PhotoImage objects must be created on the Tk thread.
+
+_photos = OrderedDict()     # (path, mtime, size) -> PhotoImage, least recently used first
+_stats_lock = threading.Lock()
+_stats = {"photo_hits": 0, "disk_hits": 0, "decodes": 0}
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+def thumbnail_stats():
+    """Snapshot of in-memory hits, on-disk hits and full-size decodes"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["photos"] = len(_photos)
+    return stats
+
+def thumbnail_key(image_path, size):
+    """(absolute path, mtime, size) identifying one thumbnail, or None if the image is missing"""
+    if not image_path:
+        return None
+    path = os.path.abspath(image_path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return path, mtime, tuple(size)
+
+def _cache_file(key):
+    path, mtime, (width, height) = key
+    digest = hashlib.sha1(f"{path}|{mtime}|{width}x{height}".encode("utf-8")).hexdigest()
+    return os.path.join(config.THUMBNAIL_DIR, f"{digest}.png")
+
+def load_thumbnail(key):
+    """The resized PIL image for a thumbnail_key, from disk if it was made before"""
+    cache_file = _cache_file(key)
+    try:
+        with Image.open(cache_file) as cached:
+            cached.load()
+            _count("disk_hits")
+            return cached.copy()
+    except (OSError, ValueError):
+        pass
+
+    path, mtime, size = key
+    with Image.open(path) as original:
+        image = original.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+    _count("decodes")
+
+    try:
+        os.makedirs(config.THUMBNAIL_DIR, exist_ok=True)
+        # Write under a temporary name first so no reader ever sees half a file
+        partial = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        image.save(partial, "PNG")
+        os.replace(partial, cache_file)
+    except OSError as err:
+        print(f"Could not cache thumbnail for {path}: {err}")
+    return image
+
+def cached_photo(key):
+    """The PhotoImage for a thumbnail_key if it is still in memory (Tk thread)"""
+    photo = _photos.get(key)
+    if photo is not None:
+        _photos.move_to_end(key)
+        _count("photo_hits")
+    return photo
+
+def remember_photo(key, image):
+    """Turn a loaded thumbnail into a PhotoImage and keep it in the LRU (Tk thread)"""
+    photo = ImageTk.PhotoImage(image)
+    _photos[key] = photo
+    _photos.move_to_end(key)
+    while len(_photos) > config.PHOTO_CACHE_SIZE:
+        _photos.popitem(last=False)
+    return photo
+
+def photo_image(image_path, size):
+    """PhotoImage of an image at size (Tk thread); OSError if the file is missing or unreadable"""
+    key = thumbnail_key(image_path, size)
+    if key is None:
+        raise FileNotFoundError(f"No image at {image_path}")
+    photo = cached_photo(key)
+    if photo is None:
+        photo = remember_photo(key, load_thumbnail(key))
+    return photo
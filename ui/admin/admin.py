@@ -11,25 +11,33 @@ matplotlib.use("TkAgg")
 from datetime import datetime, timedelta
 import calendar
 import os
-from PIL import Image, ImageTk
+from PIL import Image
 import io
-import hashlib
 try:
     from tkcalendar import DateEntry
 except ImportError:
     DateEntry = None
 import pandas as pd
 
+# db_config lives one level up in ui/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import db_config
+import booking_filters
+import catalog
+import dashboard_stats
+import inventory
+import passwords
+import tasks
+import thumbnails
+import ui_profiler
+import user_filters
+from virtual_table import VirtualTreeview
+
 # ------------------- Database Connection -------------------
 def connect_db():
-    """Establish connection to the hotel_book database"""
+    """Borrow a connection to the hotel_book database from the shared pool"""
     try:
-        return mysql.connector.connect(
-            host="127.0.0.1",
-            user="root",
-            password="new_password",
-            database="hotel_book"
-        )
+        return db_config.connect_db()
     except mysql.connector.Error as err:
         messagebox.showerror("Database Error", f"Failed to connect to database: {err}")
         return None
@@ -47,10 +55,19 @@ class HotelBookingApp:
         ctk.set_appearance_mode("light")
         ctk.set_default_color_theme("blue")
 
+        # Background queries; results are handed back on the Tk thread
+        self.runner = tasks.TaskRunner(self.root)
+        ui_profiler.install(self.root)
+
         # Global variables
         self.current_admin = None
         self.selected_booking = None
+        self.bookings_pager = booking_filters.BookingPager()
+        self.bookings_pager.filters = booking_filters.build_filters(active_users_only=True)
+        self.bookings_status_counts = {}
+        self.bookings_applied_status = "All"
         self.selected_user = None
+        self.users_pager = user_filters.UserPager(extra_columns=("u.is_active",))
         self.selected_hotel = None
         self.hotel_image_path = None
         self.current_report_data = None
@@ -207,66 +224,46 @@ class HotelBookingApp:
         return frame
 
     def get_dashboard_stats(self):
-        """Fetch dashboard statistics from database"""
+        """Fetch dashboard statistics (kept in memory by dashboard_stats)"""
         stats = {"total_bookings": 0, "total_revenue": 0, "active_users": 0, "hotels_listed": 0}
-        connection = connect_db()
-        if not connection:
-            return stats
         try:
-            cursor = connection.cursor()
-            cursor.execute("SELECT COUNT(*) FROM Booking WHERE User_ID IN (SELECT user_id FROM Users WHERE is_active = 1)")
-            stats["total_bookings"] = cursor.fetchone()[0]
-            cursor.execute("SELECT SUM(Total_Cost) FROM Booking WHERE User_ID IN (SELECT user_id FROM Users WHERE is_active = 1)")
-            total_revenue = cursor.fetchone()[0]
-            stats["total_revenue"] = total_revenue if total_revenue else 0
-            cursor.execute("SELECT COUNT(*) FROM Users WHERE is_active = 1")
-            stats["active_users"] = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM Hotel")
-            stats["hotels_listed"] = cursor.fetchone()[0]
+            stats.update(dashboard_stats.active_stats.get())
+            dashboard_stats.start_background_refresh()
         except mysql.connector.Error as err:
             print(f"Database Error: {err}")
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
         return stats
 
-    def get_monthly_data(self):
-        """Fetch monthly revenue and booking data for chart"""
+    def get_monthly_data(self, start_date=None, end_date=None):
+        """Fetch monthly revenue and booking data for chart (last 6 months by default)"""
         months, revenue, bookings = [], [], []
+        end_date = end_date or datetime.today()
+        start_date = start_date or end_date - timedelta(days=180)
+        first_month = datetime(start_date.year, start_date.month, 1)
+        after_last_month = datetime(end_date.year + 1, 1, 1) if end_date.month == 12 else datetime(end_date.year, end_date.month + 1, 1)
         connection = connect_db()
         if not connection:
             return months, revenue, bookings
         try:
             cursor = connection.cursor()
-            today = datetime.today()
-            six_months_ago = today - timedelta(days=180)
-            current = six_months_ago
-            while current <= today:
-                month_start = datetime(current.year, current.month, 1)
-                next_month = datetime(current.year + 1, 1, 1) if current.month == 12 else datetime(current.year, current.month + 1, 1)
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM Booking 
-                    WHERE Check_IN_Date >= %s AND Check_IN_Date < %s 
-                    AND User_ID IN (SELECT user_id FROM Users WHERE is_active = 1)
-                    """,
-                    (month_start, next_month)
-                )
-                month_bookings = cursor.fetchone()[0]
-                cursor.execute(
-                    """
-                    SELECT SUM(Total_Cost) FROM Booking 
-                    WHERE Check_IN_Date >= %s AND Check_IN_Date < %s 
-                    AND User_ID IN (SELECT user_id FROM Users WHERE is_active = 1)
-                    """,
-                    (month_start, next_month)
-                )
-                month_revenue = cursor.fetchone()[0]
+            # One grouped range scan instead of two queries per month
+            cursor.execute(
+                """
+                SELECT YEAR(b.Check_IN_Date), MONTH(b.Check_IN_Date), COUNT(*), SUM(b.Total_Cost)
+                FROM Booking b
+                JOIN Users u ON u.user_id = b.User_ID AND u.is_active = 1
+                WHERE b.Check_IN_Date >= %s AND b.Check_IN_Date < %s
+                GROUP BY YEAR(b.Check_IN_Date), MONTH(b.Check_IN_Date)
+                """,
+                (first_month, after_last_month)
+            )
+            totals = {(year, month): (count, total) for year, month, count, total in cursor.fetchall()}
+            current = first_month
+            while current < after_last_month:
+                month_bookings, month_revenue = totals.get((current.year, current.month), (0, 0))
                 months.append(calendar.month_abbr[current.month])
                 bookings.append(month_bookings)
                 revenue.append(month_revenue if month_revenue else 0)
-                current = next_month
+                current = datetime(current.year + 1, 1, 1) if current.month == 12 else datetime(current.year, current.month + 1, 1)
         except mysql.connector.Error as err:
             print(f"Database Error: {err}")
         finally:
@@ -377,7 +374,7 @@ class HotelBookingApp:
         self.bookings_cancelled_count_label.pack(side="left")
 
         columns = ('Booking ID', 'Customer', 'Room Type', 'Check-in', 'Check-out', 'Amount', 'Status')
-        self.bookings_table = ttk.Treeview(table_frame, columns=columns, show='headings', height=10)
+        self.bookings_table = VirtualTreeview(table_frame, fetch_more=self.load_more_bookings, columns=columns, show='headings', height=10)
         for col in columns:
             self.bookings_table.heading(col, text=col)
             self.bookings_table.column(col, width=100, anchor='center')
@@ -425,35 +422,25 @@ class HotelBookingApp:
         self.bookings_details_status.pack(anchor="w", pady=2)
         return frame
 
-    def load_bookings(self):
-        """Load bookings from database, only for active users"""
-        connection = connect_db()
-        if not connection:
-            return []
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                """
-                SELECT b.Booking_ID, CONCAT(u.first_name, ' ', u.last_name) AS Customer,
-                       r.Room_Type, b.Check_IN_Date, b.Check_Out_Date, 
-                       b.Total_Cost, b.Booking_Status
-                FROM Booking b
-                JOIN Users u ON b.User_ID = u.user_id
-                JOIN Room r ON b.Room_ID = r.Room_ID
-                WHERE u.is_active = 1
-                ORDER BY b.Check_IN_Date DESC
-                """
-            )
-            bookings = cursor.fetchall()
-            return bookings
-        except mysql.connector.Error as err:
+    def load_bookings(self, with_counts=False, on_done=None):
+        """Load the next page of filtered bookings (active users only) in the background; on_done(bookings, counts)"""
+        def deliver(result):
+            bookings, next_key, counts = result
+            self.bookings_pager.advance(next_key)
+            on_done(bookings, counts)
+
+        def show_error(err):
             print(f"Error loading bookings: {err}")
             messagebox.showerror("Database Error", f"Error loading bookings: {err}")
-            return []
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            on_done([], None)
+
+        if with_counts:
+            self.runner.cancel("more-bookings")
+        self.runner.submit(
+            booking_filters.load_page, *self.bookings_pager.request(), with_counts=with_counts,
+            on_done=deliver, on_error=show_error,
+            key="bookings" if with_counts else "more-bookings"
+        )
 
     def load_booking_details(self, booking_id):
         """Load detailed information for a specific booking"""
@@ -493,15 +480,7 @@ class HotelBookingApp:
             cursor = connection.cursor()
             cursor.execute("UPDATE Booking SET Booking_Status = %s WHERE Booking_ID = %s", (status, booking_id))
             if status == "Cancelled":
-                cursor.execute(
-                    """
-                    UPDATE Room r
-                    JOIN Booking b ON r.Room_ID = b.Room_ID
-                    SET r.Availability_status = 'Available'
-                    WHERE b.Booking_ID = %s
-                    """,
-                    (booking_id,)
-                )
+                inventory.release_nights(cursor, booking_id)
             connection.commit()
             messagebox.showinfo("Success", f"Booking #{booking_id} status updated to {status}")
             return True
@@ -521,15 +500,18 @@ class HotelBookingApp:
             return False
         try:
             cursor = connection.cursor()
-            cursor.execute("SELECT Room_ID FROM Booking WHERE Booking_ID = %s", (booking_id,))
-            room_id = cursor.fetchone()
-            if not room_id:
+            cursor.execute(
+                "SELECT b.Total_Cost, u.is_active FROM Booking b LEFT JOIN Users u ON u.user_id = b.User_ID WHERE b.Booking_ID = %s",
+                (booking_id,)
+            )
+            booking = cursor.fetchone()
+            cursor.execute("DELETE FROM Booking WHERE Booking_ID = %s", (booking_id,))
+            if cursor.rowcount == 0:
                 messagebox.showerror("Error", f"Booking #{booking_id} not found")
                 return False
-            room_id = room_id[0]
-            cursor.execute("DELETE FROM Booking WHERE Booking_ID = %s", (booking_id,))
-            cursor.execute("UPDATE Room SET Availability_status = 'Available' WHERE Room_ID = %s", (room_id,))
             connection.commit()
+            if booking:
+                dashboard_stats.booking_deleted(booking[0], user_active=bool(booking[1]))
             messagebox.showinfo("Success", f"Booking #{booking_id} has been deleted")
             return True
         except mysql.connector.Error as err:
@@ -541,45 +523,60 @@ class HotelBookingApp:
                 cursor.close()
                 connection.close()
 
+    def booking_row(self, booking):
+        """Turn a booking record into a (iid, values, tags) table row"""
+        check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
+        check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
+        amount = f"${booking['Total_Cost']}"
+        status = booking['Booking_Status']
+        return booking['Booking_ID'], (
+            booking['Booking_ID'],
+            booking['Customer'],
+            booking['Room_Type'],
+            check_in,
+            check_out,
+            amount,
+            status
+        ), (status.lower(),)
+
     def populate_booking_table(self):
-        """Populate the bookings table with data"""
-        for row in self.bookings_table.get_children():
-            self.bookings_table.delete(row)
-        bookings = self.load_bookings()
-        for booking in bookings:
-            check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
-            check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
-            amount = f"${booking['Total_Cost']}"
-            status = booking['Booking_Status']
-            status_tag = status.lower()
-            self.bookings_table.insert('', 'end', iid=booking['Booking_ID'], values=(
-                booking['Booking_ID'],
-                booking['Customer'],
-                booking['Room_Type'],
-                check_in,
-                check_out,
-                amount,
-                status
-            ), tags=(status_tag,))
-        self.update_booking_status_counts()
-
-    def update_booking_status_counts(self):
-        """Update booking status counts in UI"""
-        bookings = self.bookings_table.get_children()
-        total = len(bookings)
-        confirmed = pending = cancelled = 0
-        for booking_id in bookings:
-            status = self.bookings_table.item(booking_id, 'values')[6]
-            if status == "Confirmed":
-                confirmed += 1
-            elif status == "Pending":
-                pending += 1
-            elif status == "Cancelled":
-                cancelled += 1
-        self.bookings_total_count_label.configure(text=f"Total: {total}")
-        self.bookings_confirmed_count_label.configure(text=f"Confirmed: {confirmed}")
-        self.bookings_pending_count_label.configure(text=f"Pending: {pending}")
-        self.bookings_cancelled_count_label.configure(text=f"Cancelled: {cancelled}")
+        """Populate the bookings table from the first page of the current filters"""
+        def show_first_page(bookings, counts):
+            self.bookings_table.set_rows([self.booking_row(booking) for booking in bookings], self.bookings_pager.has_next)
+            self.bookings_status_counts = counts or {}
+            self.update_booking_status_counts(self.bookings_status_counts)
+
+        self.bookings_pager.reset()
+        self.load_bookings(with_counts=True, on_done=show_first_page)
+
+    def load_more_bookings(self, deliver):
+        """Fetch the next page for the bookings table when it is scrolled near the end"""
+        self.load_bookings(on_done=lambda bookings, counts: deliver(
+            [self.booking_row(booking) for booking in bookings], self.bookings_pager.has_next and bool(bookings)
+        ))
+
+    def patch_booking_row(self, booking_id, new_status=None):
+        """Apply a status change (or a deletion) to the loaded row and counters; full refresh if not loaded"""
+        row = self.bookings_table.get_row(booking_id)
+        if row is None:
+            self.populate_booking_table()
+            return
+        iid, values, _ = row
+        counts = self.bookings_status_counts
+        counts[values[6]] = counts.get(values[6], 0) - 1
+        if new_status is None or self.bookings_applied_status not in ("All", new_status):
+            self.bookings_table.remove_row(iid)
+        else:
+            self.bookings_table.update_row(iid, values[:6] + (new_status,), (new_status.lower(),))
+            counts[new_status] = counts.get(new_status, 0) + 1
+        self.update_booking_status_counts(counts)
+
+    def update_booking_status_counts(self, counts):
+        """Update booking status counts in UI from the totals of every matching booking"""
+        self.bookings_total_count_label.configure(text=f"Total: {sum(counts.values())}")
+        self.bookings_confirmed_count_label.configure(text=f"Confirmed: {counts.get('Confirmed', 0)}")
+        self.bookings_pending_count_label.configure(text=f"Pending: {counts.get('Pending', 0)}")
+        self.bookings_cancelled_count_label.configure(text=f"Cancelled: {counts.get('Cancelled', 0)}")
 
     def show_booking_details(self, event):
         """Display details of selected booking"""
@@ -620,7 +617,7 @@ class HotelBookingApp:
         if not self.selected_booking:
             return
         if self.update_booking_status(self.selected_booking['Booking_ID'], "Confirmed"):
-            self.populate_booking_table()
+            self.patch_booking_row(self.selected_booking['Booking_ID'], "Confirmed")
             self.selected_booking['Booking_Status'] = "Confirmed"
             self.bookings_details_status.configure(text=f"Status: Confirmed")
             self.bookings_confirm_btn.configure(state="disabled")
@@ -634,7 +631,7 @@ class HotelBookingApp:
         if not confirmed:
             return
         if self.update_booking_status(self.selected_booking['Booking_ID'], "Cancelled"):
-            self.populate_booking_table()
+            self.patch_booking_row(self.selected_booking['Booking_ID'], "Cancelled")
             self.selected_booking['Booking_Status'] = "Cancelled"
             self.bookings_details_status.configure(text=f"Status: Cancelled")
             self.bookings_confirm_btn.configure(state="normal")
@@ -648,55 +645,24 @@ class HotelBookingApp:
         if not confirmed:
             return
         if self.delete_booking(self.selected_booking['Booking_ID']):
-            self.populate_booking_table()
+            self.patch_booking_row(self.selected_booking['Booking_ID'])
             self.bookings_details_frame.pack_forget()
             self.selected_booking = None
 
     def filter_bookings(self):
-        """Apply filters to bookings table"""
-        search_term = self.bookings_search_entry.get().lower()
+        """Apply filters to bookings table in SQL, starting again from the first page"""
+        search_term = self.bookings_search_entry.get()
         try:
             start_date = self.bookings_start_date_entry.get_date() if hasattr(self.bookings_start_date_entry, 'get_date') else None
             end_date = self.bookings_end_date_entry.get_date() if hasattr(self.bookings_end_date_entry, 'get_date') else None
         except:
             start_date = end_date = None
         status_filter = self.bookings_status_var.get()
-        for row in self.bookings_table.get_children():
-            self.bookings_table.delete(row)
-        bookings = self.load_bookings()
-        filtered_bookings = []
-        for booking in bookings:
-            if search_term and search_term not in booking['Customer'].lower() and search_term not in booking['Room_Type'].lower():
-                continue
-            booking_date = booking['Check_IN_Date']
-            if isinstance(booking_date, str):
-                try:
-                    booking_date = datetime.strptime(booking_date, '%Y-%m-%d')
-                except:
-                    booking_date = None
-            if start_date and booking_date and booking_date < start_date:
-                continue
-            if end_date and booking_date and booking_date > end_date:
-                continue
-            if status_filter != "All" and booking['Booking_Status'] != status_filter:
-                continue
-            filtered_bookings.append(booking)
-        for booking in filtered_bookings:
-            check_in = booking['Check_IN_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_IN_Date'], datetime) else booking['Check_IN_Date']
-            check_out = booking['Check_Out_Date'].strftime('%Y-%m-%d') if isinstance(booking['Check_Out_Date'], datetime) else booking['Check_Out_Date']
-            amount = f"${booking['Total_Cost']}"
-            status = booking['Booking_Status']
-            status_tag = status.lower()
-            self.bookings_table.insert('', 'end', iid=booking['Booking_ID'], values=(
-                booking['Booking_ID'],
-                booking['Customer'],
-                booking['Room_Type'],
-                check_in,
-                check_out,
-                amount,
-                status
-            ), tags=(status_tag,))
-        self.update_booking_status_counts()
+        self.bookings_applied_status = status_filter
+        self.bookings_pager.filters = booking_filters.build_filters(
+            search_term, start_date, end_date, status_filter, active_users_only=True
+        )
+        self.populate_booking_table()
 
     def reset_booking_filters(self):
         """Reset booking filters to default"""
@@ -708,6 +674,8 @@ class HotelBookingApp:
             self.bookings_start_date_entry.delete(0, 'end')
             self.bookings_end_date_entry.delete(0, 'end')
         self.bookings_status_var.set("All")
+        self.bookings_applied_status = "All"
+        self.bookings_pager.filters = booking_filters.build_filters(active_users_only=True)
         self.populate_booking_table()
 
     # ------------------- Manage Users Section -------------------
@@ -781,7 +749,7 @@ class HotelBookingApp:
         table_container = ctk.CTkFrame(table_frame, fg_color="white")
         table_container.pack(fill="both", expand=True, padx=20, pady=(10, 20))
         columns = ('ID', 'Name', 'Email', 'Phone', 'Address', 'Bookings', 'Status')
-        self.users_table = ttk.Treeview(table_container, columns=columns, show='headings', height=8)
+        self.users_table = VirtualTreeview(table_container, fetch_more=self.load_more_users, columns=columns, show='headings', height=8)
         for col in columns:
             self.users_table.heading(col, text=col)
             self.users_table.column(col, width=100, anchor='w')
@@ -846,36 +814,28 @@ class HotelBookingApp:
         return frame
 
     def hash_password(self, password):
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password with the configured salted hasher"""
+        return passwords.hash_password(password)
 
-    def load_users(self):
-        """Load all users from database"""
-        connection = connect_db()
-        if not connection:
-            return []
-        try:
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                """
-                SELECT u.user_id, u.first_name, u.last_name, u.email, u.phone, 
-                       u.user_address, COUNT(b.Booking_ID) as bookings, u.is_active
-                FROM Users u
-                LEFT JOIN Booking b ON u.user_id = b.User_ID
-                GROUP BY u.user_id
-                ORDER BY u.user_id
-                """
-            )
-            users = cursor.fetchall()
-            return users
-        except mysql.connector.Error as err:
+    def load_users(self, with_count=False, on_done=None):
+        """Load the next page of users matching the search in the background; on_done(users, total)"""
+        def deliver(result):
+            users, next_id, total = result
+            self.users_pager.advance(next_id)
+            on_done(users, total)
+
+        def show_error(err):
             print(f"Error loading users: {err}")
             messagebox.showerror("Database Error", f"Error loading users: {err}")
-            return []
-        finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            on_done([], 0 if with_count else None)
+
+        if with_count:
+            self.runner.cancel("more-users")
+        self.runner.submit(
+            user_filters.load_page, *self.users_pager.request(), with_count=with_count,
+            on_done=deliver, on_error=show_error,
+            key="users" if with_count else "more-users"
+        )
 
     def load_user_details(self, user_id):
         """Load detailed information for a specific user"""
@@ -950,6 +910,7 @@ class HotelBookingApp:
                 (first_name, last_name, email, phone or None, hashed_password, address or None, is_active)
             )
             connection.commit()
+            dashboard_stats.user_created(active=bool(is_active))
             messagebox.showinfo("Success", "User created successfully")
             self.clear_user_form()
             self.populate_user_table()
@@ -1007,6 +968,8 @@ class HotelBookingApp:
                     (first_name, last_name, email, phone or None, address or None, is_active, self.selected_user['user_id'])
                 )
             connection.commit()
+            if is_active != self.selected_user.get('is_active'):
+                dashboard_stats.users_changed()
             messagebox.showinfo("Success", "User updated successfully")
             self.selected_user = self.load_user_details(self.selected_user['user_id'])
             self.show_user_details(None)
@@ -1035,6 +998,7 @@ class HotelBookingApp:
             cursor.execute("DELETE FROM Booking WHERE User_ID = %s", (self.selected_user['user_id'],))
             cursor.execute("DELETE FROM Users WHERE user_id = %s", (self.selected_user['user_id'],))
             connection.commit()
+            dashboard_stats.users_changed()
             messagebox.showinfo("Success", "User deleted successfully")
             self.clear_user_form()
             self.users_details_frame.pack_forget()
@@ -1048,27 +1012,37 @@ class HotelBookingApp:
                 cursor.close()
                 connection.close()
 
-    def populate_user_table(self):
-        """Populate the users table with data"""
-        for row in self.users_table.get_children():
-            self.users_table.delete(row)
-        users = self.load_users()
-        for user in users:
-            full_name = f"{user['first_name']} {user['last_name']}"
-            phone = user['phone'] if user['phone'] else "N/A"
-            address = user['user_address'] if user['user_address'] else "N/A"
-            bookings = str(user['bookings'])
-            status = "Active" if user['is_active'] else "Inactive"
-            self.users_table.insert('', 'end', iid=user['user_id'], values=(
-                user['user_id'],
-                full_name,
-                user['email'],
-                phone,
-                address,
-                bookings,
-                status
-            ))
-        self.users_user_count_label.configure(text=f"Total Users: {len(users)}")
+    def user_row(self, user):
+        """Turn a user record into a (iid, values, tags) table row"""
+        full_name = f"{user['first_name']} {user['last_name']}"
+        phone = user['phone'] if user['phone'] else "N/A"
+        address = user['user_address'] if user['user_address'] else "N/A"
+        bookings = str(user['bookings'])
+        status = "Active" if user['is_active'] else "Inactive"
+        return user['user_id'], (
+            user['user_id'],
+            full_name,
+            user['email'],
+            phone,
+            address,
+            bookings,
+            status
+        ), ()
+
+    def populate_user_table(self, search_term=""):
+        """Populate the users table with the first page of (matching) users"""
+        def show_first_page(users, total):
+            self.users_table.set_rows([self.user_row(user) for user in users], self.users_pager.has_next)
+            self.users_user_count_label.configure(text=f"Total Users: {total}")
+
+        self.users_pager.reset(user_filters.build_filters(search_term))
+        self.load_users(with_count=True, on_done=show_first_page)
+
+    def load_more_users(self, deliver):
+        """Fetch the next page for the users table when it is scrolled near the end"""
+        self.load_users(on_done=lambda users, total: deliver(
+            [self.user_row(user) for user in users], self.users_pager.has_next and bool(users)
+        ))
 
     def show_user_details(self, event):
         """Display details of selected user"""
@@ -1153,33 +1127,11 @@ class HotelBookingApp:
         self.users_delete_btn.grid_forget()
         self.users_details_frame.pack_forget()
         self.selected_user = None
+        self.users_table.clear_selection()
 
     def search_users(self):
-        """Search users based on input term"""
-        search_term = self.users_search_entry.get().lower()
-        for row in self.users_table.get_children():
-            self.users_table.delete(row)
-        users = self.load_users()
-        filtered_users = []
-        for user in users:
-            if search_term in f"{user['first_name']} {user['last_name']}".lower() or search_term in user['email'].lower():
-                filtered_users.append(user)
-        for user in filtered_users:
-            full_name = f"{user['first_name']} {user['last_name']}"
-            phone = user['phone'] if user['phone'] else "N/A"
-            address = user['user_address'] if user['user_address'] else "N/A"
-            bookings = str(user['bookings'])
-            status = "Active" if user['is_active'] else "Inactive"
-            self.users_table.insert('', 'end', iid=user['user_id'], values=(
-                user['user_id'],
-                full_name,
-                user['email'],
-                phone,
-                address,
-                bookings,
-                status
-            ))
-        self.users_user_count_label.configure(text=f"Total Users: {len(filtered_users)}")
+        """Search users by name or email"""
+        self.populate_user_table(self.users_search_entry.get().strip())
 
     # ------------------- Manage Hotels Section -------------------
     def create_hotels_frame(self):
@@ -1240,24 +1192,16 @@ class HotelBookingApp:
         self.hotels_amenity_vars = {}
         self.hotels_amenities_frame = ctk.CTkFrame(form_fields, fg_color="transparent")
         self.hotels_amenities_frame.grid(row=3, column=1, rowspan=4, sticky="nsew", padx=(10, 0), pady=(0, 15))
-        connection = connect_db()
-        if connection:
-            try:
-                cursor = connection.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM Amenities ORDER BY amenity_name")
-                amenities = cursor.fetchall()
-                for i, amenity in enumerate(amenities):
-                    row = i // 3
-                    col = i % 3
-                    var = ctk.IntVar(value=0)
-                    self.hotels_amenity_vars[amenity['Amenity_ID']] = var
-                    ctk.CTkCheckBox(self.hotels_amenities_frame, text=f"{amenity['amenity_icon']} {amenity['amenity_name']}", variable=var, font=("Arial", 11)).grid(row=row, column=col, sticky="w", padx=5, pady=2)
-            except mysql.connector.Error as err:
-                print(f"Error loading amenities: {err}")
-            finally:
-                if connection.is_connected():
-                    cursor.close()
-                    connection.close()
+        try:
+            amenities = catalog.amenities()
+            for i, amenity in enumerate(amenities):
+                row = i // 3
+                col = i % 3
+                var = ctk.IntVar(value=0)
+                self.hotels_amenity_vars[amenity['Amenity_ID']] = var
+                ctk.CTkCheckBox(self.hotels_amenities_frame, text=f"{amenity['amenity_icon']} {amenity['amenity_name']}", variable=var, font=("Arial", 11)).grid(row=row, column=col, sticky="w", padx=5, pady=2)
+        except mysql.connector.Error as err:
+            print(f"Error loading amenities: {err}")
 
         buttons_frame = ctk.CTkFrame(form_fields, fg_color="transparent")
         buttons_frame.grid(row=8, column=0, columnspan=3, sticky="ew", pady=(10, 0))
@@ -1341,13 +1285,20 @@ class HotelBookingApp:
 
         return frame
 
-    def load_hotels(self):
-        """Load all hotels from database with room and booking counts"""
-        connection = connect_db()
-        if not connection:
-            return []
+    def load_hotels(self, on_done):
+        """Load all hotels with room and booking counts in the background; on_done(hotels)"""
+        def show_error(err):
+            print(f"Error loading hotels: {err}")
+            messagebox.showerror("Database Error", f"Error loading hotels: {err}")
+            on_done([])
+
+        self.runner.submit(self.query_hotels, on_done=on_done, on_error=show_error, key="hotels")
+
+    def query_hotels(self):
+        """Hotels with room and booking counts (worker thread)"""
+        connection = db_config.connect_db()
+        cursor = connection.cursor(dictionary=True)
         try:
-            cursor = connection.cursor(dictionary=True)
             cursor.execute(
                 """
                 SELECT h.Hotel_ID, h.hotel_name, h.location, 
@@ -1361,86 +1312,10 @@ class HotelBookingApp:
                 ORDER BY h.hotel_name
                 """
             )
-            hotels = cursor.fetchall()
-            return hotels
-        except mysql.connector.Error as err:
-            print(f"Error loading hotels: {err}")
-            messagebox.showerror("Database Error", f"Error loading hotels: {err}")
-            return []
+            return cursor.fetchall()
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-
-    def show_hotel_details(self, event):
-        """Display details of selected hotel"""
-        if event is not None:
-            selected_id = self.hotels_table.focus()
-            if not selected_id:
-                return
-            hotel_id = int(selected_id)
-            hotel = self.load_hotel_details(hotel_id)
-            if not hotel:
-                return
-            self.selected_hotel = hotel
-        self.hotels_name_entry.delete(0, 'end')
-        self.hotels_name_entry.insert(0, self.selected_hotel['Hotel_Name'])
-        self.hotels_location_entry.delete(0, 'end')
-        self.hotels_location_entry.insert(0, self.selected_hotel['Location'])
-        self.hotels_description_entry.delete("1.0", "end")
-        if self.selected_hotel['Description']:
-            self.hotels_description_entry.insert("1.0", self.selected_hotel['Description'])
-        self.hotels_star_rating_var.set(str(self.selected_hotel['Star_Rating']))
-        self.hotels_image_entry.configure(state="normal")
-        self.hotels_image_entry.delete(0, 'end')
-        if self.selected_hotel['Image_Path']:
-            self.hotels_image_entry.insert(0, os.path.basename(self.selected_hotel['Image_Path']))
-        self.hotels_image_entry.configure(state="readonly")
-        self.hotel_image_path = self.selected_hotel['Image_Path'] if self.selected_hotel['Image_Path'] else None
-        self.hotels_create_btn.grid_forget()
-        self.hotels_update_btn.grid(row=0, column=0, padx=(0, 10))
-        self.hotels_delete_btn.grid(row=0, column=1, padx=(0, 10))
-        self.hotels_clear_btn.grid(row=0, column=2)
-        self.hotels_update_btn.configure(state="normal")
-        self.hotels_delete_btn.configure(state="normal")
-        self.hotels_details_frame.pack(fill="both", expand=True, padx=30, pady=(0, 20))
-        self.hotels_details_hotel_id.configure(text=f"Hotel #{self.selected_hotel['Hotel_ID']}")
-        self.hotels_details_name.configure(text=f"{self.selected_hotel['Hotel_Name']}")
-        self.hotels_details_location.configure(text=f"{self.selected_hotel['Location']}")
-        self.hotels_details_description.configure(text=f"{self.selected_hotel['Description'] if self.selected_hotel['Description'] else 'No description available'}")
-        star_rating_display = "★" * self.selected_hotel['Star_Rating']
-        self.hotels_details_description.configure(text=f"{self.selected_hotel['Description'] if self.selected_hotel['Description'] else 'No description available'}\nRating: {star_rating_display}")
-        if self.selected_hotel['Image_Path']:
-            try:
-                image = Image.open(self.selected_hotel['Image_Path'])
-                image = image.resize((150, 150), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
-                self.hotels_details_image_label.configure(image=photo, text="")
-                self.hotels_details_image_label.image = photo
-            except Exception as e:
-                print(f"Error loading image: {e}")
-                self.hotels_details_image_label.configure(image=None, text="No image available")
-        else:
-            self.hotels_details_image_label.configure(image=None, text="No image available")
-        total_rooms = len(self.selected_hotel['rooms']) if self.selected_hotel['rooms'] else 0
-        total_bookings = self.selected_hotel['bookings'] if self.selected_hotel['bookings'] else 0
-        self.hotels_details_rooms.configure(text=f"Total Rooms: {total_rooms}")
-        self.hotels_details_bookings.configure(text=f"Total Bookings: {total_bookings}")
-        for row in self.hotels_rooms_table.get_children():
-            self.hotels_rooms_table.delete(row)
-        if 'rooms' in self.selected_hotel and self.selected_hotel['rooms']:
-            for room in self.selected_hotel['rooms']:
-                status = room['Availability_status'].lower()
-                self.hotels_rooms_table.insert('', 'end', values=(
-                    room['Room_ID'],
-                    room['Room_Type'],
-                    f"${room['Price_per_Night']}",
-                    room['Availability_status']
-                ), tags=(status,))
-        # Display amenities (optional, add to UI if needed)
-        if 'amenities' in self.selected_hotel and self.selected_hotel['amenities']:
-            amenities_text = ", ".join([f"{a['Amenity_Icon']} {a['Amenity_Name']}" for a in self.selected_hotel['amenities']])
-            self.hotels_details_description.configure(text=f"{self.selected_hotel['Description'] if self.selected_hotel['Description'] else 'No description available'}\nRating: {star_rating_display}\nAmenities: {amenities_text}")
+            cursor.close()
+            connection.close()
 
     def create_hotel(self):
         """Create a new hotel with details from the form"""
@@ -1502,6 +1377,8 @@ class HotelBookingApp:
                     )
 
             connection.commit()
+            catalog.invalidate_hotel(hotel_id)
+            dashboard_stats.hotel_created()
             messagebox.showinfo("Success", "Hotel created successfully!")
             self.clear_hotel_form()
             self.populate_hotel_table()
@@ -1584,6 +1461,7 @@ class HotelBookingApp:
                         (self.selected_hotel['Hotel_ID'], amenity_id)
                     )
             connection.commit()
+            catalog.invalidate_hotel(self.selected_hotel['Hotel_ID'])
             messagebox.showinfo("Success", "Hotel updated successfully")
             self.selected_hotel = self.load_hotel_details(self.selected_hotel['Hotel_ID'])
             self.show_hotel_details(None)
@@ -1625,6 +1503,8 @@ class HotelBookingApp:
             # Delete the hotel
             cursor.execute("DELETE FROM Hotel WHERE Hotel_ID = %s", (self.selected_hotel['Hotel_ID'],))
             connection.commit()
+            catalog.invalidate_hotel(self.selected_hotel['Hotel_ID'])
+            dashboard_stats.hotel_deleted()
             messagebox.showinfo("Success", "Hotel deleted successfully")
             self.clear_hotel_form()
             self.hotels_details_frame.pack_forget()
@@ -1650,9 +1530,12 @@ class HotelBookingApp:
 
     def populate_hotel_table(self):
         """Populate the hotels table with data"""
+        self.load_hotels(on_done=self.show_hotel_rows)
+
+    def show_hotel_rows(self, hotels):
+        """Replace the hotels table rows"""
         for row in self.hotels_table.get_children():
             self.hotels_table.delete(row)
-        hotels = self.load_hotels()
         for hotel in hotels:
             self.hotels_table.insert('', 'end', iid=hotel['Hotel_ID'], values=(
                 hotel['Hotel_ID'],
@@ -1733,9 +1616,7 @@ class HotelBookingApp:
         # Display image if available
         if self.selected_hotel['image_path']:
             try:
-                image = Image.open(self.selected_hotel['image_path'])
-                image = image.resize((150, 150), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(image)
+                photo = thumbnails.photo_image(self.selected_hotel['image_path'], (150, 150))
                 self.hotels_details_image_label.configure(image=photo, text="")
                 self.hotels_details_image_label.image = photo
             except Exception as e:
@@ -1762,68 +1643,51 @@ class HotelBookingApp:
                     f"${room['Price_per_Night']}",
                     room['Availability_status']
                 ), tags=(room['Availability_status'].lower(),))
+
     def load_hotel_details(self, hotel_id):
         """Load detailed information for a specific hotel"""
-        connection = connect_db()
-        if not connection:
-            return None
         try:
-            cursor = connection.cursor(dictionary=True)
-            # Get hotel basic information
-            cursor.execute(
-                """
-                SELECT h.*, 
-                    COUNT(DISTINCT rc.Category_ID) as room_count,
-                    COUNT(DISTINCT b.Booking_ID) as bookings
-                FROM Hotel h
-                LEFT JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
-                LEFT JOIN Booking b ON rc.Category_ID = b.Room_ID
-                WHERE h.Hotel_ID = %s
-                GROUP BY h.Hotel_ID
-                """,
-                (hotel_id,)
-            )
-            hotel = cursor.fetchone()
-            
+            # Hotel, room categories and amenities come from the catalog cache;
+            # only the booking figures are read live
+            hotel = catalog.hotel_details(hotel_id)
             if hotel:
-                # Get hotel rooms
-                cursor.execute(
-                    """
-                    SELECT rc.Category_ID as Room_ID, rc.category_name as Room_Type, 
-                        rc.base_price as Price_per_Night,
-                        CASE 
-                            WHEN b.Booking_ID IS NULL THEN 'Available' 
-                            ELSE 'Booked' 
-                        END as Availability_status
-                    FROM RoomCategory rc
-                    LEFT JOIN Booking b ON rc.Category_ID = b.Room_ID AND b.Booking_Status != 'Cancelled'
-                    WHERE rc.Hotel_ID = %s
-                    """,
-                    (hotel_id,)
-                )
-                hotel['rooms'] = cursor.fetchall()
-                
-                # Get hotel amenities
-                cursor.execute(
-                    """
-                    SELECT a.Amenity_ID, a.amenity_name as Amenity_Name, a.amenity_icon as Amenity_Icon
-                    FROM Hotel_Amenities ha
-                    JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
-                    WHERE ha.Hotel_ID = %s
-                    """,
-                    (hotel_id,)
-                )
-                hotel['amenities'] = cursor.fetchall()
-            
+                hotel['rooms'] = hotel.pop('room_types')
+                hotel['room_count'] = len(hotel['rooms'])
+                booked = self.load_category_bookings([room['Room_ID'] for room in hotel['rooms']])
+                hotel['bookings'] = sum(total for total, active in booked.values())
+                for room in hotel['rooms']:
+                    total, active = booked.get(room['Room_ID'], (0, 0))
+                    room['Availability_status'] = 'Booked' if active else 'Available'
             return hotel
         except mysql.connector.Error as err:
             print(f"Error loading hotel details: {err}")
             messagebox.showerror("Database Error", f"Error loading hotel details: {err}")
             return None
+
+    def load_category_bookings(self, category_ids):
+        """{Category_ID: (all bookings, non-cancelled bookings)} for room categories with bookings"""
+        if not category_ids:
+            return {}
+        connection = connect_db()
+        if not connection:
+            # Reported by load_hotel_details like any other database error
+            raise mysql.connector.Error("Could not connect to the database")
+        cursor = connection.cursor()
+        try:
+            placeholders = ", ".join(["%s"] * len(category_ids))
+            cursor.execute(
+                f"""
+                SELECT Room_ID, COUNT(*), SUM(Booking_Status != 'Cancelled')
+                FROM Booking
+                WHERE Room_ID IN ({placeholders})
+                GROUP BY Room_ID
+                """,
+                tuple(category_ids)
+            )
+            return {room_id: (total, active or 0) for room_id, total, active in cursor.fetchall()}
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            cursor.close()
+            connection.close()
 
     def new_hotel_mode(self):
         """Switch to new hotel creation mode"""
@@ -1857,22 +1721,14 @@ class HotelBookingApp:
     def search_hotels(self):
         """Search hotels based on input term"""
         search_term = self.hotels_search_entry.get().lower()
-        for row in self.hotels_table.get_children():
-            self.hotels_table.delete(row)
-        hotels = self.load_hotels()
-        filtered_hotels = []
-        for hotel in hotels:
-            if search_term in hotel['Hotel_Name'].lower() or search_term in hotel['Location'].lower():
-                filtered_hotels.append(hotel)
-        for hotel in filtered_hotels:
-            self.hotels_table.insert('', 'end', iid=hotel['Hotel_ID'], values=(
-                hotel['Hotel_ID'],
-                hotel['Hotel_Name'],
-                hotel['Location'],
-                hotel['rooms'],
-                hotel['bookings']
-            ))
-        self.hotels_count_label.configure(text=f"Total Hotels: {len(filtered_hotels)}")
+
+        def show_matches(hotels):
+            self.show_hotel_rows([
+                hotel for hotel in hotels
+                if search_term in hotel['hotel_name'].lower() or search_term in hotel['location'].lower()
+            ])
+
+        self.load_hotels(on_done=show_matches)
 
     # ------------------- Reports Section -------------------
     def create_reports_frame(self):
@@ -1931,62 +1787,52 @@ class HotelBookingApp:
         if not start_date or not end_date:
             messagebox.showwarning("Input Error", "Please select a valid date range")
             return
+
+        def show_error(err):
+            print(f"Error generating report: {err}")
+            messagebox.showerror("Database Error", f"Error generating report: {err}")
+
+        self.reports_chart_label.configure(text=f"{report_type} Report (loading...)")
+        self.runner.submit(
+            self.query_report, report_type, start_date, end_date,
+            on_done=lambda result: self.show_report(report_type, *result),
+            on_error=show_error, key="report"
+        )
+
+    def query_report(self, report_type, start_date, end_date):
+        """Per-day values for a report over a date range (worker thread); returns (labels, data)"""
         data = []
         labels = []
+        connection = db_config.connect_db()
+        cursor = connection.cursor()
         try:
-            connection = connect_db()
-            cursor = connection.cursor()
-            current_date = start_date
-            while current_date <= end_date:
-                next_date = current_date + timedelta(days=1)
-                if report_type == "Revenue":
-                    cursor.execute(
-                        """
-                        SELECT SUM(Total_Cost)
-                        FROM Booking
-                        JOIN Users u ON Booking.User_ID = u.user_id
-                        WHERE Check_IN_Date >= %s AND Check_IN_Date < %s AND u.is_active = 1
-                        """,
-                        (current_date, next_date)
-                    )
-                    value = cursor.fetchone()[0] or 0
-                    data.append(value)
-                    labels.append(current_date.strftime('%Y-%m-%d'))
-                elif report_type == "Bookings":
-                    cursor.execute(
-                        """
-                        SELECT COUNT(*)
-                        FROM Booking
-                        JOIN Users u ON Booking.User_ID = u.user_id
-                        WHERE Check_IN_Date >= %s AND Check_IN_Date < %s AND u.is_active = 1
-                        """,
-                        (current_date, next_date)
-                    )
-                    value = cursor.fetchone()[0]
-                    data.append(value)
-                    labels.append(current_date.strftime('%Y-%m-%d'))
-                elif report_type == "User Activity":
-                    cursor.execute(
-                        """
-                        SELECT COUNT(DISTINCT Booking.User_ID)
-                        FROM Booking
-                        JOIN Users u ON Booking.User_ID = u.user_id
-                        WHERE Check_IN_Date >= %s AND Check_IN_Date < %s AND u.is_active = 1
-                        """,
-                        (current_date, next_date)
-                    )
-                    value = cursor.fetchone()[0]
-                    data.append(value)
-                    labels.append(current_date.strftime('%Y-%m-%d'))
-                current_date = next_date
-        except mysql.connector.Error as err:
-            print(f"Error generating report: {err}")
-            messagebox.showerror("Database Error", f"Error generating report: {err}")
-            return
+            # One range scan over the daily rollup (kept current by triggers on Booking)
+            cursor.execute(
+                """
+                SELECT r.Stat_Date, SUM(r.Revenue), SUM(r.Bookings), COUNT(DISTINCT r.User_ID)
+                FROM Booking_Daily_Stats r
+                JOIN Users u ON r.User_ID = u.user_id
+                WHERE r.Stat_Date >= %s AND r.Stat_Date <= %s AND u.is_active = 1
+                GROUP BY r.Stat_Date
+                """,
+                (start_date, end_date)
+            )
+            daily = {row[0]: row[1:] for row in cursor.fetchall()}
         finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
+            cursor.close()
+            connection.close()
+        column = {"Revenue": 0, "Bookings": 1, "User Activity": 2}.get(report_type)
+        current_date = start_date
+        while current_date <= end_date:
+            if column is not None:
+                totals = daily.get(current_date)
+                data.append(totals[column] if totals else 0)
+                labels.append(current_date.strftime('%Y-%m-%d'))
+            current_date += timedelta(days=1)
+        return labels, data
+
+    def show_report(self, report_type, labels, data):
+        """Draw a generated report"""
         self.reports_ax.clear()
         self.reports_ax.bar(labels, data, color='#007BFF')
         self.reports_ax.set_xlabel('Date')
@@ -2033,6 +1879,7 @@ class HotelBookingApp:
             self.setup_ui()
             self.show_frame("dashboard")
             self.root.mainloop()
+            self.runner.shutdown()
 
 if __name__ == "__main__":
     root = ctk.CTk()
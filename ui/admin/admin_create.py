@@ -1,10 +1,11 @@
 import mysql.connector
-import hashlib
+import os
 import sys
 
-# Function to hash passwords
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+# passwords.py lives in the project root, two levels up
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from passwords import hash_password
 
 # Database connection function
 def connect_db():
@@ -1,22 +1,19 @@
 import customtkinter as ctk
 from tkinter import messagebox
 import mysql.connector
-import hashlib
 import subprocess
 import sys
+import os
 
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-  host="127.0.0.1",
-        user="root",  # Replace with your MySQL username
-        password="new_password", 
-        database="hotel_book"  # Replace with your database name # Replace with your database name
-    )
+# db_config lives one level up in ui/
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# ------------------- Password Hashing -------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+# ------------------- Database Connection -------------------
+from db_config import connect_db
+import login_limiter
+import passwords
+import tasks
+import ui_profiler
 
 # ------------------- Back to User Login -------------------
 def back_to_user_login(event=None):
@@ -56,6 +53,12 @@ def forgot_password(event=None):
             connection.close()
 
 # ------------------- Admin Login Function -------------------
+def show_login_error(err):
+    if isinstance(err, login_limiter.LoginThrottled):
+        messagebox.showwarning("Too Many Attempts", str(err))
+    else:
+        messagebox.showerror("Database Error", str(err))
+
 def login_admin():
     email = email_entry.get()
     password = password_entry.get()
@@ -64,17 +67,7 @@ def login_admin():
         messagebox.showwarning("Input Error", "Please enter both email and password.")
         return
 
-    hashed_password = hash_password(password)
-
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT Admin_ID, AdminName FROM Admin WHERE AdminEmail = %s AND AdminPassword = %s",
-            (email, hashed_password)
-        )
-        admin = cursor.fetchone()
-
+    def logged_in(admin):
         if admin:
             messagebox.showinfo("Success", f"Welcome {admin['AdminName']}!")
             
@@ -89,13 +82,14 @@ def login_admin():
             open_admin_dashboard(admin['Admin_ID'])
         else:
             messagebox.showerror("Login Failed", "Invalid Admin Credentials.")
-    
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+
+    # Password checks are slow on purpose, so they run off the Tk thread
+    runner.submit(
+        passwords.authenticate, "admin", email, password,
+        on_done=logged_in,
+        on_error=show_login_error,
+        key="login"
+    )
 
 # ------------------- Open Admin Dashboard -------------------
 def open_admin_dashboard(admin_id):
@@ -114,6 +108,8 @@ ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
 app = ctk.CTk()
+runner = tasks.TaskRunner(app)
+ui_profiler.install(app)
 app.title("Hotel Booking - Admin Login")
 app.geometry("1000x800")
 app.resizable(True, True)
@@ -1,4 +1,13 @@
-import mysql
+import os
+import sys
+import mysql.connector
+
+# The shared connection pool (db.py) lives in the project root next to config.py
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+import db
 
 
 def connect_mysql():
@@ -7,16 +16,12 @@ def connect_mysql():
         return mysql.connector.connect(
         host="127.0.0.1",
         user="root",  # Replace with your MySQL username
-        password="new_password", 
+        password="new_password",
         )
-    
+
     except mysql.connector.Error as err:
         return None
 def connect_db():
-    return mysql.connector.connect(
-        host="127.0.0.1",
-        user="root",  # Replace with your MySQL username
-        password="new_password", 
-        database="hotel_book"
-    )
-database_name = "hotel_book"
\ No newline at end of file
+    """Borrow a connection from the shared pool; close() returns it"""
+    return db.get_connection()
+database_name = "hotel_book"
@@ -1,19 +1,29 @@
 import subprocess
 import customtkinter as ctk
-from tkinter import messagebox, Canvas, Scrollbar, ttk
+from tkinter import messagebox, Canvas, PhotoImage, Scrollbar, ttk
 import mysql.connector
 from datetime import datetime, timedelta
 import os
-from PIL import Image, ImageTk
 from tkcalendar import DateEntry
 import re
 import sys
 import logging
 from db_config import connect_db
+import catalog
+import hotel_search
+import inventory
+import tasks
+import thumbnails
+import ui_profiler
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Hotel card list
+CARD_IMAGE_SIZE = (260, 120)
+CARDS_PER_BATCH = 8     # cards rendered at once: about a screenful
+LOAD_MORE_AT = 0.8      # render the next batch once this much of the list has scrolled into view
+
 # ------------------- Main Application Class -------------------
 class HotelBookingUserApp:
     def __init__(self, root, user_id=None):
@@ -33,6 +43,18 @@ class HotelBookingUserApp:
             self.root.destroy()
             return
         
+        # Background queries; results are handed back on the Tk thread
+        self.runner = tasks.TaskRunner(self.root)
+        ui_profiler.install(self.root)
+        self.card_image_tasks = []  # thumbnail loads for the cards currently listed
+        
+        # Hotel list: cards are created once, then hidden and refilled for each new list
+        self.card_pool = []
+        self.cards_shown = 0
+        self.hotel_results = []
+        self.card_render_pending = False
+        self.card_placeholder = PhotoImage(width=CARD_IMAGE_SIZE[0], height=CARD_IMAGE_SIZE[1])
+        
         # Variables
         self.selected_hotel_id = None
         self.room_prices = {}
@@ -210,7 +232,9 @@ class HotelBookingUserApp:
         
         self.home_scrollable_frame.bind("<Configure>", lambda e: self.home_canvas.configure(scrollregion=self.home_canvas.bbox("all")))
         self.home_canvas.create_window((0, 0), window=self.home_scrollable_frame, anchor="nw")
-        self.home_canvas.configure(yscrollcommand=self.home_scrollbar.set)
+        self.home_canvas.configure(yscrollcommand=self.on_hotel_list_scroll)
+        self.hotel_list_message = ctk.CTkLabel(self.home_scrollable_frame, text="",
+                                               font=("Arial", 14), text_color="gray")
         
         self.home_canvas.pack(side="left", fill="both", expand=True)
         self.home_scrollbar.pack(side="right", fill="y")
@@ -237,160 +261,188 @@ class HotelBookingUserApp:
                 check_in = datetime.strptime(check_in, "%m/%d/%Y")
             if isinstance(check_out, str) and check_out:
                 check_out = datetime.strptime(check_out, "%m/%d/%Y")
-                
-            if check_in and check_out and check_in >= check_out:
-                messagebox.showwarning("Date Error", "Check-out date must be after check-in date.")
-                return
-                
-            if guests and not guests.isdigit():
-                messagebox.showwarning("Input Error", "Number of guests must be a number.")
-                return
-            
-            for widget in self.home_scrollable_frame.winfo_children():
-                widget.destroy()
-            
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            
-            query = """
-                SELECT h.Hotel_ID, h.hotel_name, h.location, h.description, h.star_rating, h.image_path,
-                       MIN(rc.base_price) as min_price
-                FROM Hotel h
-                LEFT JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
-                WHERE h.location LIKE %s
-            """
-            params = [f"%{location}%"]
-            
-            if check_in and check_out:
-                query += """
-                    AND EXISTS (
-                        SELECT 1 FROM Room r
-                        WHERE r.Room_ID = rc.Category_ID
-                        AND r.Availability_status = 'Available'
-                    )
-                """
-            
-            query += " GROUP BY h.Hotel_ID ORDER BY h.star_rating DESC, min_price"
+        except ValueError as err:
+            messagebox.showwarning("Date Error", f"Invalid date: {err}")
+            return
             
-            cursor.execute(query, params)
-            hotels_data = cursor.fetchall()
+        if check_in and check_out and check_in >= check_out:
+            messagebox.showwarning("Date Error", "Check-out date must be after check-in date.")
+            return
             
-            if hotels_data:
-                for hotel in hotels_data:
-                    cursor.execute(
-                        """
-                        SELECT GROUP_CONCAT(CONCAT(a.amenity_icon, ' ', a.amenity_name) SEPARATOR ' | ') as amenities
-                        FROM Hotel_Amenities ha
-                        JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
-                        WHERE ha.Hotel_ID = %s
-                        LIMIT 3
-                        """, (hotel['Hotel_ID'],)
-                    )
-                    amenities_result = cursor.fetchone()
-                    amenities = amenities_result['amenities'] if amenities_result and amenities_result['amenities'] else "📶 Free WiFi | 🏊 Pool | 🚗 Free Parking"
-                    
-                    price = f"${hotel['min_price']:.2f} per night" if hotel['min_price'] else "Price on request"
-                    description = f"{hotel['description'][:100]}..." if hotel['description'] else "Beautiful hotel in a prime location."
-                    
-                    hotel_data = (hotel['hotel_name'], description, amenities, price, hotel['image_path'], hotel['Hotel_ID'])
-                    card = self.create_hotel_card(self.home_scrollable_frame, hotel_data)
-                    card.pack(anchor="w", padx=10, pady=10, fill="x")
-            else:
-                ctk.CTkLabel(self.home_scrollable_frame, text="No hotels found matching your criteria.",
-                            font=("Arial", 14), text_color="gray").pack(pady=50)
-                
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", f"Search failed: {err}")
+        if guests and not guests.isdigit():
+            messagebox.showwarning("Input Error", "Number of guests must be a number.")
+            return
+        
+        self.show_hotels_loading("Searching hotels...")
+        
+        # The query runs on a worker; a newer search (or popular list) supersedes this one
+        self.runner.submit(
+            self.query_hotels, location.strip(), bool(check_in and check_out), check_in, check_out,
+            on_done=lambda hotels: self.show_hotel_cards(hotels, "No hotels found matching your criteria."),
+            on_error=lambda err: messagebox.showerror("Database Error", f"Search failed: {err}"),
+            key="hotel-list"
+        )
+
+    def query_hotels(self, term, only_available, check_in=None, check_out=None):
+        """Run the hotel search query (worker thread); returns hotels with their amenities"""
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
+        try:
+            hotels = hotel_search.search_hotels(
+                cursor, term, only_available, check_in=check_in or None, check_out=check_out or None
+            )
+            return hotel_search.with_amenities(cursor, hotels)
         finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
+            cursor.close()
+            connection.close()
 
     def load_popular_hotels(self):
         """Load popular hotels from the database"""
-        for widget in self.home_scrollable_frame.winfo_children():
-            widget.destroy()
-        
+        self.show_hotels_loading("Loading hotels...")
+        self.runner.submit(
+            self.query_popular_hotels,
+            on_done=lambda hotels: self.show_hotel_cards(hotels, "No hotels available yet."),
+            on_error=lambda err: messagebox.showerror("Database Error", f"Could not load hotels: {err}"),
+            key="hotel-list"
+        )
+
+    def query_popular_hotels(self):
+        """Fetch the top-rated hotels with their amenities (worker thread)"""
+        connection = connect_db()
+        cursor = connection.cursor(dictionary=True)
         try:
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                """
-                SELECT h.Hotel_ID, h.hotel_name, h.location, h.description, h.star_rating, h.image_path,
-                       MIN(rc.base_price) as min_price
-                FROM Hotel h
-                LEFT JOIN RoomCategory rc ON h.Hotel_ID = rc.Hotel_ID
-                GROUP BY h.Hotel_ID
-                ORDER BY h.star_rating DESC, min_price
-                LIMIT 6
-                """
-            )
-            hotels_data = cursor.fetchall()
-            
-            for hotel in hotels_data:
-                cursor.execute(
-                    """
-                    SELECT GROUP_CONCAT(CONCAT(a.amenity_icon, ' ', a.amenity_name) SEPARATOR ' | ') as amenities
-                    FROM Hotel_Amenities ha
-                    JOIN Amenities a ON ha.Amenity_ID = a.Amenity_ID
-                    WHERE ha.Hotel_ID = %s
-                    LIMIT 3
-                    """, (hotel['Hotel_ID'],)
-                )
-                amenities_result = cursor.fetchone()
-                amenities = amenities_result['amenities'] if amenities_result and amenities_result['amenities'] else "📶 Free WiFi | 🏊 Pool | 🚗 Free Parking"
-                
-                price = f"${hotel['min_price']:.2f} per night" if hotel['min_price'] else "Price on request"
-                description = f"{hotel['description'][:100]}..." if hotel['description'] else "Beautiful hotel in a prime location."
-                
-                hotel_data = (hotel['hotel_name'], description, amenities, price, hotel['image_path'], hotel['Hotel_ID'])
-                card = self.create_hotel_card(self.home_scrollable_frame, hotel_data)
-                card.pack(anchor="w", padx=10, pady=10, fill="x")
-                
-        except mysql.connector.Error as err:
-            messagebox.showerror("Database Error", f"Could not load hotels: {err}")
+            return hotel_search.with_amenities(cursor, hotel_search.popular_hotels(cursor))
         finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
+            cursor.close()
+            connection.close()
 
-    def create_hotel_card(self, parent, hotel_data):
-        """Create a hotel card widget"""
-        name, description, amenities, price, image_path, hotel_id = hotel_data
-        card = ctk.CTkFrame(parent, fg_color="white", border_width=1, border_color="#D5D8DC", height=250)
+    def clear_hotel_list(self):
+        """Hide every card (they are kept for the next list) and any message"""
+        self.cancel_card_images()
+        for card in self.card_pool[:self.cards_shown]:
+            card.pack_forget()
+        self.cards_shown = 0
+        self.hotel_results = []
+        self.hotel_list_message.pack_forget()
+        self.home_canvas.yview_moveto(0)
+
+    def show_hotels_loading(self, message):
+        """Replace the hotel list with a placeholder while a query runs"""
+        self.clear_hotel_list()
+        self.hotel_list_message.configure(text=message)
+        self.hotel_list_message.pack(pady=50)
+
+    def show_hotel_cards(self, hotels, empty_message):
+        """Render (hotel, amenities) results as cards, a batch at a time as the list scrolls"""
+        self.clear_hotel_list()
         
-        if image_path and os.path.exists(image_path):
-            try:
-                hotel_image = Image.open(image_path)
-                hotel_image = hotel_image.resize((260, 120), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(hotel_image)
-                image_label = ctk.CTkLabel(card, text="", image=photo, fg_color="white")
-                image_label.image = photo
-                image_label.pack(anchor="center", padx=10, pady=(10, 5))
-            except Exception as e:
-                print(f"Error loading hotel image: {e}")
-                ctk.CTkLabel(card, text=name, font=("Arial", 14, "bold")).pack(anchor="w", padx=10, pady=(20,5))
-        else:
-            ctk.CTkLabel(card, text=name, font=("Arial", 14, "bold")).pack(anchor="w", padx=10, pady=(20,5))
+        if not hotels:
+            self.hotel_list_message.configure(text=empty_message)
+            self.hotel_list_message.pack(pady=50)
+            return
         
-        if image_path and os.path.exists(image_path):
-            ctk.CTkLabel(card, text=name, font=("Arial", 12, "bold")).pack(anchor="w", padx=10, pady=(5,5))
+        self.hotel_results = hotels
+        self.render_more_cards()
+
+    def render_more_cards(self):
+        """Render the next batch of result cards, reusing cards built for earlier lists"""
+        self.card_render_pending = False
+        for hotel, amenities in self.hotel_results[self.cards_shown:self.cards_shown + CARDS_PER_BATCH]:
+            price = f"${hotel['min_price']:.2f} per night" if hotel['min_price'] else "Price on request"
+            description = f"{hotel['description'][:100]}..." if hotel['description'] else "Beautiful hotel in a prime location."
             
-        ctk.CTkLabel(card, text=description, font=("Arial", 10), wraplength=650).pack(anchor="w", padx=10)
-        ctk.CTkLabel(card, text=amenities, font=("Arial", 9), wraplength=650).pack(anchor="w", padx=10, pady=(5,0))
-        
-        price_frame = ctk.CTkFrame(card, fg_color="white")
-        price_frame.pack(anchor="w", fill="x", padx=10, pady=(5,10))
-        ctk.CTkLabel(price_frame, text=price, font=("Arial", 10, "bold"), text_color="#1E90FF").pack(side="left")
-        
-        view_btn = ctk.CTkButton(price_frame, text="Book Now", font=("Arial", 10),
-                               fg_color="#0F2D52", hover_color="#1E4D88",
-                               width=80, height=25, corner_radius=5,
-                               command=lambda: self.view_hotel_details(hotel_id))
-        view_btn.pack(side="right", padx=10)
+            if self.cards_shown == len(self.card_pool):
+                self.card_pool.append(self.create_hotel_card(self.home_scrollable_frame))
+            card = self.card_pool[self.cards_shown]
+            hotel_data = (hotel['hotel_name'], description, amenities, price, hotel['image_path'], hotel['Hotel_ID'])
+            self.fill_hotel_card(card, hotel_data)
+            card.pack(anchor="w", padx=10, pady=10, fill="x")
+            self.cards_shown += 1
+
+    def on_hotel_list_scroll(self, first, last):
+        """Keep the scrollbar in step and render more cards as the end of the list comes into view"""
+        self.home_scrollbar.set(first, last)
+        if float(last) >= LOAD_MORE_AT and self.cards_shown < len(self.hotel_results) and not self.card_render_pending:
+            self.card_render_pending = True
+            self.root.after_idle(self.render_more_cards)
+
+    def create_hotel_card(self, parent):
+        """Create an empty hotel card widget; fill_hotel_card puts a hotel in it"""
+        card = ctk.CTkFrame(parent, fg_color="white", border_width=1, border_color="#D5D8DC", height=250)
+        card.image_key = None
+        card.image_label = ctk.CTkLabel(card, text="", font=("Arial", 10), text_color="gray",
+                                        width=CARD_IMAGE_SIZE[0], height=CARD_IMAGE_SIZE[1])
+        card.name_label = ctk.CTkLabel(card, text="")
+        card.description_label = ctk.CTkLabel(card, text="", font=("Arial", 10), wraplength=650)
+        card.amenities_label = ctk.CTkLabel(card, text="", font=("Arial", 9), wraplength=650)
+        
+        card.price_frame = ctk.CTkFrame(card, fg_color="white")
+        card.price_label = ctk.CTkLabel(card.price_frame, text="", font=("Arial", 10, "bold"), text_color="#1E90FF")
+        card.price_label.pack(side="left")
+        card.view_btn = ctk.CTkButton(card.price_frame, text="Book Now", font=("Arial", 10),
+                                    fg_color="#0F2D52", hover_color="#1E4D88",
+                                    width=80, height=25, corner_radius=5)
+        card.view_btn.pack(side="right", padx=10)
         
         return card
 
+    def fill_hotel_card(self, card, hotel_data):
+        """Show a hotel in a new or recycled card"""
+        name, description, amenities, price, image_path, hotel_id = hotel_data
+        for widget in (card.image_label, card.name_label, card.description_label, card.amenities_label, card.price_frame):
+            widget.pack_forget()
+        
+        # The card shows straight away; its image is decoded on a worker and swapped in
+        card.image_key = thumbnails.thumbnail_key(image_path, CARD_IMAGE_SIZE)
+        if card.image_key:
+            card.image_label.configure(image=self.card_placeholder, text="Loading image...", fg_color="#F2F3F4")
+            card.image_label.pack(anchor="center", padx=10, pady=(10, 5))
+            self.load_card_image(card)
+            card.name_label.configure(text=name, font=("Arial", 12, "bold"))
+            card.name_label.pack(anchor="w", padx=10, pady=(5,5))
+        else:
+            card.name_label.configure(text=name, font=("Arial", 14, "bold"))
+            card.name_label.pack(anchor="w", padx=10, pady=(20,5))
+            
+        card.description_label.configure(text=description)
+        card.description_label.pack(anchor="w", padx=10)
+        card.amenities_label.configure(text=amenities)
+        card.amenities_label.pack(anchor="w", padx=10, pady=(5,0))
+        
+        card.price_label.configure(text=price)
+        card.view_btn.configure(command=lambda: self.view_hotel_details(hotel_id))
+        card.price_frame.pack(anchor="w", fill="x", padx=10, pady=(5,10))
+
+    def load_card_image(self, card):
+        """Show a card's thumbnail, decoding it on a worker unless it is already in memory"""
+        image_key = card.image_key
+        photo = thumbnails.cached_photo(image_key)
+        if photo is not None:
+            self.set_card_image(card, image_key, photo)
+            return
+        # Cards are filled top first, so the ones on screen are decoded first
+        self.card_image_tasks.append(self.runner.submit(
+            thumbnails.load_thumbnail, image_key,
+            on_done=lambda image: self.set_card_image(card, image_key, thumbnails.remember_photo(image_key, image)),
+            on_error=lambda err: self.set_card_image(card, image_key, None)
+        ))
+
+    def set_card_image(self, card, image_key, photo):
+        """Swap a card's placeholder for its thumbnail (None if it could not be loaded)"""
+        if card.image_key != image_key or not card.winfo_exists():
+            return  # the card has been recycled for another hotel
+        if photo is None:
+            card.image_label.configure(text="No image available")
+        else:
+            card.image_label.configure(image=photo, text="", fg_color="white")
+            card.image_label.image = photo
+
+    def cancel_card_images(self):
+        """Drop thumbnail loads for cards that are about to be refilled"""
+        for task in self.card_image_tasks:
+            task.cancel()
+        self.card_image_tasks = []
+
     def view_hotel_details(self, hotel_id):
         """Navigate to the book frame with selected hotel"""
         self.selected_hotel_id = hotel_id
@@ -530,30 +582,13 @@ class HotelBookingUserApp:
     def load_hotel_details(self, hotel_id):
         """Load hotel details from database"""
         try:
-            connection = connect_db()
-            cursor = connection.cursor(dictionary=True)
-            cursor.execute(
-                """
-                SELECT h.Hotel_ID, h.hotel_name, h.location, h.description, h.star_rating, h.image_path
-                FROM Hotel h
-                WHERE h.Hotel_ID = %s
-                """, (hotel_id,)
-            )
-            hotel_data = cursor.fetchone()
+            hotel_data = catalog.hotel_details(hotel_id)
             
             if hotel_data:
                 self.book_hotel_name_label.configure(text=hotel_data['hotel_name'])
                 self.book_hotel_location_label.configure(text=f"📍 {hotel_data['location']}")
                 
-                cursor.execute(
-                    """
-                    SELECT Category_ID as Room_ID, category_name as Room_Type,
-                           base_price as Price_per_Night, 'Available' as Availability_status
-                    FROM RoomCategory rc
-                    WHERE rc.Hotel_ID = %s
-                    """, (hotel_id,)
-                )
-                room_types = cursor.fetchall()
+                room_types = hotel_data['room_types']
                 
                 self.room_prices = {room['Room_Type']: room['Price_per_Night'] for room in room_types}
                 room_type_options = [f"{room['Room_Type']} - ${room['Price_per_Night']}/night" for room in room_types]
@@ -568,10 +603,6 @@ class HotelBookingUserApp:
                     
         except mysql.connector.Error as err:
             messagebox.showerror("Database Error", str(err))
-        finally:
-            if 'connection' in locals() and connection.is_connected():
-                cursor.close()
-                connection.close()
 
     def calculate_total_price(self):
         """Calculate the total price based on room type and nights"""
@@ -702,6 +733,12 @@ class HotelBookingUserApp:
                 
             room_id = room_result[0]
             
+            # Holds the category until commit, so its last room cannot go twice
+            if not inventory.lock_category_room(cursor, room_id, check_in, check_out):
+                connection.rollback()
+                messagebox.showerror("Booking Error", "No room of this type is free for these dates")
+                return
+            
             cursor.execute("SHOW COLUMNS FROM Booking LIKE 'Guests'")
             has_guests_column = cursor.fetchone() is not None
             
@@ -723,10 +760,6 @@ class HotelBookingUserApp:
                     """, (self.current_user['user_id'], room_id, check_in.strftime('%Y-%m-%d'),
                          check_out.strftime('%Y-%m-%d'), total_price, 'Confirmed')
                 )
-                
-            cursor.execute(
-                "UPDATE Room SET Availability_status = 'Booked' WHERE Room_ID = %s", (room_id,)
-            )
             
             connection.commit()
             messagebox.showinfo("Success", "Booking confirmed successfully!")
@@ -843,9 +876,7 @@ class HotelBookingUserApp:
         
         if image_path and os.path.exists(str(image_path)):
             try:
-                hotel_image = Image.open(image_path)
-                hotel_image = hotel_image.resize((150, 120), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(hotel_image)
+                photo = thumbnails.photo_image(image_path, (150, 120))
                 image_label = ctk.CTkLabel(card, text="", image=photo, fg_color="white")
                 image_label.image = photo
                 image_label.grid(row=0, column=0, rowspan=4, padx=(10, 15), pady=10, sticky="nw")
@@ -909,9 +940,8 @@ class HotelBookingUserApp:
                 messagebox.showerror("Error", "Booking not found")
                 return
                 
-            room_id = room_result[0]
             cursor.execute("UPDATE Booking SET Booking_Status = 'Cancelled' WHERE Booking_ID = %s", (booking_id,))
-            cursor.execute("UPDATE Room SET Availability_status = 'Available' WHERE Room_ID = %s", (room_id,))
+            inventory.release_nights(cursor, booking_id)
             
             connection.commit()
             messagebox.showinfo("Success", "Booking cancelled successfully")
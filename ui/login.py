@@ -1,23 +1,14 @@
 import customtkinter as ctk
 from tkinter import messagebox
 import mysql.connector
-import hashlib
 import subprocess
 import sys
 import os
-
-# ------------------- Database Connection -------------------
-def connect_db():
-    return mysql.connector.connect(
-        host="127.0.0.1",
-        user="root",  # Replace with your MySQL username
-        password="new_password",   # Replace with your MySQL password
-        database="hotel_book"  # Replace with your database name
-    )
-
-# ------------------- Password Hashing -------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+from db_config import connect_db
+import login_limiter
+import passwords
+import tasks
+import ui_profiler
 
 # ------------------- Open Sign Up Page -------------------
 def open_signup(event=None):
@@ -83,7 +74,6 @@ def forgot_password(event=None):
                     
                     # Process security answer
                     processed_answer = answer.lower().strip()
-                    hashed_answer = hash_password(processed_answer)
                     
                     # Verify the answer
                     verify_cursor.execute("SELECT security_answer FROM Users WHERE email = %s", (email,))
@@ -92,7 +82,7 @@ def forgot_password(event=None):
                     if stored_answer_result and 'security_answer' in stored_answer_result:
                         stored_answer = stored_answer_result['security_answer']
                         
-                        if hashed_answer == stored_answer:
+                        if passwords.verify_password(processed_answer, stored_answer)[0]:
                             # Close verification window
                             security_window.destroy()
                             # Open password reset window
@@ -184,14 +174,20 @@ def show_password_reset_window(user_id, email):
             messagebox.showwarning("Password Too Short", "Password must be at least 6 characters.")
             return
         
+        # Hashing is slow on purpose, so it runs off the Tk thread
+        runner.submit(
+            passwords.hash_password, new_password,
+            on_done=save_password,
+            on_error=lambda err: messagebox.showerror("Error", f"Password update failed: {err}"),
+            key="reset"
+        )
+    
+    def save_password(hashed_password):
         # Connect to database
         try:
             update_connection = connect_db()
             update_cursor = update_connection.cursor()
             
-            # Hash the new password
-            hashed_password = hash_password(new_password)
-            
             # Update the password in the database
             update_cursor.execute(
                 "UPDATE Users SET password = %s WHERE user_id = %s", 
@@ -222,6 +218,12 @@ def show_password_reset_window(user_id, email):
                              width=300, height=40)
     cancel_btn.pack(pady=10)
 # ------------------- Login Function -------------------
+def show_login_error(err):
+    if isinstance(err, login_limiter.LoginThrottled):
+        messagebox.showwarning("Too Many Attempts", str(err))
+    else:
+        messagebox.showerror("Database Error", str(err))
+
 def login_user():
     email = email_entry.get()
     password = password_entry.get()
@@ -230,17 +232,7 @@ def login_user():
         messagebox.showwarning("Input Error", "Please enter both email and password.")
         return
 
-    hashed_password = hash_password(password)
-
-    try:
-        connection = connect_db()
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT user_id, first_name, last_name, is_active FROM Users WHERE email = %s AND password = %s",
-            (email, hashed_password)
-        )
-        user = cursor.fetchone()
-
+    def logged_in(user):
         if user:
             # Check if user is active
             if not user.get('is_active', 1):  # Default to active if column doesn't exist yet
@@ -260,13 +252,14 @@ def login_user():
             open_home_page(user['user_id'])
         else:
             messagebox.showerror("Login Failed", "Invalid Email or Password.")
-    
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if 'connection' in locals() and connection.is_connected():
-            cursor.close()
-            connection.close()
+
+    # Password checks are slow on purpose, so they run off the Tk thread
+    runner.submit(
+        passwords.authenticate, "user", email, password,
+        on_done=logged_in,
+        on_error=show_login_error,
+        key="login"
+    )
 
 # ------------------- Open Home Page -------------------
 def open_home_page(user_id):
@@ -316,6 +309,8 @@ ctk.set_appearance_mode("light")
 ctk.set_default_color_theme("blue")
 
 app = ctk.CTk()
+runner = tasks.TaskRunner(app)
+ui_profiler.install(app)
 app.title("Hotel Booking Login")
 app.geometry("1000x800")
 app.resizable(True, True)
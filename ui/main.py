@@ -7,6 +7,7 @@ import os
 import hashlib
 from PIL import Image, ImageTk
 from db_config import connect_mysql, connect_db,database_name
+import migrations
 
 # ------------------- Database Setup Functions -------------------
 def setup_database():
@@ -155,6 +156,9 @@ def setup_database():
         
         # Commit the changes
         connection.commit()
+        
+        # Apply pending schema migrations (indexes, the report rollup and later changes)
+        migrations.migrate(connection)
         return True
         
     except mysql.connector.Error as err:
@@ -1,20 +1,18 @@
 import customtkinter as ctk
 from tkinter import messagebox
 import mysql.connector
-import hashlib
 import subprocess
 import sys
 import os
 from PIL import Image, ImageTk
 from db_config import connect_db  # Assuming you have a separate file for DB config
+import passwords
+import tasks
+import ui_profiler
 
 # ------------------- Database Connection -------------------
 
 
-# ------------------- Password Hashing -------------------
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
 # ------------------- Icon Loader Function -------------------
 def load_icon(icon_path, size=(16, 16)):  # Reduced icon size
     """Load an icon image and resize it to the specified size"""
@@ -67,40 +65,46 @@ def signup_user():
     first_name = name_parts[0]
     last_name = name_parts[1] if len(name_parts) > 1 else ""
 
-    # Hash the password and security answer
-    hashed_password = hash_password(password)
-    
     # Process security answer consistently - lowercase and strip whitespace
     processed_answer = security_answer.lower().strip()
-    hashed_security_answer = hash_password(processed_answer)
-    
-    # Debug prints to help troubleshoot the hashing issue
-    print(f"Debug - During signup - Original Answer: {security_answer}")
-    print(f"Debug - During signup - Processed Answer: {processed_answer}")
-    print(f"Debug - During signup - Answer Hash: {hashed_security_answer}")
-
-    try:
-        connection = connect_db()
-        cursor = connection.cursor()
 
-        # Insert the user data into the database
-        cursor.execute(
-            "INSERT INTO Users (first_name, last_name, email, phone, password, security_question, security_answer) VALUES (%s, %s, %s, %s, %s, %s, %s)",
-            (first_name, last_name, email, phone, hashed_password, security_question, hashed_security_answer)
-        )
-
-        connection.commit()
-        messagebox.showinfo("Success", "Account created successfully!")
-        
-        # After successful registration, redirect to login page
-        open_login_page()
-
-    except mysql.connector.Error as err:
-        messagebox.showerror("Database Error", str(err))
-    finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
+    def hash_credentials():
+        # Hash the password and security answer (worker thread)
+        return passwords.hash_password(password), passwords.hash_password(processed_answer)
+
+    def create_account(hashes):
+        hashed_password, hashed_security_answer = hashes
+
+        try:
+            connection = connect_db()
+            cursor = connection.cursor()
+
+            # Insert the user data into the database
+            cursor.execute(
+                "INSERT INTO Users (first_name, last_name, email, phone, password, security_question, security_answer) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (first_name, last_name, email, phone, hashed_password, security_question, hashed_security_answer)
+            )
+
+            connection.commit()
+            messagebox.showinfo("Success", "Account created successfully!")
+            
+            # After successful registration, redirect to login page
+            open_login_page()
+
+        except mysql.connector.Error as err:
+            messagebox.showerror("Database Error", str(err))
+        finally:
+            if 'connection' in locals() and connection.is_connected():
+                cursor.close()
+                connection.close()
+
+    # Salted hashes are slow on purpose, so they are computed off the Tk thread
+    runner.submit(
+        hash_credentials,
+        on_done=create_account,
+        on_error=lambda err: messagebox.showerror("Error", str(err)),
+        key="signup"
+    )
 
 # ------------------- Open Login Page -------------------
 def open_login_page(event=None):
@@ -127,6 +131,8 @@ ctk.set_default_color_theme("blue")
 import tkinter as tk
 
 app = ctk.CTk()
+runner = tasks.TaskRunner(app)
+ui_profiler.install(app)
 app.title("Hotel Booking - Sign Up")
 app.geometry("800x600")  # Further reduced height to emphasize scrolling need
 app.resizable(True, True)  # Allow resizing to see scrolling behavior
@@ -0,0 +1,203 @@
+# ui_profiler.py
+import atexit
+import cProfile
+import os
+import sys
+import time
+import tkinter
+from datetime import datetime
+
+import config
+import query_stats
+
+# ------------------- UI Profiling -------------------
+# Opt-in instrumentation for telling whether a sluggish page is waiting on
+# SQL, image decoding or widget churn. Start the app with
+# HOTEL_UI_PROFILE=report (or =cprofile to also keep cProfile stats for the
+# Tk thread) and on exit a report lands in config.UI_PROFILE_DIR with:
+#
+#   - time spent in each Tk callback (commands, bindings, after() jobs and
+#     TaskRunner completions), by the page function that handled it
+#   - how long the main loop was blocked: a heartbeat scheduled every
+#     HEARTBEAT_MS that runs config.UI_STALL_MS or more late counts a stall
+#   - build time and widget count for each page shown
+#   - the slowest SQL callers (query_stats) and thumbnail cache counters
+#
+# Everything here runs on the Tk thread, so the counters need no locks.
+# When profiling is off, install() does nothing and call() is a plain call.
+
+HEARTBEAT_MS = 50
+WIDGET_SAMPLE_EVERY = 20    # heartbeats between widget counts (about once a second)
+
+_enabled = False
+_profile = None
+_page = None
+_depth = 0                  # callbacks currently running (nested ones are not busy time twice)
+_started = None
+_callbacks = {}             # name -> [calls, total seconds, max seconds]
+_pages = {}                 # page -> {"builds", "build_time", "max_build", "widgets", "max_widgets"}
+_loop = {"busy": 0.0, "stalls": 0, "stall_time": 0.0, "max_stall": 0.0}
+
+def enabled():
+    return _enabled
+
+def _script_name():
+    return os.path.splitext(os.path.basename(sys.argv[0]))[0] or "app"
+
+def _callback_name(func):
+    """module.function of the page code behind a Tk callback"""
+    # after() wraps the function in a closure named callit
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_name == "callit" and "func" in code.co_freevars:
+        func = func.__closure__[code.co_freevars.index("func")].cell_contents
+    # customtkinter widgets bind their own handler, which then calls the page's command
+    owner = getattr(func, "__self__", None)
+    command = getattr(owner, "_command", None)
+    if callable(command) and type(owner).__module__.startswith("customtkinter"):
+        func = command
+
+    code = getattr(func, "__code__", None) or getattr(getattr(func, "__func__", None), "__code__", None)
+    module = os.path.splitext(os.path.basename(code.co_filename))[0] if code else type(func).__module__
+    return f"{module}.{getattr(func, '__qualname__', type(func).__name__)}"
+
+def _record(name, elapsed):
+    entry = _callbacks.get(name)
+    if entry is None:
+        entry = _callbacks[name] = [0, 0.0, 0.0]
+    entry[0] += 1
+    entry[1] += elapsed
+    entry[2] = max(entry[2], elapsed)
+
+def measure(name, fn, *args):
+    """fn(*args), timed under name when profiling is on"""
+    global _depth
+    if not _enabled:
+        return fn(*args)
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        elapsed = time.perf_counter() - start
+        _depth -= 1
+        _record(name, elapsed)
+        if _depth == 0:
+            _loop["busy"] += elapsed
+
+def call(callback, *args):
+    """callback(*args), timed under the callback's name when profiling is on"""
+    if not _enabled:
+        return callback(*args)
+    return measure(_callback_name(callback), callback, *args)
+
+_original_call = tkinter.CallWrapper.__call__
+
+def _profiled_call(self, *args):
+    if not _enabled or getattr(self.func, "__name__", None) == "_heartbeat":
+        return _original_call(self, *args)
+    return measure(_callback_name(self.func), _original_call, self, *args)
+
+# ------------------- Main Loop And Widgets -------------------
+def count_widgets(widget):
+    """Number of widgets below widget, itself included"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+def _page_entry(page):
+    return _pages.setdefault(page, {
+        "builds": 0, "build_time": 0.0, "max_build": 0.0, "widgets": 0, "max_widgets": 0,
+    })
+
+def _heartbeat(widget, due, beat):
+    lag = time.perf_counter() - due
+    if lag * 1000 >= config.UI_STALL_MS:
+        _loop["stalls"] += 1
+        _loop["stall_time"] += lag
+        _loop["max_stall"] = max(_loop["max_stall"], lag)
+
+    if beat % WIDGET_SAMPLE_EVERY == 0 and _page is not None:
+        try:
+            entry = _page_entry(_page)
+            entry["max_widgets"] = max(entry["max_widgets"], count_widgets(widget))
+        except tkinter.TclError:
+            return      # the window is gone
+
+    try:
+        widget.after(HEARTBEAT_MS, _heartbeat, widget, time.perf_counter() + HEARTBEAT_MS / 1000, beat + 1)
+    except tkinter.TclError:
+        pass
+
+def page_built(page, root, build_time):
+    """Record a page build and the widget count it left behind"""
+    global _page
+    if not _enabled:
+        return
+    _page = page
+    entry = _page_entry(page)
+    entry["builds"] += 1
+    entry["build_time"] += build_time
+    entry["max_build"] = max(entry["max_build"], build_time)
+    entry["widgets"] = count_widgets(root)
+    entry["max_widgets"] = max(entry["max_widgets"], entry["widgets"])
+
+def install(root, page=None):
+    """Start profiling the Tk loop of root if config.UI_PROFILE asks for it (once per process)"""
+    global _enabled, _profile, _page, _started
+    if not config.UI_PROFILE or _enabled:
+        return
+    _enabled = True
+    _started = time.perf_counter()
+    _page = page or _script_name()
+    tkinter.CallWrapper.__call__ = _profiled_call
+    if config.UI_PROFILE == "cprofile":
+        # cProfile follows the thread that enables it: here the Tk thread
+        _profile = cProfile.Profile()
+        _profile.enable()
+    root.after(HEARTBEAT_MS, _heartbeat, root, time.perf_counter() + HEARTBEAT_MS / 1000, 1)
+    atexit.register(dump)
+
+# ------------------- Report -------------------
+def report(limit=25):
+    """Plain-text summary of callbacks, main loop stalls, pages, SQL and thumbnails"""
+    wall = time.perf_counter() - _started if _started else 0.0
+    lines = [
+        f"UI profile: {_script_name()} (pid {os.getpid()}), {wall:.1f}s",
+        "",
+        f"Main loop: busy {_loop['busy']:.2f}s in callbacks ({_loop['busy'] / wall * 100 if wall else 0:.0f}%), "
+        f"{_loop['stalls']} stalls >= {config.UI_STALL_MS}ms totalling {_loop['stall_time']:.2f}s, "
+        f"longest {_loop['max_stall'] * 1000:.0f}ms",
+        "",
+        f"{'total ms':>10} {'calls':>7} {'avg ms':>8} {'max ms':>8}  callback",
+    ]
+    ranked = sorted(_callbacks.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (calls, total, longest) in ranked[:limit]:
+        lines.append(f"{total * 1000:>10.1f} {calls:>7} {total * 1000 / calls:>8.2f} {longest * 1000:>8.1f}  {name}")
+
+    lines += ["", f"{'builds':>7} {'avg ms':>8} {'max ms':>8} {'widgets':>8} {'peak':>6}  page"]
+    for page, entry in _pages.items():
+        average = entry["build_time"] * 1000 / entry["builds"] if entry["builds"] else 0.0
+        lines.append(f"{entry['builds']:>7} {average:>8.1f} {entry['max_build'] * 1000:>8.1f} "
+                     f"{entry['widgets']:>8} {entry['max_widgets']:>6}  {page}")
+
+    lines += ["", "SQL (query_stats):", query_stats.report(10)]
+    thumbnails = sys.modules.get("thumbnails")
+    if thumbnails is not None:
+        lines += ["", f"Thumbnails: {thumbnails.thumbnail_stats()}"]
+    return "\n".join(lines)
+
+def dump():
+    """Write the report (and cProfile stats when enabled) to config.UI_PROFILE_DIR"""
+    if not _enabled:
+        return
+    base = os.path.join(
+        config.UI_PROFILE_DIR, f"{_script_name()}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+    )
+    try:
+        os.makedirs(config.UI_PROFILE_DIR, exist_ok=True)
+        with open(f"{base}.txt", "w", encoding="utf-8") as out:
+            out.write(report() + "\n")
+        if _profile is not None:
+            _profile.disable()
+            _profile.dump_stats(f"{base}.prof")
+        print(f"UI profile written to {base}.txt")
+    except OSError as err:
+        print(f"Could not write UI profile: {err}")
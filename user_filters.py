@@ -0,0 +1,100 @@
+# user_filters.py
+import config
+import db
+
+# ------------------- Searchable, Paginated User Listing -------------------
+# Same approach as booking_filters: the search runs in SQL and users are
+# fetched in user_id order one keyset page at a time as the table scrolls.
+# Booking counts are a correlated COUNT per user on the Booking(User_ID, ...)
+# index, so a page never aggregates more than its own users' bookings.
+
+USER_COLUMNS = """
+    SELECT u.user_id, u.first_name, u.last_name, u.email, u.phone, u.user_address,
+           (SELECT COUNT(*) FROM Booking b WHERE b.User_ID = u.user_id) AS bookings{extra}
+    FROM Users u
+"""
+
+def build_filters(search_term="", include_address=False):
+    """Turn the search box into a WHERE clause and its parameters"""
+    search_term = (search_term or "").strip()
+    if not search_term:
+        return "", []
+
+    fields = ["CONCAT(u.first_name, ' ', u.last_name)", "u.email"]
+    if include_address:
+        fields.append("u.user_address")
+    where = " WHERE (" + " OR ".join(f"{field} LIKE %s" for field in fields) + ")"
+    return where, [f"%{search_term}%"] * len(fields)
+
+def fetch_page(cursor, filters, after_id=None, page_size=None, extra_columns=()):
+    """Fetch one page of users (dictionary cursor) with user_id above after_id.
+
+    Returns (rows, next_id); next_id is None on the last page.
+    """
+    page_size = page_size or config.USERS_PAGE_SIZE
+    where, params = filters
+    params = list(params)
+
+    if after_id is not None:
+        where += " AND " if where else " WHERE "
+        where += "u.user_id > %s"
+        params.append(after_id)
+
+    extra = "".join(f", {column}" for column in extra_columns)
+    cursor.execute(
+        USER_COLUMNS.format(extra=extra) + where + " ORDER BY u.user_id LIMIT %s",
+        params + [page_size + 1]
+    )
+    rows = cursor.fetchall()
+
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        return rows, rows[-1]['user_id']
+    return rows, None
+
+def count_users(cursor, filters):
+    """Count every user matching the search without fetching them"""
+    where, params = filters
+    cursor.execute("SELECT COUNT(*) AS Total FROM Users u" + where, params)
+    return cursor.fetchone()['Total']
+
+def load_page(filters, after_id=None, page_size=None, extra_columns=(), with_count=False):
+    """Fetch a page (and the match count if asked) on a pooled connection.
+
+    Safe to run on a worker thread; returns (rows, next_id, total).
+    """
+    connection = db.get_connection()
+    cursor = connection.cursor(dictionary=True)
+    try:
+        rows, next_id = fetch_page(cursor, filters, after_id, page_size, extra_columns)
+        total = count_users(cursor, filters) if with_count else None
+        return rows, next_id, total
+    finally:
+        cursor.close()
+        connection.close()
+
+class UserPager:
+    """Walks the matching users one keyset page at a time"""
+
+    def __init__(self, page_size=None, extra_columns=()):
+        self.page_size = page_size or config.USERS_PAGE_SIZE
+        self.extra_columns = extra_columns
+        self.filters = build_filters()
+        self.position = None    # user_id of the last row fetched so far
+        self.has_next = True
+
+    def reset(self, filters=None):
+        """Start again from the first page, with a new search if given"""
+        if filters is not None:
+            self.filters = filters
+        self.position = None
+        self.has_next = True
+
+    def request(self):
+        """Arguments for fetch_page, taken on the Tk thread before a worker runs the query"""
+        return self.filters, self.position, self.page_size, self.extra_columns
+
+    def advance(self, next_id):
+        """Move past a page once it has been fetched"""
+        self.position = next_id
+        self.has_next = next_id is not None
@@ -1,22 +1,19 @@
 # utils.py
-import hashlib
-import subprocess
-import sys
 from tkinter import messagebox
 
+import passwords
+import router
+
 def hash_password(password):
-    """Hash a password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with the configured salted hasher (slow: prefer a worker thread)"""
+    return passwords.hash_password(password)
 
 def open_page(page_name, user_id=None):
-    """Open another page and close the current one"""
+    """Show another page in the current window"""
     try:
-        # Pass the user ID to the next page if provided
-        user_param = [str(user_id)] if user_id else []
-        
-        # Construct the command to run the appropriate Python file
-        command = [sys.executable, f"{page_name.lower()}.py"] + user_param
+        # Pass the user ID along for pages that need it
+        page_params = {"user_id": user_id} if user_id else {}
         
-        subprocess.Popen(command)
+        router.navigate(page_name.lower(), **page_params)
     except Exception as e:
         messagebox.showerror("Navigation Error", f"Unable to open {page_name} page: {e}")
\ No newline at end of file
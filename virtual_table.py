@@ -0,0 +1,238 @@
+# virtual_table.py
+from tkinter import ttk
+
+# ------------------- Virtualized Treeview -------------------
+# A ttk.Treeview only stays fast while it holds a few hundred items. This one
+# keeps every row as plain Python data and materializes just the rows that fit
+# on screen; scrolling rewrites that small window instead of moving thousands
+# of Tk items. When the view gets near the end of the loaded rows it asks the
+# data source for the next chunk, so huge tables load lazily: fetch_more is
+# called with a deliver(rows, has_more) callback, which it may call later
+# (e.g. when a background query finishes).
+#
+# Rows are (iid, values, tags) tuples. Materialized items keep the row's iid,
+# so focus(), selection() and item() keep working as with a plain Treeview.
+
+DEFAULT_ROW_HEIGHT = 20
+PREFETCH_ROWS = 20  # ask for more rows when the view is this close to the end
+
+class VirtualTreeview(ttk.Treeview):
+    """Treeview that only creates items for the rows currently visible"""
+
+    def __init__(self, master=None, fetch_more=None, **kwargs):
+        self._scroll_command = kwargs.pop("yscrollcommand", None)
+        super().__init__(master, **kwargs)
+        self.fetch_more = fetch_more
+        self._rows = []
+        self._index = {}        # iid -> position in _rows, rebuilt lazily after removals
+        self._has_more = False
+        self._fetching = False
+        self._generation = 0    # bumped by set_rows so late deliveries are dropped
+        self._first = 0
+        self._selected = None
+        self._select_callbacks = []
+
+        self.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        self.bind("<Button-4>", lambda event: self._scroll_by(-3), add="+")
+        self.bind("<Button-5>", lambda event: self._scroll_by(3), add="+")
+        self.bind("<Up>", self._on_arrow, add="+")
+        self.bind("<Down>", self._on_arrow, add="+")
+        self.bind("<Prior>", lambda event: self._scroll_by(-self._visible_rows()), add="+")
+        self.bind("<Next>", lambda event: self._scroll_by(self._visible_rows()), add="+")
+        self.bind("<Configure>", lambda event: self._render(), add="+")
+        super().bind("<<TreeviewSelect>>", self._on_select)
+
+    # ----- Tk overrides: the scrollbar talks to the virtual row list -----
+    def bind(self, sequence=None, func=None, add=None):
+        # Re-rendering deletes and re-selects items, which Tk reports as
+        # selection changes; page callbacks only hear about real ones
+        if sequence == "<<TreeviewSelect>>" and func is not None:
+            if not add:
+                self._select_callbacks = []
+            self._select_callbacks.append(func)
+            return None
+        return super().bind(sequence, func, add)
+
+    def configure(self, cnf=None, **kwargs):
+        if "yscrollcommand" in kwargs:
+            self._scroll_command = kwargs.pop("yscrollcommand")
+            self._update_scrollbar()
+        return super().configure(cnf, **kwargs)
+
+    config = configure
+
+    def yview(self, *args):
+        """Scrollbar callback: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._rows)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_rows()
+            self._scroll_by(step)
+
+    # ----- Data -----
+    def set_rows(self, rows, has_more=False):
+        """Replace every row and scroll back to the top"""
+        self._rows = list(rows)
+        self._index = None
+        self._has_more = has_more
+        self._fetching = False
+        self._generation += 1
+        self._first = 0
+        self._render()
+
+    def append_rows(self, rows, has_more=False):
+        if self._index is not None:
+            for position, row in enumerate(rows, len(self._rows)):
+                self._index[str(row[0])] = position
+        self._rows.extend(rows)
+        self._has_more = has_more
+        self._render()
+
+    def get_row(self, iid):
+        """The loaded (iid, values, tags) row for an iid, or None if it is not loaded"""
+        position = self._position(iid)
+        return None if position is None else self._rows[position]
+
+    def update_row(self, iid, values, tags=()):
+        """Change one loaded row in place; only touches Tk if the row is on screen"""
+        position = self._position(iid)
+        if position is None:
+            return False
+        self._rows[position] = (self._rows[position][0], values, tags)
+        if self.exists(str(iid)):
+            self.item(str(iid), values=values, tags=tags)
+        return True
+
+    def remove_row(self, iid):
+        """Drop one loaded row; re-renders the visible window only"""
+        position = self._position(iid)
+        if position is None:
+            return False
+        del self._rows[position]
+        self._index = None
+        if str(iid) == self._selected:
+            self._selected = None
+        self._first = max(0, min(self._first, len(self._rows) - self._visible_rows()))
+        self._render()
+        return True
+
+    def clear_selection(self):
+        """Forget the selected row, so selecting it again reaches the page's callbacks"""
+        self._selected = None
+        selection = self.selection()
+        if selection:
+            self.selection_remove(*selection)
+
+    @property
+    def row_count(self):
+        """Rows loaded so far (not just the ones on screen)"""
+        return len(self._rows)
+
+    @property
+    def has_more(self):
+        return self._has_more
+
+    def rows(self):
+        return list(self._rows)
+
+    def _position(self, iid):
+        if self._index is None:
+            self._index = {str(row[0]): position for position, row in enumerate(self._rows)}
+        return self._index.get(str(iid))
+
+    # ----- Scrolling -----
+    def _visible_rows(self):
+        height = int(self.cget("height"))
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT
+        # Packed with fill/expand the widget may be taller than its height option
+        pixels = self.winfo_height() - DEFAULT_ROW_HEIGHT  # leave room for the headings
+        return max(height, pixels // int(row_height)) if pixels > 0 else height
+
+    def _scroll_by(self, step):
+        self._scroll_to(self._first + step)
+        return "break"
+
+    def _scroll_to(self, first):
+        last_first = max(0, len(self._rows) - self._visible_rows())
+        first = max(0, min(first, last_first))
+        if first != self._first:
+            self._first = first
+            self._render()
+        self._maybe_fetch_more()
+
+    def _on_mousewheel(self, event):
+        return self._scroll_by(-1 if event.delta > 0 else 1)
+
+    def _on_arrow(self, event):
+        """Move the focus past the edge of the window by scrolling it"""
+        children = self.get_children()
+        focused = self.focus()
+        if not children or focused not in children:
+            return None
+        at_top = event.keysym == "Up" and focused == children[0]
+        at_bottom = event.keysym == "Down" and focused == children[-1]
+        if not (at_top or at_bottom):
+            return None
+
+        position = self._first + children.index(focused) + (-1 if at_top else 1)
+        if 0 <= position < len(self._rows):
+            self._scroll_by(-1 if at_top else 1)
+            iid = str(self._rows[position][0])
+            if self.exists(iid):
+                self.focus(iid)
+                self.selection_set(iid)
+        return "break"
+
+    def _maybe_fetch_more(self):
+        if self._fetching or not (self._has_more and self.fetch_more):
+            return
+        if self._first + self._visible_rows() + PREFETCH_ROWS < len(self._rows):
+            return
+
+        generation = self._generation
+
+        def deliver(rows, has_more):
+            if generation != self._generation:
+                return
+            self._fetching = False
+            self.append_rows(rows, has_more)
+
+        self._fetching = True
+        self.fetch_more(deliver)
+
+    # ----- Rendering -----
+    def _on_select(self, event):
+        selection = self.selection()
+        if not selection or selection[0] == self._selected:
+            return
+        self._selected = selection[0]
+        for callback in self._select_callbacks:
+            callback(event)
+
+    def _render(self):
+        window = self._rows[self._first:self._first + self._visible_rows()]
+        children = self.get_children()
+        if children:
+            self.delete(*children)
+        for iid, values, tags in window:
+            self.insert("", "end", iid=iid, values=values, tags=tags)
+
+        # Keep the selected row highlighted while it is on screen
+        if self._selected and self.exists(self._selected):
+            self.selection_set(self._selected)
+            self.focus(self._selected)
+        self._update_scrollbar()
+
+    def _fractions(self):
+        total = len(self._rows)
+        if not total:
+            return 0.0, 1.0
+        return self._first / total, min(1.0, (self._first + self._visible_rows()) / total)
+
+    def _update_scrollbar(self):
+        if self._scroll_command:
+            self._scroll_command(*self._fractions())